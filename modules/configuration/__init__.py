@@ -12,15 +12,39 @@ from __future__ import annotations
 import os
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-from .configurations import ConfigClass
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .configurations import ConfigClass
+    from .configurations import ConfigStore
+
+# Exported names and the submodule defining them, imported on first attribute access.
+_lazy_imports = {
+    "ConfigClass": ".configurations",
+    "ConfigStore": ".configurations",
+}
+
+
+__all__ = ["ConfigClass", "ConfigStore"]
+
+
+def __getattr__(name: str):
+    module = _lazy_imports.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 
-__all__ = ["ConfigClass"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
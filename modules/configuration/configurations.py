@@ -12,77 +12,278 @@ from __future__ import annotations
 import os
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-from dotenv import load_dotenv
-import yaml
+import threading
+import time
+from typing import Callable, Union
 
 from modules.journals import JournalModulesClass
+from modules.metrics.metrics import MetricsRegistry
 from tools.public import PublicToolsBaseClass
 from tools.public import ReadFilesError
 
 
-class BaseConfigClass:
-    """Base Configuration Base Class"""
+class FrozenConfig(dict):
+    """Read-only configuration mapping, shared by every reader of a snapshot"""
 
-    def __init__(self, *args, **kwargs):
-        self._journal = JournalModulesClass()
-        self._public_tools = PublicToolsBaseClass()
+    def __readonly(self, *args, **kwargs):
+        raise TypeError("Configuration snapshot is read-only")
+
+    __setitem__ = __readonly
+    __delitem__ = __readonly
+    clear = __readonly
+    pop = __readonly
+    popitem = __readonly
+    setdefault = __readonly
+    update = __readonly
+    __ior__ = __readonly
+
+    def __reduce__(self):
+        return FrozenConfig, (dict(self),)
+
+
+def freeze_config(value):
+    """
+    Immutable copy of a parsed configuration value
+    :param value: Parsed YAML value: Any
+    :return: FrozenConfig for mappings, tuple for sequences, the value otherwise: Any
+    """
+    if isinstance(value, dict):
+        return FrozenConfig((key, freeze_config(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze_config(item) for item in value)
+    return value
+
+
+class ConfigStore:
+    """
+    Process-wide configuration: the file is parsed once into an immutable snapshot and
+    parsed again only when its inode, mtime or size changes. The change check is a stat
+    call throttled to check_interval; a new snapshot replaces the old one in a single
+    assignment and subscribers are called with the old and new snapshots.
+    """
+
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(self, config_path: str, check_interval: Union[int, float] = 1):
+        self.__journal = JournalModulesClass()
+        self.__config_path = config_path
+        self.__check_interval = check_interval
+        self.__lock = threading.Lock()
+        self.__signature = None
+        self.__checked_at = 0.0
+        self.__snapshot = FrozenConfig()
+        self.__subscribers = []
+        self.__watcher = None
+        self.__watching = threading.Event()
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        self.__run_env = os.getenv("RUN_ENVIRONMENT")
+        if self.__run_env is None:
+            self.__run_env = "dev"
+            self.__journal.warning(
+                "Configuration environment configuration error"
+                "Default with the development environment."
+            )
+        self.__journal.info("operating environment：{}", self.__run_env)
+        self.reload()
+
+    @classmethod
+    def instance(cls):
+        """
+        Process-wide configuration store, the file is located and parsed on first use
+        :return: Configuration store: ConfigStore
+        """
+        if cls.__instance is None:
+            with cls.__instance_lock:
+                if cls.__instance is None:
+                    cls.__instance = cls(cls.locate(PublicToolsBaseClass().root_path))
+        return cls.__instance
 
-    def __get_config_path(self) -> str:
+    @staticmethod
+    def locate(root_path: str) -> str:
         """
         Get the path to the configuration file
+        @param root_path: Project root path: String
         @return: Path to the configuration file: String
         """
-        config_path = os.path.normpath(os.path.join(self._public_tools.root_path, "config.yaml"))
-        if not os.path.isfile(config_path):
-            config_path = os.path.normpath(
-                os.path.join(self._public_tools.root_path, "../../conf/config.dev.yaml")
-            )
-            if not os.path.isfile(config_path):
-                config_path = os.path.normpath(
-                    os.path.join(self._public_tools.root_path, "conf/config.yaml")
-                )
-                if not os.path.isfile(config_path):
-                    config_path = os.path.normpath(
-                        os.path.join(self._public_tools.root_path, "conf/config.dev.yaml")
-                    )
-        try:
+        for candidate in ("config.yaml", "../../conf/config.dev.yaml", "conf/config.yaml", "conf/config.dev.yaml"):
+            config_path = os.path.normpath(os.path.join(root_path, candidate))
             if os.path.isfile(config_path):
                 return config_path
-            else:
-                raise ReadFilesError("Config file load error.")
+        try:
+            raise ReadFilesError("Config file load error.")
         except Exception as error:
-            self.exception(error)
+            JournalModulesClass().exception(error)
             sys.exit(1)
 
     @property
-    def __config_path(self):
-        self._journal.info("Config File: {}".format(self.__get_config_path()))
-        return self.__get_config_path()
+    def config_path(self) -> str:
+        return self.__config_path
+
+    @property
+    def run_env(self) -> str:
+        return self.__run_env
+
+    def __stat_signature(self):
+        stat = os.stat(self.__config_path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @property
+    def snapshot(self) -> FrozenConfig:
+        """
+        Current configuration snapshot, reloaded first if the file changed
+        @return: configuration information: FrozenConfig
+        """
+        now = time.monotonic()
+        if now - self.__checked_at >= self.__check_interval:
+            self.__checked_at = now
+            try:
+                changed = self.__stat_signature() != self.__signature
+            except OSError:
+                changed = False
+            if changed:
+                self.reload()
+        return self.__snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Parse the file again if it changed, a failed parse keeps the current snapshot
+        :param force: Parse even if the file is unchanged: Boolean
+        :return: Whether a new snapshot was installed: Boolean
+        """
+        import yaml
 
-    def __base_config(self) -> dict:
+        with self.__lock:
+            try:
+                signature = self.__stat_signature()
+                if not force and signature == self.__signature:
+                    return False
+                with open(self.__config_path, "r", encoding="utf8") as file:
+                    snapshot = freeze_config(yaml.safe_load(file) or {})
+            except Exception as error:
+                self.__journal.exception(error)
+                return False
+            previous, self.__snapshot = self.__snapshot, snapshot
+            self.__signature = signature
+            subscribers = list(self.__subscribers)
+        self.__apply_logging(snapshot)
+        self.__apply_metrics(snapshot)
+        self.__journal.info("Config File: {}", self.__config_path)
+        for callback in subscribers:
+            try:
+                callback(previous, snapshot)
+            except Exception as error:
+                self.__journal.exception(error)
+        return True
+
+    @property
+    def section(self) -> str:
         """
-        Getting configuration information
-        @return: configuration information: String
+        Top-level section of the run environment
+        :return: Production, Test or Development: String
         """
+        run_env = self.__run_env.lower()
+        if run_env in ["production", "prod", "pro", "p"]:
+            return "Production"
+        elif run_env in ["test", "t"]:
+            return "Test"
+        return "Development"
 
+    def __apply_logging(self, snapshot: FrozenConfig):
+        logging_config = (snapshot.get(self.section) or {}).get("logging")
+        if logging_config:
+            try:
+                JournalModulesClass.apply_config(logging_config)
+            except Exception as error:
+                self.__journal.exception(error)
+
+    def __apply_metrics(self, snapshot: FrozenConfig):
         try:
-            with open(self.__config_path, "r", encoding="utf8") as file:
-                read_config = yaml.safe_load(file)
-            return read_config
+            MetricsRegistry.instance().apply_config((snapshot.get(self.section) or {}).get("metrics"))
         except Exception as error:
-            self._journal.exception(error)
+            self.__journal.exception(error)
+
+    def subscribe(self, callback: Callable):
+        """
+        Call back on every reload
+        :param callback: Called with the previous and the new snapshot: Callable
+        :return: None
+        """
+        with self.__lock:
+            if callback not in self.__subscribers:
+                self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable):
+        with self.__lock:
+            if callback in self.__subscribers:
+                self.__subscribers.remove(callback)
+
+    def watch(self, interval: Union[int, float, None] = None):
+        """
+        Check the file from a daemon thread so subscribers hear of changes without reads
+        :param interval: Seconds between checks, defaults to check_interval: Integer | Float
+        :return: None
+        """
+        with self.__lock:
+            if self.__watcher is not None:
+                return
+            self.__watching.set()
+            self.__watcher = threading.Thread(
+                target=self.__watch,
+                args=(interval or self.__check_interval,),
+                name="config-watcher",
+                daemon=True,
+            )
+            self.__watcher.start()
+
+    def __watch(self, interval: Union[int, float]):
+        while self.__watching.is_set():
+            time.sleep(interval)
+            self.reload()
+
+    def stop_watching(self):
+        with self.__lock:
+            self.__watching.clear()
+            self.__watcher = None
+
+
+class BaseConfigClass:
+    """Base Configuration Base Class"""
+
+    __journal = None
+    __public_tools = PublicToolsBaseClass()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @property
+    def _journal(self) -> JournalModulesClass:
+        # One journal per process, instances only borrow it.
+        if BaseConfigClass.__journal is None:
+            BaseConfigClass.__journal = JournalModulesClass()
+        return BaseConfigClass.__journal
+
+    @property
+    def _public_tools(self) -> PublicToolsBaseClass:
+        return BaseConfigClass.__public_tools
+
+    @property
+    def _config_store(self) -> ConfigStore:
+        return ConfigStore.instance()
 
     @property
     def _base_config(self) -> dict:
-        return self.__base_config()
+        return self._config_store.snapshot
 
 
 class DevelopmentConfigClass(BaseConfigClass):
@@ -120,18 +321,6 @@ class ConfigClass(DevelopmentConfigClass, TestConfigClass, ProductionConfigClass
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        load_dotenv()
-        try:
-            self.__run_env: str = os.getenv("RUN_ENVIRONMENT")
-            if self.__run_env is None:
-                self.__run_env = "dev"
-                self._journal.warning(
-                    "Configuration environment configuration error"
-                    "Default with the development environment."
-                )
-        except Exception as error:
-            self._journal.exception(error)
-            sys.exit(1)
 
     def __development(self) -> dict:
         return self._development_config()
@@ -145,10 +334,10 @@ class ConfigClass(DevelopmentConfigClass, TestConfigClass, ProductionConfigClass
     @property
     def config(self) -> dict:
         try:
-            self._journal.info("operating environment：{}".format(self.__run_env))
-            if self.__run_env.lower() in ["production", "prod", "pro", "p"]:
+            run_env = self._config_store.run_env.lower()
+            if run_env in ["production", "prod", "pro", "p"]:
                 return self.__production()
-            elif self.__run_env.lower() in ["test", "t"]:
+            elif run_env in ["test", "t"]:
                 return self.__test()
             else:
                 return self.__development()
@@ -11,35 +11,33 @@ from __future__ import annotations
 
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 import time
 from typing import Callable, Mapping
 
-from modules.inheritance import BaseClass
+from modules.journals import JournalModulesClass
 
 
 class TimingDecorator:
     """Runtime Decorator"""
 
     def __init__(self, *args, **kwargs):
-        self.__base_class = BaseClass()
+        self.__journal = JournalModulesClass()
 
     def __call__(self, function, *args, **kwargs):
         def warpper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             result = function(*args, **kwargs)
-            end_time = time.time()
+            end_time = time.perf_counter()
             elapsed_time = end_time - start_time
-            self.__base_class.debug(
-                "{} run {} second".format(function.__name__, elapsed_time)
-            )
+            self.__journal.debug("{} run {} second", function.__name__, elapsed_time)
             return result
 
         return warpper
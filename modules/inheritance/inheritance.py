@@ -12,16 +12,13 @@ from __future__ import annotations
 import os
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings('ignore')
-if platform.system() == 'Windows':
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+if sys.platform == 'win32':
+    import asyncio
 
-import time
-import random
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 from tools.public import PublicToolsBaseClass
 from modules.journals import JournalModulesClass
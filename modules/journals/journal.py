@@ -12,86 +12,223 @@ from __future__ import annotations
 import os
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-from loguru import logger
 import threading
 
+from modules.metrics.metrics import MetricSnapshot
+from modules.metrics.metrics import MetricsRegistry
 from tools.public import PublicToolsBaseClass
+from tools.public.public import ROOT_PATH
+
+# loguru logger, imported when the first message is logged.
+logger = None
+# loguru severities, messages below the configured level return before reaching loguru.
+LEVELS = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+DEFAULT_LEVEL = "DEBUG"
+SINK_MODES = ("file", "batch")
 
 
 class JournalModulesClass(PublicToolsBaseClass):
     """Log Module Class"""
 
-    # __instance_lock = threading.Lock()
-    # __logger_instance = False
-    # 
-    # def __new__(cls):
-    #     if not cls.__logger_instance:
-    #         with cls.__instance_lock:
-    #             if not cls.__logger_instance:
-    #                 cls.__logger_instance = super(JournalModulesClass, cls).__new__(cls)
-    #                 cls.__logger_instance.__config_logger()
-    #     return cls.__logger_instance.__logs
+    __configured = False
+    __configure_lock = threading.Lock()
+    __logs_path = None
+    __level = None
+    __level_no = 0
+    __sink_mode = "file"
+    __batch_options: dict = {}
+    __batch_sink = None
+    __metrics = MetricsRegistry.instance()
+    __record_counters: dict = {}
 
     def __init__(self, logs_path=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if logs_path:
-            self.__logs_path = logs_path
-        else:
-            self.__logs_path = os.path.normpath(
-                os.path.join(self.root_path, "logs/services.log")
+            self.configure(logs_path)
+
+    @staticmethod
+    def __level_name(level: str) -> str:
+        level = str(level).upper()
+        if level not in LEVELS:
+            raise ValueError("Unknown log level: {}".format(level))
+        return level
+
+    @classmethod
+    def configure(cls, logs_path=None, level=None, force: bool = False):
+        """
+        Logger configuration, applied once per process; later calls are no-ops unless forced
+        @param logs_path: Log file path, defaults to logs/services.log under the project root: String
+        @param level: Minimum level, defaults to the LOG_LEVEL environment variable or DEBUG: String
+        @param force: Replace the sinks even if the logger is configured: Boolean
+        @return: None
+        """
+        global logger
+        if cls.__configured and not force:
+            return
+        with cls.__configure_lock:
+            if cls.__configured and not force:
+                return
+            from loguru import logger
+            logs_path = logs_path or cls.__logs_path or os.path.normpath(
+                os.path.join(ROOT_PATH, "logs/services.log")
             )
-        logger.remove()
-        logger.add(
-            sink=self.__logs_path,
-            rotation="10 MB",
-            retention="180 days",
-            format="[{time:YYYY-MM-DD HH:mm:ss} | {elapsed} | {level:<8}]: {message}",
-            compression="gz",
-            encoding="utf-8",
-            # level: TRACE, DEBUG, INFO, SUCCESS, WARNING, ERROR, CRITICAL
-            level="DEBUG",
-            enqueue=True,
-            colorize=True,
-            backtrace=True,
-        )
-
-    def __config_logger(self):
-        """
-        Logger configuration
+            level = cls.__level_name(level or cls.__level or os.getenv("LOG_LEVEL") or DEFAULT_LEVEL)
+            # remove() stops the previous batching sink, which writes what it still holds.
+            logger.remove()
+            cls.__batch_sink = None
+            if cls.__sink_mode == "batch":
+                from .sink import BatchingFileSink
+
+                # The sink queues and writes on its own thread, loguru only renders the message.
+                cls.__batch_sink = BatchingFileSink(logs_path, **cls.__batch_options)
+                logger.add(
+                    sink=cls.__batch_sink,
+                    format="{message}",
+                    level=level,
+                    enqueue=False,
+                    colorize=False,
+                    backtrace=False,
+                    diagnose=False,
+                )
+            else:
+                logger.add(
+                    sink=logs_path,
+                    rotation="10 MB",
+                    retention="180 days",
+                    format="[{time:YYYY-MM-DD HH:mm:ss} | {elapsed} | {level:<8}]: {message}",
+                    compression="gz",
+                    encoding="utf-8",
+                    # level: TRACE, DEBUG, INFO, SUCCESS, WARNING, ERROR, CRITICAL
+                    level=level,
+                    enqueue=True,
+                    colorize=True,
+                    backtrace=True,
+                )
+            logger.configure(patcher=cls.__count_record)
+            cls.__metrics.register_collector(cls.__collect_metrics)
+            cls.__logs_path = logs_path
+            cls.__level = level
+            cls.__level_no = LEVELS[level]
+            cls.__configured = True
+
+    @classmethod
+    def set_level(cls, level: str):
+        """
+        Change the minimum level, the sink is replaced only if the level differs
+        @param level: TRACE, DEBUG, INFO, SUCCESS, WARNING, ERROR or CRITICAL: String
+        @return: None
+        """
+        level = cls.__level_name(level)
+        if level == cls.__level:
+            return
+        if cls.__configured:
+            cls.configure(level=level, force=True)
+        else:
+            cls.__level = level
+            cls.__level_no = LEVELS[level]
+
+    @classmethod
+    def apply_config(cls, logging_config: dict):
+        """
+        Apply the logging configuration section, the sink is replaced only if it changed
+        @param logging_config: logging section (level, sink, batch): Dict
+        @return: None
+        """
+        sink_mode = logging_config.get("sink") or "file"
+        if sink_mode not in SINK_MODES:
+            raise ValueError("Unknown log sink: {}".format(sink_mode))
+        batch_options = dict(logging_config.get("batch") or {})
+        level = logging_config.get("level")
+        if sink_mode != cls.__sink_mode or batch_options != cls.__batch_options:
+            cls.__sink_mode = sink_mode
+            cls.__batch_options = batch_options
+            if cls.__configured:
+                cls.configure(level=level, force=True)
+                return
+        if level:
+            cls.set_level(level)
+
+    @classmethod
+    def sink_stats(cls) -> dict:
+        """
+        Counters of the batching sink (written, dropped, sampled, batches, rotations)
+        @return: Counters, empty in file mode: Dict
+        """
+        sink = cls.__batch_sink
+        return sink.stats if sink is not None else {}
+
+    @classmethod
+    def __count_record(cls, record: dict):
+        # loguru patcher, runs in the logging thread for every record that passed the level.
+        if not cls.__metrics.enabled:
+            return
+        name = record["level"].name
+        counter = cls.__record_counters.get(name)
+        if counter is None:
+            counter = cls.__record_counters[name] = cls.__metrics.counter(
+                "journal_records_total", "Log records written, by level", ("level",)
+            ).labels(name)
+        counter.inc()
+
+    @classmethod
+    def __collect_metrics(cls) -> list:
+        stats = cls.sink_stats()
+        if not stats:
+            return []
+        return [
+            MetricSnapshot("journal_queue_depth", "gauge", "Records queued in the batching log sink", [("", {}, stats["queued"])]),
+            MetricSnapshot("journal_sink_written_total", "counter", "Records written by the batching log sink", [("", {}, stats["written"])]),
+            MetricSnapshot("journal_sink_dropped_total", "counter", "Records dropped under backpressure", [("", {}, stats["dropped"])]),
+            MetricSnapshot("journal_sink_batches_total", "counter", "Batches written by the batching log sink", [("", {}, stats["batches"])]),
+        ]
+
+    @classmethod
+    def is_enabled_for(cls, level: str) -> bool:
+        """
+        Whether messages of a level are written, to guard costly message preparation
+        @param level: Level name: String
+        @return: True or False: Boolean
+        """
+        return LEVELS[level.upper()] >= cls.__level_no
+
+    def lazy(self, level: str, msg, *args, **kwargs):
+        """
+        Log with callables as arguments, they are only called when the level is enabled
+        @param level: Level name: String
+        @param msg: Log messages: String
+        @param args: Callables returning the message arguments: Tuple
+        @param kwargs: Callables returning the message keyword arguments: Dict
         @return: None
         """
-        __public_tools = PublicToolsBaseClass()
-        logs_path = os.path.normpath(
-            os.path.join(__public_tools.root_path, "logs/services.log")
-        )
-        logger.add(
-            sink=logs_path,
-            rotation="10 MB",
-            retention="180 days",
-            format="[{time:YYYY-MM-DD HH:mm:ss} | {elapsed} | {level:<8}]: {message}",
-            compression="gz",
-            encoding="utf-8",
-            # level: TRACE, DEBUG, INFO, SUCCESS, WARNING, ERROR, CRITICAL
-            level="DEBUG",
-            enqueue=True,
-            colorize=True,
-            backtrace=True,
-        )
+        level = level.upper()
+        if LEVELS[level] < self.__level_no:
+            return None
+        return self.__logs.opt(lazy=True, depth=1).log(level, msg, *args, **kwargs)
 
     @property
     def __logs(self):
         """
-        Private method logger
+        Private method logger, configured on first use
         @return: logger: Logger object
         """
+        if not self.__configured:
+            self.configure()
         return logger
 
     @property
@@ -110,7 +247,9 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.trace
         """
-        return self.__logs.trace(msg, *args, **kwargs)
+        if self.__level_no > 5:
+            return None
+        return self.__logs.opt(depth=1).trace(msg, *args, **kwargs)
 
     def debug(self, msg, *args, **kwargs):
         """
@@ -120,7 +259,9 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.debug
         """
-        return self.__logs.debug(msg, *args, **kwargs)
+        if self.__level_no > 10:
+            return None
+        return self.__logs.opt(depth=1).debug(msg, *args, **kwargs)
 
     def info(self, msg, *args, **kwargs):
         """
@@ -130,7 +271,9 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.info
         """
-        return self.__logs.info(msg, *args, **kwargs)
+        if self.__level_no > 20:
+            return None
+        return self.__logs.opt(depth=1).info(msg, *args, **kwargs)
 
     def success(self, msg, *args, **kwargs):
         """
@@ -140,7 +283,9 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.success
         """
-        return self.__logs.success(msg, *args, **kwargs)
+        if self.__level_no > 25:
+            return None
+        return self.__logs.opt(depth=1).success(msg, *args, **kwargs)
 
     def warning(self, msg, *args, **kwargs):
         """
@@ -150,7 +295,9 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.warning
         """
-        return self.__logs.warning(msg, *args, **kwargs)
+        if self.__level_no > 30:
+            return None
+        return self.__logs.opt(depth=1).warning(msg, *args, **kwargs)
 
     def error(self, msg, *args, **kwargs):
         """
@@ -160,7 +307,9 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.error
         """
-        return self.__logs.error(msg, *args, **kwargs)
+        if self.__level_no > 40:
+            return None
+        return self.__logs.opt(depth=1).error(msg, *args, **kwargs)
 
     def critical(self, msg, *args, **kwargs):
         """
@@ -170,7 +319,9 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.critical
         """
-        return self.__logs.critical(msg, *args, **kwargs)
+        if self.__level_no > 50:
+            return None
+        return self.__logs.opt(depth=1).critical(msg, *args, **kwargs)
 
     def exception(self, msg, *args, **kwargs):
         """
@@ -180,4 +331,6 @@ class JournalModulesClass(PublicToolsBaseClass):
         @param kwargs: Dict
         @return: loguru.logger.exception
         """
-        return self.__logs.exception(msg, *args, **kwargs)
+        if self.__level_no > 40:
+            return None
+        return self.__logs.opt(depth=1).exception(msg, *args, **kwargs)
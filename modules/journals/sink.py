@@ -0,0 +1,293 @@
+# coding: utf8
+"""
+@ File: sink.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import os
+import json
+import glob
+import gzip
+import time
+import shutil
+import atexit
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+BACKPRESSURE_POLICIES = ("drop", "sample", "block")
+SINK_FORMATS = ("text", "json")
+# Records at or above this severity are kept under backpressure, the oldest queued record makes room.
+KEEP_LEVEL_NO = 30
+TEXT_FORMAT = "[{time:%Y-%m-%d %H:%M:%S} | {elapsed} | {level:<8}]: {message}\n"
+
+
+class BatchingFileSink:
+    """
+    loguru sink that queues records and writes them from one thread in batches through a
+    buffered file. A full queue drops (or samples) records below WARNING and counts them,
+    rotated files are gzip-compressed and pruned on a separate thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: str = "text",
+        batch_size: int = 512,
+        flush_interval: Union[int, float] = 0.5,
+        queue_size: int = 65536,
+        policy: str = "drop",
+        sample_every: int = 100,
+        rotation_mb: Union[int, float] = 10,
+        retention_days: Union[int, float] = 180,
+        compression: bool = True,
+        buffer_size: int = 1 << 20,
+    ):
+        if format not in SINK_FORMATS:
+            raise ValueError("Unknown sink format: {}".format(format))
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError("Unknown backpressure policy: {}".format(policy))
+        self.__path = path
+        self.__json = format == "json"
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__queue_size = queue_size
+        self.__policy = policy
+        self.__sample_every = max(int(sample_every), 1)
+        self.__rotation_bytes = int(rotation_mb * 1024 * 1024) if rotation_mb else 0
+        self.__retention_seconds = retention_days * 86400 if retention_days else 0
+        self.__compression = compression
+        self.__buffer_size = buffer_size
+        self.__queue = deque()
+        self.__condition = threading.Condition()
+        self.__running = True
+        self.__overflow = 0
+        self.__written = 0
+        self.__dropped = 0
+        self.__sampled = 0
+        self.__batches = 0
+        self.__rotations = 0
+        self.__errors = 0
+        self.__compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-compress")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.__file = open(path, "a", encoding="utf-8", buffering=buffer_size)
+        self.__size = self.__file.tell()
+        self.__writer = threading.Thread(target=self.__run, name="journal-writer", daemon=True)
+        self.__writer.start()
+        atexit.register(self.stop)
+
+    def write(self, message):
+        """
+        Queue one record, called by loguru in the logging thread
+        :param message: loguru message carrying the record: Message
+        :return: None
+        """
+        record = message.record
+        with self.__condition:
+            if len(self.__queue) >= self.__queue_size:
+                if not self.__make_room(record["level"].no):
+                    return
+            self.__queue.append(record)
+            if len(self.__queue) >= self.__batch_size:
+                self.__condition.notify()
+
+    def __make_room(self, level_no: int) -> bool:
+        # Called with the condition held and the queue full.
+        if level_no >= KEEP_LEVEL_NO:
+            self.__queue.popleft()
+            self.__dropped += 1
+            return True
+        if self.__policy == "block":
+            # Nothing drains the queue once the writer is gone, the record is dropped instead.
+            while self.__running and self.__writer.is_alive() and len(self.__queue) >= self.__queue_size:
+                self.__condition.notify()
+                self.__condition.wait(self.__flush_interval)
+            if self.__running and len(self.__queue) < self.__queue_size:
+                return True
+            self.__dropped += 1
+            return False
+        if self.__policy == "sample":
+            self.__overflow += 1
+            if self.__overflow % self.__sample_every == 0:
+                self.__queue.popleft()
+                self.__sampled += 1
+                self.__dropped += 1
+                return True
+        self.__dropped += 1
+        return False
+
+    def __render(self, record: dict) -> str:
+        if self.__json:
+            exception = record["exception"]
+            payload = {
+                "time": record["time"].isoformat(),
+                "elapsed": record["elapsed"].total_seconds(),
+                "level": record["level"].name,
+                "message": record["message"],
+                "name": record["name"],
+                "function": record["function"],
+                "line": record["line"],
+                "process": record["process"].id,
+                "thread": record["thread"].name,
+            }
+            if record["extra"]:
+                payload["extra"] = record["extra"]
+            if exception is not None:
+                payload["exception"] = "".join(traceback.format_exception(*exception))
+            return json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+        text = TEXT_FORMAT.format(
+            time=record["time"],
+            elapsed=record["elapsed"],
+            level=record["level"].name,
+            message=record["message"],
+        )
+        if record["exception"] is not None:
+            text += "".join(traceback.format_exception(*record["exception"]))
+        return text
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                if self.__running and len(self.__queue) < self.__batch_size:
+                    self.__condition.wait(self.__flush_interval)
+                batch = list(self.__queue)
+                self.__queue.clear()
+                running = self.__running
+                self.__condition.notify_all()
+            if batch:
+                try:
+                    self.__write_batch(batch)
+                except Exception as error:
+                    # The writer must outlive a full disk or a failed rotation, or every later record is lost.
+                    self.__failed(len(batch), error)
+            if not running:
+                return
+
+    def __failed(self, lost: int, error: Exception):
+        """
+        Count a failed write and report it on stderr, the logger itself may be what is failing
+        :param lost: Records that were not written: Integer
+        :param error: Raised exception: Exception
+        :return: None
+        """
+        with self.__condition:
+            self.__errors += 1
+            self.__dropped += lost
+        sys.stderr.write(
+            "Journal sink write failure, {} records lost：{}\n".format(
+                lost, "".join(traceback.format_exception_only(type(error), error)).strip()
+            )
+        )
+        if self.__file.closed:
+            try:
+                self.__file = open(self.__path, "a", encoding="utf-8", buffering=self.__buffer_size)
+                self.__size = self.__file.tell()
+            except Exception:
+                pass
+
+    def __write_batch(self, batch: list):
+        rendered = []
+        for record in batch:
+            try:
+                rendered.append(self.__render(record))
+            except Exception as error:
+                self.__failed(1, error)
+        text = "".join(rendered)
+        try:
+            self.__file.write(text)
+            self.__file.flush()
+        except Exception as error:
+            self.__failed(len(rendered), error)
+            return
+        self.__written += len(rendered)
+        self.__batches += 1
+        self.__size += len(text.encode("utf-8")) if not text.isascii() else len(text)
+        if self.__rotation_bytes and self.__size >= self.__rotation_bytes:
+            try:
+                self.__rotate()
+            except Exception as error:
+                # The records are written, the next batch reopens the file and tries again.
+                self.__failed(0, error)
+
+    def __rotate(self):
+        self.__file.close()
+        root, ext = os.path.splitext(self.__path)
+        rotated = "{}.{}{}".format(root, datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f"), ext)
+        os.replace(self.__path, rotated)
+        self.__file = open(self.__path, "a", encoding="utf-8", buffering=self.__buffer_size)
+        self.__size = 0
+        self.__rotations += 1
+        self.__compressor.submit(self.__archive, rotated)
+
+    def __archive(self, rotated: str):
+        # Runs on the compressor thread so the writer never waits on gzip or the disk scan.
+        if self.__compression:
+            with open(rotated, "rb") as source, gzip.open(rotated + ".gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotated)
+        if self.__retention_seconds:
+            root, ext = os.path.splitext(self.__path)
+            expired = time.time() - self.__retention_seconds
+            for archived in glob.glob("{}.*{}*".format(glob.escape(root), ext)):
+                if os.path.getmtime(archived) < expired:
+                    os.remove(archived)
+
+    def drain(self, timeout: Union[int, float] = 5):
+        """
+        Wait until every queued record has been written
+        :param timeout: Seconds to wait at most: Integer | Float
+        :return: True if the queue emptied in time: Boolean
+        """
+        deadline = time.monotonic() + timeout
+        with self.__condition:
+            while self.__queue and time.monotonic() < deadline:
+                self.__condition.notify()
+                self.__condition.wait(0.05)
+            return not self.__queue
+
+    def stop(self):
+        """
+        Write the queued records and close the file, called by logger.remove() and at exit
+        :return: None
+        """
+        with self.__condition:
+            if not self.__running:
+                return
+            self.__running = False
+            self.__condition.notify_all()
+        self.__writer.join()
+        self.__file.close()
+        self.__compressor.shutdown(wait=True)
+        atexit.unregister(self.stop)
+
+    @property
+    def stats(self) -> dict:
+        with self.__condition:
+            return {
+                "queued": len(self.__queue),
+                "written": self.__written,
+                "dropped": self.__dropped,
+                "sampled": self.__sampled,
+                "batches": self.__batches,
+                "rotations": self.__rotations,
+                "errors": self.__errors,
+                "policy": self.__policy,
+            }
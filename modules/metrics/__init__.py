@@ -0,0 +1,63 @@
+# coding: utf8
+"""
+@ File: __init__.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .metrics import MetricsRegistry
+    from .metrics import MetricSnapshot
+    from .metrics import Counter
+    from .metrics import Gauge
+    from .metrics import Histogram
+    from .exporter import MetricsExporter
+
+# Exported names and the submodule defining them, imported on first attribute access.
+_lazy_imports = {
+    "MetricsRegistry": ".metrics",
+    "MetricSnapshot": ".metrics",
+    "Counter": ".metrics",
+    "Gauge": ".metrics",
+    "Histogram": ".metrics",
+    "MetricsExporter": ".exporter",
+}
+
+__all__ = [
+    "MetricsRegistry",
+    "MetricSnapshot",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsExporter",
+]
+
+
+def __getattr__(name: str):
+    module = _lazy_imports.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,139 @@
+# coding: utf8
+"""
+@ File: exporter.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import os
+import atexit
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Union
+
+from tools.public.public import ROOT_PATH
+
+EXPORTER_MODES = ("file", "http")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves the registry exposition on /metrics"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.registry.exposition().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are not worth a log line each.
+        pass
+
+
+class MetricsExporter:
+    """
+    Publishes a registry in the Prometheus text format, either rewritten atomically into a
+    file every interval (node_exporter textfile collector) or served on a local HTTP port
+    """
+
+    def __init__(
+        self,
+        registry,
+        mode: str = "file",
+        path: str = "logs/metrics.prom",
+        host: str = "127.0.0.1",
+        port: int = 9464,
+        interval: Union[int, float] = 15,
+    ):
+        if mode not in EXPORTER_MODES:
+            raise ValueError("Unknown metrics exporter: {}".format(mode))
+        self.__registry = registry
+        self.__mode = mode
+        self.__path = path if os.path.isabs(path) else os.path.normpath(os.path.join(ROOT_PATH, path))
+        self.__host = host
+        self.__port = port
+        self.__interval = interval
+        self.__stopped = threading.Event()
+        self.__server = None
+        self.__thread = None
+
+    @property
+    def address(self) -> Union[tuple, str]:
+        """
+        Where the metrics are published
+        :return: (host, port) of the HTTP server or the file path: Tuple | String
+        """
+        if self.__server is not None:
+            return self.__server.server_address[:2]
+        return self.__path
+
+    def write(self):
+        """
+        Write the exposition once, readers never see a partial file
+        :return: None
+        """
+        os.makedirs(os.path.dirname(self.__path), exist_ok=True)
+        temporary = "{}.{}.tmp".format(self.__path, os.getpid())
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.__registry.exposition())
+        os.replace(temporary, self.__path)
+
+    def __run(self):
+        while not self.__stopped.wait(self.__interval):
+            try:
+                self.write()
+            except OSError:
+                continue
+
+    def start(self):
+        if self.__mode == "http":
+            self.__server = ThreadingHTTPServer((self.__host, self.__port), MetricsRequestHandler)
+            self.__server.daemon_threads = True
+            self.__server.registry = self.__registry
+            target = self.__server.serve_forever
+        else:
+            target = self.__run
+        self.__thread = threading.Thread(target=target, name="metrics-exporter", daemon=True)
+        self.__thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """
+        Stop publishing, the file mode writes a last time
+        :return: None
+        """
+        if self.__stopped.is_set():
+            return
+        self.__stopped.set()
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+        elif self.__thread is not None:
+            self.__thread.join()
+            try:
+                self.write()
+            except OSError:
+                pass
+        atexit.unregister(self.stop)
@@ -0,0 +1,427 @@
+# coding: utf8
+"""
+@ File: metrics.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import math
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from typing import Callable, Iterable, Union
+
+# Histogram bucket upper bounds in seconds, tuned for database and cache round trips.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRIC_TYPES = ("counter", "gauge", "histogram")
+
+# One exported metric: samples are (name suffix, labels, value) tuples.
+MetricSnapshot = namedtuple("MetricSnapshot", ("name", "kind", "documentation", "samples"))
+
+
+class ShardedCells:
+    """
+    Per-thread value cells: a writer only ever touches the cell of its own thread, so
+    increments need no lock; readers sum the cells and fold those of finished threads
+    """
+
+    def __init__(self, width: int):
+        self.__width = width
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__cells = []
+        self.__retired = [0] * width
+
+    def cell(self) -> list:
+        try:
+            return self.__local.cell
+        except AttributeError:
+            cell = self.__local.cell = [0] * self.__width
+            with self.__lock:
+                self.__cells.append((threading.current_thread(), cell))
+            return cell
+
+    def totals(self) -> list:
+        with self.__lock:
+            live = []
+            for thread, cell in self.__cells:
+                if thread.is_alive():
+                    live.append((thread, cell))
+                else:
+                    # A finished thread never writes again, its cell can be merged safely.
+                    for index, value in enumerate(cell):
+                        self.__retired[index] += value
+            self.__cells = live
+            totals = list(self.__retired)
+            for _, cell in live:
+                for index, value in enumerate(cell):
+                    totals[index] += value
+        return totals
+
+
+class CounterChild:
+    __slots__ = ("__cells",)
+
+    def __init__(self):
+        self.__cells = ShardedCells(1)
+
+    def inc(self, amount: Union[int, float] = 1):
+        self.__cells.cell()[0] += amount
+
+    @property
+    def value(self) -> Union[int, float]:
+        return self.__cells.totals()[0]
+
+
+class GaugeChild:
+    __slots__ = ("__value", "__function", "__lock")
+
+    def __init__(self):
+        self.__value = 0
+        self.__function = None
+        self.__lock = threading.Lock()
+
+    def set(self, value: Union[int, float]):
+        self.__value = value
+
+    def inc(self, amount: Union[int, float] = 1):
+        with self.__lock:
+            self.__value += amount
+
+    def dec(self, amount: Union[int, float] = 1):
+        with self.__lock:
+            self.__value -= amount
+
+    def set_function(self, function: Union[Callable, None]):
+        """
+        Read the value from a callable when the metrics are collected
+        :param function: Callable returning the value, None goes back to set(): Callable
+        :return: None
+        """
+        self.__function = function
+
+    @property
+    def value(self) -> Union[int, float]:
+        function = self.__function
+        return function() if function is not None else self.__value
+
+
+class HistogramChild:
+    __slots__ = ("__bounds", "__cells")
+
+    def __init__(self, bounds: tuple):
+        self.__bounds = bounds
+        # One count per bucket, the +Inf count, then the sum of the observations.
+        self.__cells = ShardedCells(len(bounds) + 2)
+
+    def observe(self, value: Union[int, float]):
+        cell = self.__cells.cell()
+        cell[bisect_left(self.__bounds, value)] += 1
+        cell[-1] += value
+
+    @property
+    def value(self) -> dict:
+        totals = self.__cells.totals()
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(self.__bounds + (math.inf,), totals[:-1]):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return {"buckets": buckets, "count": cumulative, "sum": totals[-1]}
+
+
+class MetricFamily:
+    """A named metric and its children, one per combination of label values"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str = "", labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.__children: dict = {}
+        self.__lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **labels):
+        """
+        Child of a combination of label values, created on first use
+        :param values: Label values in labelnames order: Tuple
+        :param labels: Label values by name: Dict
+        :return: Child metric: CounterChild | GaugeChild | HistogramChild
+        """
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self.__children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError("{} expects labels {}".format(self.name, self.labelnames))
+            with self.__lock:
+                child = self.__children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self, labels: dict, value) -> list:
+        return [("", labels, value)]
+
+    def collect(self) -> MetricSnapshot:
+        with self.__lock:
+            children = list(self.__children.items())
+        samples = []
+        for key, child in children:
+            samples.extend(self._samples(dict(zip(self.labelnames, key)), child.value))
+        return MetricSnapshot(self.name, self.kind, self.documentation, samples)
+
+
+class Counter(MetricFamily):
+    kind = "counter"
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: Union[int, float] = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(MetricFamily):
+    kind = "gauge"
+
+    def _new_child(self):
+        return GaugeChild()
+
+    def set(self, value: Union[int, float]):
+        self.labels().set(value)
+
+    def set_function(self, function: Union[Callable, None]):
+        self.labels().set_function(function)
+
+
+class Histogram(MetricFamily):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str = "",
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[Union[int, float]] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(bound for bound in buckets if bound != math.inf))
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: Union[int, float]):
+        self.labels().observe(value)
+
+    def _samples(self, labels: dict, value: dict) -> list:
+        samples = [("_bucket", dict(labels, le=bound), count) for bound, count in value["buckets"]]
+        samples.append(("_sum", labels, value["sum"]))
+        samples.append(("_count", labels, value["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics: counters, gauges and fixed-bucket histograms registered by the
+    framework, plus collectors called at scrape time for values other classes already keep
+    (pool and cache statistics, log queue depth). Disabled, the instrumented hot paths skip
+    recording after a single attribute check.
+    """
+
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.__lock = threading.Lock()
+        self.__families: dict = {}
+        self.__collectors = []
+        self.__exporter = None
+        self.__exporter_options = None
+
+    @classmethod
+    def instance(cls):
+        """
+        Process-wide registry, created on first use
+        :return: Registry: MetricsRegistry
+        """
+        if cls.__instance is None:
+            with cls.__instance_lock:
+                if cls.__instance is None:
+                    cls.__instance = cls()
+        return cls.__instance
+
+    def __register(self, family_class, name: str, documentation: str, labelnames: Iterable[str], **options):
+        family = self.__families.get(name)
+        if family is None:
+            with self.__lock:
+                family = self.__families.get(name)
+                if family is None:
+                    family = self.__families[name] = family_class(name, documentation, labelnames, **options)
+        if not isinstance(family, family_class):
+            raise ValueError("Metric {} is already registered as a {}".format(name, family.kind))
+        return family
+
+    def counter(self, name: str, documentation: str = "", labelnames: Iterable[str] = ()) -> Counter:
+        """
+        Counter of the name, registered on first use
+        :param name: Metric name, ends in _total by convention: String
+        :param documentation: Help text: String
+        :param labelnames: Label names: Iterable
+        :return: Counter: Counter
+        """
+        return self.__register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str = "", labelnames: Iterable[str] = ()) -> Gauge:
+        """
+        Gauge of the name, registered on first use
+        :param name: Metric name: String
+        :param documentation: Help text: String
+        :param labelnames: Label names: Iterable
+        :return: Gauge: Gauge
+        """
+        return self.__register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str = "",
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[Union[int, float]] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Histogram of the name, registered on first use
+        :param name: Metric name, in base units (seconds, bytes): String
+        :param documentation: Help text: String
+        :param labelnames: Label names: Iterable
+        :param buckets: Bucket upper bounds: Iterable
+        :return: Histogram: Histogram
+        """
+        return self.__register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable):
+        """
+        Call a collector on every collection, it returns MetricSnapshot objects
+        :param collector: Callable taking no arguments: Callable
+        :return: None
+        """
+        with self.__lock:
+            if collector not in self.__collectors:
+                self.__collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable):
+        with self.__lock:
+            if collector in self.__collectors:
+                self.__collectors.remove(collector)
+
+    def collect(self) -> list:
+        """
+        Current value of every metric
+        :return: Metric snapshots: List
+        """
+        with self.__lock:
+            families = list(self.__families.values())
+            collectors = list(self.__collectors)
+        snapshots = [family.collect() for family in families]
+        for collector in collectors:
+            try:
+                snapshots.extend(collector())
+            except Exception:
+                # A failing collector must not take the other metrics down with it.
+                continue
+        return snapshots
+
+    def exposition(self) -> str:
+        """
+        Metrics in the Prometheus text exposition format (version 0.0.4)
+        :return: Exposition text: String
+        """
+        lines = []
+        for snapshot in self.collect():
+            if not snapshot.samples:
+                continue
+            documentation = snapshot.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append("# HELP {} {}".format(snapshot.name, documentation))
+            lines.append("# TYPE {} {}".format(snapshot.name, snapshot.kind))
+            for suffix, labels, value in snapshot.samples:
+                lines.append("{}{}{} {}".format(snapshot.name, suffix, format_labels(labels), format_value(value)))
+        return "\n".join(lines) + "\n"
+
+    def apply_config(self, metrics_config: Union[dict, None]):
+        """
+        Apply the metrics configuration section, the exporter is restarted only if it changed
+        :param metrics_config: metrics section (enabled, exporter, path, host, port, interval): Dict
+        :return: None
+        """
+        metrics_config = dict(metrics_config or {})
+        self.enabled = bool(metrics_config.get("enabled", False))
+        exporter = metrics_config.get("exporter") or "none"
+        options = (
+            {key: value for key, value in metrics_config.items() if key not in ("enabled", "exporter")}
+            if self.enabled and exporter != "none"
+            else None
+        )
+        if options is not None:
+            options["mode"] = exporter
+        if options == self.__exporter_options:
+            return
+        if self.__exporter is not None:
+            self.__exporter.stop()
+            self.__exporter = None
+        self.__exporter_options = options
+        if options is not None:
+            from .exporter import MetricsExporter
+
+            self.__exporter = MetricsExporter(self, **options).start()
+
+    @property
+    def exporter(self):
+        return self.__exporter
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{{{}}}".format(
+        ",".join(
+            '{}="{}"'.format(
+                name,
+                format_value(value) if name == "le" else str(value)
+                .replace("\\", "\\\\")
+                .replace('"', '\\"')
+                .replace("\n", "\\n"),
+            )
+            for name, value in labels.items()
+        )
+    )
+
+
+def format_value(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(value)
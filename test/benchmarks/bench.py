@@ -0,0 +1,178 @@
+# coding: utf8
+"""
+@ File: bench.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import os
+import argparse
+import tempfile
+import functools
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
+sys.path.insert(0, ROOT_PATH)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import load_results, measure, report, save_results
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BENCH_TABLE = "austin_bench"
+GROUPS = ("config", "journal", "mysql", "redis")
+
+
+def config_benchmarks(options) -> list:
+    from modules.inheritance import BaseClass
+
+    tool = BaseClass()
+    return [measure("config.access", lambda: tool.config, options.iterations * 10)]
+
+
+def journal_benchmarks(options) -> list:
+    from modules.journals import JournalModulesClass
+
+    journal = JournalModulesClass()
+    results = []
+    JournalModulesClass.set_level("INFO")
+    results.append(
+        measure("journal.debug_filtered", lambda: journal.debug("query {} took {}", 1, 0.5), options.iterations * 10)
+    )
+    for sink in ("file", "batch"):
+        JournalModulesClass.apply_config({"level": "DEBUG", "sink": sink, "batch": {"rotation_mb": 0}})
+        results.append(
+            measure("journal.debug_{}".format(sink), lambda: journal.debug("query {} took {}", 1, 0.5), options.iterations)
+        )
+    JournalModulesClass.apply_config({"level": options.log_level, "sink": "file"})
+    return results
+
+
+def mysql_benchmarks(options) -> list:
+    import pymysql
+
+    from tools.database import MySQLConnectionPool, MySQLStandaloneToolsClass
+    from standins import FakeMySQLConnection
+
+    if options.mysql == "fake":
+        pymysql.connect = functools.partial(FakeMySQLConnection, latency_us=options.latency_us)
+        query, args = "SELECT id, name, score FROM {} WHERE id > %s LIMIT 20".format(BENCH_TABLE), (0,)
+    else:
+        query, args = "SELECT %s", (1,)
+    tool = MySQLStandaloneToolsClass()
+    if options.mysql == "real":
+        tool.operation(
+            "CREATE TABLE IF NOT EXISTS {} (id INT, name VARCHAR(64), score DOUBLE)".format(BENCH_TABLE)
+        )
+    tool.query(query, args)
+    pool: MySQLConnectionPool = tool._MySQLStandaloneToolsClass__connection_pool()
+    rows = [(index, "name-{}".format(index), index * 1.5) for index in range(options.bulk_rows)]
+
+    def checkout():
+        pool.release(pool.acquire())
+
+    def connect():
+        pool.release(pool.acquire(), discard=True)
+
+    results = [
+        measure("mysql.pool_checkout", checkout, options.iterations),
+        measure("mysql.connect", connect, max(options.iterations // 10, 10)),
+        measure("mysql.query", lambda: tool.query(query, args), options.iterations),
+        measure(
+            "mysql.insert",
+            lambda: tool.insert("INSERT INTO {} (id, name, score) VALUES (%s, %s, %s)".format(BENCH_TABLE), rows[0]),
+            options.iterations,
+        ),
+        measure(
+            "mysql.bulk_insert_{}".format(options.bulk_rows),
+            lambda: tool.bulk_insert(BENCH_TABLE, rows, batch_size=options.bulk_rows),
+            max(options.iterations // 50, 10),
+            warmup=2,
+            allocation_iterations=5,
+            batch=options.bulk_rows,
+        ),
+    ]
+    if options.mysql == "real":
+        tool.operation("DROP TABLE IF EXISTS {}".format(BENCH_TABLE))
+    return results
+
+
+def redis_benchmarks(options) -> list:
+    from tools.middleware import RedisStandaloneToolsClass
+    from standins import RespServer
+
+    tool = RedisStandaloneToolsClass()
+    server = None
+    if options.redis == "fake":
+        server = RespServer().start()
+        tool._RedisStandaloneToolsClass__redis_config = {"host": "127.0.0.1", "port": server.port}
+    keys = ["austin:bench:{}".format(index) for index in range(100)]
+    mapping = {k: "value-{}".format(index) for index, k in enumerate(keys)}
+    try:
+        return [
+            measure("redis.set", lambda: tool.redis_set(keys[0], "value"), options.iterations),
+            measure("redis.get", lambda: tool.redis_get(keys[0]), options.iterations),
+            measure("redis.mset_100", lambda: tool.redis_mset(mapping), options.iterations // 5, batch=100),
+            measure("redis.mget_100", lambda: tool.redis_mget(keys), options.iterations // 5, batch=100),
+        ]
+    finally:
+        tool.redis_delete(*keys)
+        if server is not None:
+            server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database, cache and logging benchmarks")
+    parser.add_argument("groups", nargs="*", help="Groups to run: {} (default: all)".format(", ".join(GROUPS)))
+    parser.add_argument("--iterations", type=int, default=2000, help="Timed calls per benchmark")
+    parser.add_argument("--mysql", choices=("fake", "real"), default="fake", help="In-process stand-in or the configured MySQL")
+    parser.add_argument("--redis", choices=("fake", "real"), default="fake", help="Local RESP stand-in or the configured Redis")
+    parser.add_argument("--latency-us", type=int, default=0, help="Round trip added by the MySQL stand-in")
+    parser.add_argument("--bulk-rows", type=int, default=1000, help="Rows per bulk insert")
+    parser.add_argument("--log-level", default="INFO", help="Journal level while the other groups run")
+    parser.add_argument("--label", help="Suffix of the results file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--no-save", action="store_true", help="Only print the results")
+    options = parser.parse_args()
+    unknown = set(options.groups).difference(GROUPS)
+    if unknown:
+        parser.error("unknown groups: {}".format(", ".join(sorted(unknown))))
+
+    from modules.configuration import ConfigStore
+    from modules.journals import JournalModulesClass
+
+    # Keep benchmark logging out of logs/services.log, and out of the measured paths unless asked.
+    # The level is set after the configuration is loaded so its logging section does not override it.
+    logs_path = os.path.join(tempfile.mkdtemp(prefix="austin-bench-"), "bench.log")
+    JournalModulesClass.configure(logs_path=logs_path, force=True)
+    ConfigStore.instance()
+    JournalModulesClass.set_level(options.log_level)
+
+    benchmarks = {
+        "config": config_benchmarks,
+        "journal": journal_benchmarks,
+        "mysql": mysql_benchmarks,
+        "redis": redis_benchmarks,
+    }
+    results = []
+    for group in options.groups or GROUPS:
+        results.extend(benchmarks[group](options))
+    report(results, load_results(options.compare) if options.compare else None)
+    if not options.no_save:
+        print("\nsaved: {}".format(save_results(results, RESULTS_PATH, options.label)))
+
+
+if __name__ == "__main__":
+    main()
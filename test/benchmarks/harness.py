@@ -0,0 +1,160 @@
+# coding: utf8
+"""
+@ File: harness.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import os
+import gc
+import json
+import time
+import platform
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Union
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted samples
+    :param samples: Sorted samples: List
+    :param fraction: 0 to 1: Float
+    :return: Sample value: Float
+    """
+    if not samples:
+        return 0.0
+    index = min(int(round(fraction * (len(samples) - 1))), len(samples) - 1)
+    return samples[index]
+
+
+def measure(
+    name: str,
+    operation: Callable,
+    iterations: int = 1000,
+    warmup: int = 50,
+    allocation_iterations: int = 200,
+    batch: int = 1,
+) -> dict:
+    """
+    Time an operation one call at a time, then count its memory allocations separately so
+    tracing does not distort the latencies
+    :param name: Benchmark name: String
+    :param operation: Callable taking no arguments: Callable
+    :param iterations: Timed calls: Integer
+    :param warmup: Untimed calls before measuring: Integer
+    :param allocation_iterations: Calls run under tracemalloc: Integer
+    :param batch: Items processed per call, scales ops/sec to items/sec: Integer
+    :return: Result (ops_per_sec, p50_us, p99_us, max_us, alloc_bytes_per_op, peak_bytes): Dict
+    """
+    for _ in range(warmup):
+        operation()
+    gc.collect()
+    samples = []
+    perf_counter_ns = time.perf_counter_ns
+    started = perf_counter_ns()
+    for _ in range(iterations):
+        begin = perf_counter_ns()
+        operation()
+        samples.append(perf_counter_ns() - begin)
+    elapsed = (perf_counter_ns() - started) / 1e9
+    samples.sort()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(allocation_iterations):
+            operation()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    statistics = after.compare_to(before, "filename")
+    allocated = sum(stat.size_diff for stat in statistics if stat.size_diff > 0)
+    return {
+        "name": name,
+        "iterations": iterations,
+        "batch": batch,
+        "ops_per_sec": round(iterations * batch / elapsed, 1) if elapsed else 0.0,
+        "p50_us": round(percentile(samples, 0.50) / 1000, 2),
+        "p99_us": round(percentile(samples, 0.99) / 1000, 2),
+        "max_us": round(samples[-1] / 1000, 2),
+        "alloc_bytes_per_op": round(allocated / allocation_iterations, 1),
+        "peak_bytes": peak - base,
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "time": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def save_results(results: list, directory: str, label: Union[str, None] = None) -> str:
+    """
+    Write a run to <directory>/<timestamp>[-label].json
+    :param results: Benchmark results: List
+    :param directory: Results directory: String
+    :param label: Run label: String
+    :return: Path of the file: String
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = datetime.now().strftime("%Y%m%d-%H%M%S")
+    if label:
+        name = "{}-{}".format(name, label)
+    path = os.path.join(directory, "{}.json".format(name))
+    with open(path, "w", encoding="utf8") as file:
+        json.dump({"environment": environment(), "label": label, "results": results}, file, indent=2)
+    return path
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r", encoding="utf8") as file:
+        return {result["name"]: result for result in json.load(file)["results"]}
+
+
+def report(results: list, baseline: Union[dict, None] = None):
+    """
+    Print a results table, with the ops/sec and p99 change against a baseline run
+    :param results: Benchmark results: List
+    :param baseline: Results of an earlier run keyed by name: Dict
+    :return: None
+    """
+    header = "{:<28} {:>12} {:>10} {:>10} {:>12} {:>12}".format(
+        "benchmark", "ops/sec", "p50 us", "p99 us", "alloc B/op", "peak B"
+    )
+    if baseline:
+        header += " {:>9} {:>9}".format("ops Δ", "p99 Δ")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        line = "{name:<28} {ops_per_sec:>12,.0f} {p50_us:>10.2f} {p99_us:>10.2f} {alloc_bytes_per_op:>12,.0f} {peak_bytes:>12,}".format(
+            **result
+        )
+        previous = (baseline or {}).get(result["name"])
+        if previous:
+            line += " {:>+8.1f}% {:>+8.1f}%".format(
+                (result["ops_per_sec"] / previous["ops_per_sec"] - 1) * 100 if previous["ops_per_sec"] else 0.0,
+                (result["p99_us"] / previous["p99_us"] - 1) * 100 if previous["p99_us"] else 0.0,
+            )
+        print(line)
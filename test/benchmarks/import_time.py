@@ -0,0 +1,104 @@
+# coding: utf8
+"""
+@ File: import_time.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import os
+import re
+import argparse
+import statistics
+import subprocess
+
+ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+DEFAULT_STATEMENT = "from modules.inheritance import BaseClass"
+
+
+def import_times(statement: str) -> dict:
+    """
+    Run a statement in a fresh interpreter under -X importtime
+    :param statement: Python statement: String
+    :return: Module name and (self us, cumulative us, depth): Dict
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_PATH,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+    modules = {}
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def wall_time(statement: str) -> float:
+    """
+    Interpreter start-up plus the statement, in a fresh process
+    :param statement: Python statement: String
+    :return: Seconds: Float
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import time; started = time.perf_counter(); {}; print(time.perf_counter() - started)".format(statement),
+        ],
+        cwd=ROOT_PATH,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the framework entry points")
+    parser.add_argument("--statement", default=DEFAULT_STATEMENT, help="Import statement to measure")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=15, help="Modules listed by cumulative time")
+    options = parser.parse_args()
+
+    runs = [import_times(options.statement) for _ in range(options.repeat)]
+    cumulative = {
+        name: statistics.median(run[name][1] for run in runs if name in run) for name in runs[0]
+    }
+    self_time = {
+        name: statistics.median(run[name][0] for run in runs if name in run) for name in runs[0]
+    }
+    walls = [wall_time(options.statement) for _ in range(options.repeat)]
+
+    print("statement: {}".format(options.statement))
+    print("modules imported: {}".format(len(runs[0])))
+    print("import time (sum of self, median): {:.1f} ms".format(sum(self_time.values()) / 1000))
+    print("statement wall time (median of {}): {:.1f} ms".format(options.repeat, statistics.median(walls) * 1000))
+    print()
+    print("{:>12} {:>12}  {}".format("self (us)", "cumul (us)", "module"))
+    for name in sorted(cumulative, key=cumulative.get, reverse=True)[: options.top]:
+        print("{:>12.0f} {:>12.0f}  {}".format(self_time[name], cumulative[name], name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# coding: utf8
+"""
+@ File: standins.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+import threading
+import socketserver
+from typing import Union
+
+from pymysql import converters
+from pymysql.cursors import Cursor
+
+MAX_ALLOWED_PACKET = 64 * 1024 * 1024
+
+
+class FakeMySQLResult:
+    def __init__(self, rows: tuple = (), description=None, affected_rows: int = 0):
+        self.rows = rows
+        self.description = description
+        self.affected_rows = affected_rows
+        self.insert_id = 0
+        self.warning_count = 0
+        self.has_next = False
+
+
+class FakeMySQLConnection:
+    """
+    In-process stand-in for pymysql.connect: real pymysql cursors run against it, so
+    escaping and the executemany rewrite are measured, only the server round trip is
+    replaced by a fixed optional latency
+    """
+
+    def __init__(self, rows_per_query: int = 20, latency_us: int = 0, **connect_kwargs):
+        self.encoding = "utf8"
+        self.charset = connect_kwargs.get("charset", "utf8mb4")
+        self.open = True
+        self.statements = 0
+        self.bytes_sent = 0
+        self._result = None
+        self.__latency = latency_us / 1e6
+        self.__rows = tuple((index, "name-{}".format(index), index * 1.5) for index in range(rows_per_query))
+        self.__description = (
+            ("id", 3, None, 11, 11, 0, False),
+            ("name", 253, None, 255, 255, 0, True),
+            ("score", 5, None, 22, 22, 31, True),
+        )
+
+    def __round_trip(self):
+        if self.__latency:
+            deadline = time.perf_counter() + self.__latency
+            while time.perf_counter() < deadline:
+                pass
+
+    def cursor(self, cursor=None):
+        return (cursor or Cursor)(self)
+
+    def query(self, sql, unbuffered: bool = False):
+        self.statements += 1
+        self.bytes_sent += len(sql)
+        self.__round_trip()
+        head = (sql.decode("utf8", "replace") if isinstance(sql, bytes) else sql).lstrip()[:32].lower()
+        if head.startswith("select @@max_allowed_packet"):
+            self._result = FakeMySQLResult(((MAX_ALLOWED_PACKET,),), (("@@max_allowed_packet", 8),))
+        elif head.startswith(("select", "show", "with")):
+            self._result = FakeMySQLResult(self.__rows, self.__description)
+        else:
+            self._result = FakeMySQLResult(affected_rows=1)
+        return self._result.affected_rows
+
+    def next_result(self, unbuffered: bool = False):
+        return 0
+
+    def escape(self, obj, mapping=None):
+        return converters.escape_item(obj, self.charset, mapping=mapping)
+
+    def literal(self, obj):
+        return self.escape(obj, converters.encoders)
+
+    def escape_string(self, s: str) -> str:
+        return converters.escape_string(s)
+
+    def ping(self, reconnect: bool = True):
+        self.__round_trip()
+
+    def begin(self):
+        self.query("BEGIN")
+
+    def commit(self):
+        self.__round_trip()
+
+    def rollback(self):
+        self.__round_trip()
+
+    def autocommit(self, value: bool):
+        pass
+
+    def close(self):
+        self.open = False
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """Minimal RESP2 server: the string commands the Redis tools use, one dict per server"""
+
+    def __read_command(self) -> Union[list, None]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()
+        arguments = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            arguments.append(self.rfile.read(length + 2)[:-2])
+        return arguments
+
+    @staticmethod
+    def __bulk(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            command = self.__read_command()
+            if command is None:
+                return
+            name = command[0].upper()
+            arguments = command[1:]
+            if name == b"GET":
+                reply = self.__bulk(store.get(arguments[0]))
+            elif name == b"SET":
+                if b"NX" in (option.upper() for option in arguments[2:]) and arguments[0] in store:
+                    reply = self.__bulk(None)
+                else:
+                    store[arguments[0]] = arguments[1]
+                    reply = b"+OK\r\n"
+            elif name == b"MGET":
+                reply = b"*%d\r\n" % len(arguments) + b"".join(self.__bulk(store.get(k)) for k in arguments)
+            elif name == b"MSET":
+                for index in range(0, len(arguments), 2):
+                    store[arguments[index]] = arguments[index + 1]
+                reply = b"+OK\r\n"
+            elif name in (b"INCR", b"INCRBY"):
+                value = int(store.get(arguments[0], b"0")) + (int(arguments[1]) if len(arguments) > 1 else 1)
+                store[arguments[0]] = str(value).encode()
+                reply = b":%d\r\n" % value
+            elif name == b"DEL":
+                reply = b":%d\r\n" % sum(1 for k in arguments if store.pop(k, None) is not None)
+            elif name == b"PING":
+                reply = b"+PONG\r\n"
+            elif name in (b"AUTH", b"SELECT", b"CLIENT"):
+                reply = b"+OK\r\n"
+            else:
+                reply = b"-ERR unknown command '%s'\r\n" % name
+            self.wfile.write(reply)
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    """Local stand-in for redis-server, started on an ephemeral port"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), RespHandler)
+        self.store = {}
+        self.__thread = threading.Thread(target=self.serve_forever, name="resp-standin", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
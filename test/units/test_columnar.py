@@ -0,0 +1,86 @@
+# coding: utf8
+"""
+@File: test_columnar.py
+@Editor: PyCharm
+@Author: Austin (From Chengdu.China) https://fairy.host
+@HomePage: https://github.com/AustinFairyland
+@OperatingSystem: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@CreatedTime: 2026-10-18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import math
+import datetime
+import unittest
+
+from pymysql.constants import FIELD_TYPE
+
+from tools.database.columnar import fetch_columnar
+
+
+class FakeCursor:
+    """Executed cursor handing out its rows in batches"""
+
+    def __init__(self, description, rows):
+        self.description = description
+        self.rows = list(rows)
+
+    def fetchmany(self, size: int):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+def fetch(type_code: int, values, batch_size: int = 2):
+    cursor = FakeCursor((("c", type_code),), [(value,) for value in values])
+    result = fetch_columnar(cursor, batch_size=batch_size, use_numpy=False)
+    return result["c"], result.kinds["c"]
+
+
+class ColumnarTestCase(unittest.TestCase):
+    def test_integers(self):
+        column, kind = fetch(FIELD_TYPE.LONG, [1, 2, 3])
+        self.assertEqual(kind, "int")
+        self.assertEqual(column.typecode, "q")
+        self.assertEqual(list(column), [1, 2, 3])
+
+    def test_bigint_unsigned_widens_to_uint(self):
+        column, kind = fetch(FIELD_TYPE.LONGLONG, [1, 2, 2 ** 63, 2 ** 64 - 1])
+        self.assertEqual(kind, "uint")
+        self.assertEqual(list(column), [1, 2, 2 ** 63, 2 ** 64 - 1])
+
+    def test_negative_after_uint_falls_back_to_values(self):
+        column, kind = fetch(FIELD_TYPE.LONGLONG, [2 ** 63, 1, -1, 2])
+        self.assertEqual(kind, "object")
+        self.assertEqual(column, [2 ** 63, 1, -1, 2])
+
+    def test_null_widens_to_float(self):
+        column, kind = fetch(FIELD_TYPE.LONG, [1, 2, None, 4])
+        self.assertEqual(kind, "float")
+        self.assertEqual(list(column)[:2], [1.0, 2.0])
+        self.assertTrue(math.isnan(column[2]))
+
+    def test_zero_dates_become_none(self):
+        moment = datetime.datetime(2026, 10, 18, 12, 0)
+        column, kind = fetch(FIELD_TYPE.DATETIME, [moment, "0000-00-00 00:00:00", None])
+        self.assertEqual(kind, "datetime")
+        self.assertEqual(column, [moment, None, None])
+
+    def test_duplicate_labels_and_empty_result(self):
+        cursor = FakeCursor((("id", FIELD_TYPE.LONG), ("id", FIELD_TYPE.LONG)), [])
+        result = fetch_columnar(cursor, use_numpy=False)
+        self.assertEqual(result.names, ["id", "id_1"])
+        self.assertEqual(len(result), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
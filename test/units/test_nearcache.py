@@ -0,0 +1,107 @@
+# coding: utf8
+"""
+@File: test_nearcache.py
+@Editor: PyCharm
+@Author: Austin (From Chengdu.China) https://fairy.host
+@HomePage: https://github.com/AustinFairyland
+@OperatingSystem: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@CreatedTime: 2026-10-18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+import unittest
+
+from tools.middleware.nearcache import NearCache
+
+
+class Loader:
+    """Counts the reads that reach Redis"""
+
+    def __init__(self, value="value"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self, key: str):
+        self.calls += 1
+        return self.value
+
+
+class NearCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = NearCache(enabled=True, size=2, ttl=60)
+
+    def test_hit_after_load(self):
+        loader = Loader()
+        self.assertEqual(self.cache.get("a", loader), "value")
+        self.assertEqual(self.cache.get("a", loader), "value")
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertEqual(self.cache.stats["misses"], 1)
+
+    def test_invalidate_drops_the_entry(self):
+        loader = Loader()
+        self.cache.get("a", loader)
+        self.cache.invalidate(("a",))
+        self.cache.get("a", loader)
+        self.assertEqual(loader.calls, 2)
+        self.assertEqual(self.cache.stats["invalidations"], 1)
+
+    def test_invalidation_during_the_read_is_not_cached(self):
+        def loader(key: str):
+            # The write lands while the value is on its way back.
+            self.cache.invalidate((key,))
+            return "stale"
+
+        self.assertEqual(self.cache.get("a", loader), "stale")
+        fresh = Loader("fresh")
+        self.assertEqual(self.cache.get("a", fresh), "fresh")
+        self.assertEqual(fresh.calls, 1)
+
+    def test_failed_read_is_not_cached(self):
+        def loader(key: str):
+            raise ConnectionError()
+
+        with self.assertRaises(ConnectionError):
+            self.cache.get("a", loader)
+        loader = Loader()
+        self.cache.get("a", loader)
+        self.cache.get("a", loader)
+        self.assertEqual(loader.calls, 1)
+
+    def test_least_recently_used_is_evicted(self):
+        loader = Loader()
+        for key in ("a", "b", "a", "c"):
+            self.cache.get(key, loader)
+        self.assertEqual(self.cache.stats["size"], 2)
+        calls = loader.calls
+        self.cache.get("a", loader)
+        self.assertEqual(loader.calls, calls)
+        self.cache.get("b", loader)
+        self.assertEqual(loader.calls, calls + 1)
+
+    def test_expired_entry_is_read_again(self):
+        cache = NearCache(enabled=True, size=2, ttl=0.01)
+        loader = Loader()
+        cache.get("a", loader)
+        time.sleep(0.02)
+        cache.get("a", loader)
+        self.assertEqual(loader.calls, 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            NearCache(mode="polling")
+
+
+if __name__ == "__main__":
+    unittest.main()
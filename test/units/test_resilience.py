@@ -0,0 +1,173 @@
+# coding: utf8
+"""
+@File: test_resilience.py
+@Editor: PyCharm
+@Author: Austin (From Chengdu.China) https://fairy.host
+@HomePage: https://github.com/AustinFairyland
+@OperatingSystem: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@CreatedTime: 2026-10-18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+import asyncio
+import unittest
+
+from tools.public import CircuitOpenError
+from tools.public import DeadlineExceededError
+from tools.public import ResiliencePolicy
+from tools.public import deadline
+from tools.public.resilience import CircuitBreaker
+from tools.public.resilience import bounded_timeout
+from tools.public.resilience import remaining
+
+
+class Transient(Exception):
+    pass
+
+
+def transient(error: Exception) -> bool:
+    return isinstance(error, Transient)
+
+
+class Flaky:
+    """Fails with Transient a number of times, then returns ok"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise Transient()
+        return "ok"
+
+    async def run(self):
+        return self()
+
+
+class DeadlineTestCase(unittest.TestCase):
+    def test_nested_deadline_only_tightens(self):
+        self.assertIsNone(remaining())
+        with deadline(0.2):
+            with deadline(10):
+                self.assertLessEqual(remaining(), 0.2)
+            self.assertLessEqual(bounded_timeout(5), 0.2)
+        self.assertIsNone(remaining())
+        self.assertEqual(bounded_timeout(5), 5)
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        breaker.failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.stats["rejected"], 1)
+
+    def test_half_open_single_trial(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.failure()
+        time.sleep(0.02)
+        self.assertEqual([breaker.allow() for _ in range(3)], [True, False, False])
+        self.assertEqual(breaker.state, "half_open")
+        breaker.success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow())
+
+    def test_failed_trial_opens_again(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.failure()
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        breaker.failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+    def test_released_trial_is_granted_again(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.failure()
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.release_trial()
+        self.assertEqual([breaker.allow() for _ in range(2)], [True, False])
+
+
+class ResiliencePolicyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.policy = ResiliencePolicy(attempts=3, backoff=0, backoff_max=0, failure_threshold=10)
+
+    def test_transient_failures_are_retried(self):
+        flaky = Flaky(2)
+        self.assertEqual(self.policy.call(flaky, transient=transient), "ok")
+        self.assertEqual(flaky.calls, 3)
+
+    def test_attempts_are_bounded(self):
+        flaky = Flaky(5)
+        with self.assertRaises(Transient):
+            self.policy.call(flaky, transient=transient)
+        self.assertEqual(flaky.calls, 3)
+
+    def test_no_retry_without_transient_or_idempotence(self):
+        flaky = Flaky(1)
+        with self.assertRaises(Transient):
+            self.policy.call(flaky)
+        flaky = Flaky(1)
+        with self.assertRaises(Transient):
+            self.policy.call(flaky, transient=transient, idempotent=False)
+        self.assertEqual(flaky.calls, 1)
+
+    def test_open_breaker_fails_fast(self):
+        breaker = self.policy.breaker("test://open")
+        self.assertIs(self.policy.breaker("test://open"), breaker)
+        for _ in range(10):
+            breaker.failure()
+        flaky = Flaky(0)
+        with self.assertRaises(CircuitOpenError):
+            self.policy.call(flaky, breaker=breaker, transient=transient)
+        self.assertEqual(flaky.calls, 0)
+
+    def test_backoff_past_the_deadline_stops(self):
+        self.policy.delay = lambda attempt: 5
+        flaky = Flaky(5)
+        started = time.monotonic()
+        with deadline(0.5):
+            with self.assertRaises(DeadlineExceededError):
+                self.policy.call(flaky, transient=transient)
+        self.assertEqual(flaky.calls, 1)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_interrupted_trial_is_released(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.failure()
+        time.sleep(0.02)
+
+        def interrupted():
+            raise KeyboardInterrupt()
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.policy.call(interrupted, breaker=breaker, transient=transient)
+        self.assertTrue(breaker.allow())
+
+    def test_call_async(self):
+        flaky = Flaky(2)
+        self.assertEqual(asyncio.run(self.policy.call_async(flaky.run, transient=transient)), "ok")
+        self.assertEqual(flaky.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# coding: utf8
+"""
+@File: test_scan.py
+@Editor: PyCharm
+@Author: Austin (From Chengdu.China) https://fairy.host
+@HomePage: https://github.com/AustinFairyland
+@OperatingSystem: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@CreatedTime: 2026-10-18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import unittest
+
+from tools.public import MySQLQueryError
+from tools.public import ParamsError
+from tools.database.scan import key_ranges
+from tools.database.scan import keyset_scan
+from tools.database.scan import parallel_keyset_scan
+
+DESCRIPTION = (("id",), ("value",))
+
+
+class FakeTable:
+    """Rows (id, value) answering the statements of the keyset scan"""
+
+    def __init__(self, ids):
+        self.rows = [(key, "v{}".format(key)) for key in ids]
+        self.statements = []
+
+    def fetch_page(self, statement, args):
+        self.statements.append(statement.sql)
+        if statement.sql.startswith("select min("):
+            if not self.rows:
+                return [(None, None)], None
+            return [(self.rows[0][0], self.rows[-1][0])], None
+        args = list(args)
+        chunk = args.pop()
+        after = args.pop(0) if "id > %s" in statement.sql else None
+        until = args.pop(0) if "id <= %s" in statement.sql else None
+        rows = [
+            row for row in self.rows
+            if (after is None or row[0] > after) and (until is None or row[0] <= until)
+        ]
+        return rows[:chunk], DESCRIPTION
+
+
+class KeysetScanTestCase(unittest.TestCase):
+    def test_pages_in_key_order(self):
+        table = FakeTable(range(1, 11))
+        pages = list(keyset_scan(table.fetch_page, "t", chunk=4))
+        self.assertEqual([len(page) for page in pages], [4, 4, 2])
+        self.assertEqual([row[0] for page in pages for row in page], list(range(1, 11)))
+        # Every page after the first shares one template.
+        self.assertEqual(len(set(table.statements[1:])), 1)
+
+    def test_exact_multiple_ends_on_empty_page(self):
+        table = FakeTable(range(1, 9))
+        pages = list(keyset_scan(table.fetch_page, "t", chunk=4))
+        self.assertEqual([len(page) for page in pages], [4, 4])
+        self.assertEqual(len(table.statements), 3)
+
+    def test_bounds(self):
+        table = FakeTable(range(1, 11))
+        rows = [row[0] for page in keyset_scan(table.fetch_page, "t", chunk=3, after=2, until=7) for row in page]
+        self.assertEqual(rows, [3, 4, 5, 6, 7])
+
+    def test_failure_and_parameters(self):
+        with self.assertRaises(MySQLQueryError):
+            list(keyset_scan(lambda statement, args: (None, None), "t"))
+        with self.assertRaises(ParamsError):
+            list(keyset_scan(FakeTable(()).fetch_page, "t", chunk=0))
+        with self.assertRaises(ParamsError):
+            list(keyset_scan(FakeTable(range(5)).fetch_page, "t", key="missing", chunk=2))
+
+
+class KeyRangesTestCase(unittest.TestCase):
+    def test_ranges_cover_the_key_space(self):
+        ranges = key_ranges(FakeTable(range(1, 11)).fetch_page, "t", parts=3)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 10)
+        for (_, upper), (lower, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(upper, lower)
+
+    def test_small_and_empty_tables(self):
+        self.assertEqual(key_ranges(FakeTable((7,)).fetch_page, "t", parts=4), [(6, 7)])
+        self.assertEqual(key_ranges(FakeTable(()).fetch_page, "t"), [])
+
+
+class ParallelKeysetScanTestCase(unittest.TestCase):
+    def test_every_row_once(self):
+        table = FakeTable(range(1, 101))
+        pages = list(parallel_keyset_scan(table.fetch_page, "t", chunk=7, parallel=4))
+        self.assertEqual(sorted(row[0] for page in pages for row in page), list(range(1, 101)))
+
+    def test_worker_error_reaches_the_consumer(self):
+        table = FakeTable(range(1, 101))
+
+        def fetch_page(statement, args):
+            if "id > %s" in statement.sql and args[0] >= 50:
+                return None, None
+            return table.fetch_page(statement, args)
+
+        with self.assertRaises(MySQLQueryError):
+            list(parallel_keyset_scan(fetch_page, "t", chunk=5, parallel=4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# coding: utf8
+"""
+@File: test_statement.py
+@Editor: PyCharm
+@Author: Austin (From Chengdu.China) https://fairy.host
+@HomePage: https://github.com/AustinFairyland
+@OperatingSystem: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@CreatedTime: 2026-10-18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import unittest
+
+from tools.public import ParamsError
+from tools.database.statement import CompiledStatement
+from tools.database.statement import StatementCache
+
+
+class CompiledStatementTestCase(unittest.TestCase):
+    def test_fingerprint_replaces_literals(self):
+        statement = CompiledStatement("SELECT a FROM t WHERE name = 'bob' AND  id = 42;")
+        self.assertEqual(statement.sql, "SELECT a FROM t WHERE name = 'bob' AND  id = 42")
+        self.assertEqual(statement.fingerprint, "select a from t where name = ? and id = ?")
+        self.assertEqual(statement.placeholders, 0)
+
+    def test_same_shape_same_fingerprint(self):
+        first = CompiledStatement("select * from t where id = 1")
+        second = CompiledStatement("SELECT *\n FROM t\n WHERE id = 2")
+        self.assertEqual(first.fingerprint, second.fingerprint)
+
+    def test_placeholders_outside_literals_and_comments(self):
+        statement = CompiledStatement("insert into t values ('50%%', '%s', %s) -- %s")
+        self.assertEqual(statement.placeholders, 1)
+        named = CompiledStatement("update t set a = %(a)s where b = %(b)s")
+        self.assertEqual(named.named, frozenset(("a", "b")))
+        self.assertEqual(named.placeholders, 0)
+
+    def test_readonly_and_tables(self):
+        statement = CompiledStatement("select x.a from db.t1 as x, t3 y join `t2` on x.id = t2.id")
+        self.assertTrue(statement.readonly)
+        self.assertEqual(statement.tables, ("db.t1", "t3", "t2"))
+        write = CompiledStatement("update t set a = 1")
+        self.assertFalse(write.readonly)
+        self.assertEqual(write.tables, ("t",))
+
+    def test_join_keyword_is_not_an_alias(self):
+        self.assertEqual(CompiledStatement("select * from a join b on a.id = b.id").tables, ("a", "b"))
+        self.assertEqual(CompiledStatement("select * from a left join b using (id)").tables, ("a", "b"))
+        update = CompiledStatement("update a join b on a.id = b.id set a.x = 1")
+        self.assertFalse(update.readonly)
+        self.assertEqual(update.tables, ("a", "b"))
+
+    def test_with_takes_the_verb_after_the_list(self):
+        read = CompiledStatement("with recursive c (n) as (select 1), d as (select 2) select * from c, d")
+        self.assertTrue(read.readonly)
+        write = CompiledStatement("with c as (select id from u) delete from t where id in (select id from c)")
+        self.assertFalse(write.readonly)
+        self.assertIn("t", write.tables)
+
+    def test_bind(self):
+        statement = CompiledStatement("select * from t where a = %s and b = %s")
+        self.assertEqual(statement.bind([1, 2]), (1, 2))
+        with self.assertRaises(ParamsError):
+            statement.bind((1,))
+        with self.assertRaises(ParamsError):
+            statement.bind(None)
+        with self.assertRaises(ParamsError):
+            statement.bind({"a": 1})
+        self.assertEqual(CompiledStatement("select * from t where a = %s").bind(1), (1,))
+        self.assertIsNone(CompiledStatement("select 1").bind(None))
+
+    def test_bind_named(self):
+        statement = CompiledStatement("select * from t where a = %(a)s")
+        self.assertEqual(statement.bind({"a": 1, "b": 2}), {"a": 1, "b": 2})
+        with self.assertRaises(ParamsError):
+            statement.bind({"b": 2})
+        with self.assertRaises(ParamsError):
+            statement.bind((1,))
+
+
+class StatementCacheTestCase(unittest.TestCase):
+    def test_hit_returns_same_statement(self):
+        cache = StatementCache(max_size=4)
+        statement = cache.compile("select 1")
+        self.assertIs(cache.compile("select 1"), statement)
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = StatementCache(max_size=2)
+        first = cache.compile("select 1")
+        cache.compile("select 2")
+        cache.compile("select 1")
+        cache.compile("select 3")
+        self.assertEqual(cache.stats["size"], 2)
+        self.assertIs(cache.compile("select 1"), first)
+        misses = cache.stats["misses"]
+        cache.compile("select 2")
+        self.assertEqual(cache.stats["misses"], misses + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,21 +12,71 @@ from __future__ import annotations
 import os
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings('ignore')
-if platform.system() == 'Windows':
+if sys.platform == 'win32':
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-import time
-import random
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .mysql import MySQLStandaloneToolsClass
+    from .mysql import MySQLMasterSlaveDBRouterToolsClass
+    from .pool import MySQLConnectionPool
+    from .router import MySQLNodeRouter
+    from .transaction import MySQLTransaction
+    from .profiling import QueryProfiler
+    from .metrics import MySQLMetrics
+    from .tools import SQLStatement
+    from .tools import SelectQuery
+    from .columnar import ColumnarResult
+    from .asyncmysql import AsyncMySQLStandaloneToolsClass
+    from .asyncmysql import AsyncMySQLMasterSlaveDBRouterToolsClass
 
-from .mysql import MySQLStandaloneToolsClass
-from .mysql import MySQLMasterSlaveDBRouterToolsClass
+# Exported names and the submodule defining them, imported on first attribute access.
+_lazy_imports = {
+    'MySQLStandaloneToolsClass': '.mysql',
+    'MySQLMasterSlaveDBRouterToolsClass': '.mysql',
+    'MySQLConnectionPool': '.pool',
+    'MySQLNodeRouter': '.router',
+    'MySQLTransaction': '.transaction',
+    'QueryProfiler': '.profiling',
+    'MySQLMetrics': '.metrics',
+    'SQLStatement': '.tools',
+    'SelectQuery': '.tools',
+    'ColumnarResult': '.columnar',
+    'AsyncMySQLStandaloneToolsClass': '.asyncmysql',
+    'AsyncMySQLMasterSlaveDBRouterToolsClass': '.asyncmysql',
+}
 
 __all__ = [
     'MySQLStandaloneToolsClass',
-    'MySQLMasterSlaveDBRouterToolsClass'
+    'MySQLMasterSlaveDBRouterToolsClass',
+    'MySQLConnectionPool',
+    'MySQLNodeRouter',
+    'MySQLTransaction',
+    'QueryProfiler',
+    'MySQLMetrics',
+    'SQLStatement',
+    'SelectQuery',
+    'ColumnarResult',
+    'AsyncMySQLStandaloneToolsClass',
+    'AsyncMySQLMasterSlaveDBRouterToolsClass',
 ]
+
+
+def __getattr__(name: str):
+    module = _lazy_imports.get(name)
+    if module is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,891 @@
+# coding: utf8
+"""
+@ File: asyncmysql.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+import asyncio
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+from weakref import WeakKeyDictionary
+from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from typing import Iterable, Union
+
+import aiomysql
+
+from modules.inheritance import BaseClass
+
+from tools.public import CircuitOpenError
+from tools.public import MySQLSourceError
+from tools.public import ParamsError
+from tools.public import PoolTimeoutError
+from tools.public import ResiliencePolicy
+from tools.public.resilience import bounded_timeout
+from tools.public.resilience import check_deadline
+
+from .cache import QueryResultCache
+from .mysql import _retryable
+from .mysql import _transient_error
+from .mysql import _unavailable
+from .router import MySQLNode
+from .replication import current_session
+from .replication import enter_session
+from .replication import exit_session
+from .replication import read_lag_bound
+from .replication import record_write
+from .router import MySQLNodeRouter
+from .statement import compile_statement
+from .transaction import ISOLATION_LEVELS
+from .transaction import SAVEPOINT_PATTERN
+
+
+class AsyncMySQLConnectionPool:
+    """asyncio MySQL Connection Pool, one aiomysql pool per event loop and data source"""
+
+    # Event loop -> {data source: creation task of its pool}, keyed by the loop object so a
+    # closed loop's id reused by a new one never finds the old pools.
+    __instances: WeakKeyDictionary = WeakKeyDictionary()
+
+    def __init__(self, pool, wait_timeout: Union[int, float] = 10):
+        self.__pool = pool
+        self.__wait_timeout = wait_timeout
+        self.__waits = 0
+        self.__wait_time = 0.0
+        self.__timeouts = 0
+
+    @classmethod
+    async def instance(cls, pool_config: Union[dict, None] = None, **connect_kwargs):
+        """
+        Pool for a data source on the running event loop, created on first use
+        :param pool_config: Pool options (min_size, max_size, max_lifetime, wait_timeout): Dict
+        :param connect_kwargs: aiomysql.connect keyword arguments: Dict
+        :return: Connection pool: AsyncMySQLConnectionPool
+        """
+        loop = asyncio.get_running_loop()
+        pools = cls.__instances.get(loop)
+        if pools is None:
+            # The tasks and pools reference their loop, drop the entries of closed loops by hand.
+            for closed in [other for other in list(cls.__instances.keys()) if other.is_closed()]:
+                cls.__instances.pop(closed, None)
+            pools = cls.__instances[loop] = {}
+        key = (
+            connect_kwargs.get("host"),
+            connect_kwargs.get("port"),
+            connect_kwargs.get("user"),
+            connect_kwargs.get("db"),
+            connect_kwargs.get("charset"),
+        )
+        # Concurrent first callers await the same creation task, no await between the check and the insert.
+        creating = pools.get(key)
+        if creating is None or cls.__stale(creating):
+            creating = loop.create_task(cls.__create(pool_config or {}, connect_kwargs))
+            pools[key] = creating
+        # A caller cancelled while waiting must not cancel the creation the others wait for.
+        return await asyncio.shield(creating)
+
+    @staticmethod
+    def __stale(creating: asyncio.Task) -> bool:
+        if not creating.done():
+            return False
+        return creating.cancelled() or creating.exception() is not None or creating.result().closed
+
+    @classmethod
+    async def __create(cls, pool_config: dict, connect_kwargs: dict):
+        return cls(
+            await aiomysql.create_pool(
+                minsize=pool_config.get("min_size", 1),
+                maxsize=pool_config.get("max_size", 10),
+                pool_recycle=pool_config.get("max_lifetime", 3600),
+                **connect_kwargs,
+            ),
+            wait_timeout=pool_config.get("wait_timeout", 10),
+        )
+
+    @classmethod
+    async def close_all(cls):
+        """
+        Close the pools of the running event loop
+        :return: None
+        """
+        pools = cls.__instances.pop(asyncio.get_running_loop(), {})
+        for creating in pools.values():
+            if creating.cancelled():
+                continue
+            try:
+                pool = await creating
+            except Exception:
+                # Creation failed, there is nothing to close.
+                continue
+            await pool.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.__pool.closed
+
+    async def acquire(self, timeout: Union[int, float, None] = None):
+        """
+        Borrow a connection, waiting at most timeout seconds for one to become free
+        :param timeout: Wait timeout in seconds, defaults to the pool wait_timeout: Integer | Float
+        :return: Connection object: aiomysql Connection
+        """
+        if timeout is None:
+            timeout = self.__wait_timeout
+        if self.__pool.freesize or self.__pool.size < self.__pool.maxsize:
+            return await self.__pool.acquire()
+        self.__waits += 1
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(self.__pool.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.__timeouts += 1
+            raise PoolTimeoutError(
+                "MySQL connection pool exhausted, waited {:.3f} seconds.".format(timeout)
+            )
+        finally:
+            self.__wait_time += time.monotonic() - started
+
+    async def release(self, connect, discard: bool = False):
+        """
+        Return a borrowed connection to the pool
+        :param connect: Connection object: aiomysql Connection
+        :param discard: Close the connection instead of reusing it: Boolean
+        :return: None
+        """
+        if discard:
+            connect.close()
+        await self.__pool.release(connect)
+
+    async def close(self):
+        self.__pool.close()
+        await self.__pool.wait_closed()
+
+    @property
+    def stats(self) -> dict:
+        idle = self.__pool.freesize
+        return {
+            "size": self.__pool.size,
+            "in_use": self.__pool.size - idle,
+            "idle": idle,
+            "min_size": self.__pool.minsize,
+            "max_size": self.__pool.maxsize,
+            "waits": self.__waits,
+            "wait_time": self.__wait_time,
+            "timeouts": self.__timeouts,
+        }
+
+
+def _aiomysql_kwargs(connect_kwargs: dict) -> dict:
+    """
+    pymysql.connect keyword arguments to aiomysql.connect keyword arguments
+    :param connect_kwargs: pymysql.connect keyword arguments: Dict
+    :return: aiomysql.connect keyword arguments: Dict
+    """
+    kwargs = dict(connect_kwargs)
+    kwargs["db"] = kwargs.pop("database")
+    kwargs["autocommit"] = False
+    return kwargs
+
+
+class AsyncMySQLTransaction:
+    """asyncio counterpart of MySQLTransaction on one pinned connection"""
+
+    def __init__(
+        self,
+        connect,
+        isolation_level: Union[str, None] = None,
+        read_only: bool = False,
+    ):
+        if isolation_level is not None:
+            isolation_level = isolation_level.upper().replace("_", " ")
+            if isolation_level not in ISOLATION_LEVELS:
+                raise ParamsError("Unknown isolation level: {}".format(isolation_level))
+        self.__connect = connect
+        self.__isolation_level = isolation_level
+        self.__read_only = read_only
+        self.__active = False
+        self.__savepoints = []
+        self.__tables = set()
+
+    @property
+    def active(self) -> bool:
+        return self.__active
+
+    @property
+    def tables(self) -> set:
+        """
+        Tables written inside the transaction
+        :return: Table names: Set
+        """
+        return set(self.__tables)
+
+    def __check_active(self):
+        if not self.__active:
+            raise ParamsError("MySQL transaction is not active")
+
+    @staticmethod
+    def __savepoint_name(name: str) -> str:
+        if not isinstance(name, str) or not SAVEPOINT_PATTERN.match(name):
+            raise ParamsError("Savepoint name error: {!r}".format(name))
+        return name
+
+    async def __run(self, sql: str):
+        async with self.__connect.cursor() as cur:
+            await cur.execute(sql)
+
+    async def begin(self):
+        if self.__isolation_level:
+            await self.__run("SET TRANSACTION ISOLATION LEVEL {}".format(self.__isolation_level))
+        await self.__run("START TRANSACTION READ ONLY" if self.__read_only else "START TRANSACTION")
+        self.__active = True
+
+    async def execute(self, query: str, args: Union[tuple, list, dict, None] = None) -> int:
+        """
+        Execute a statement inside the transaction
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: Affected rows: Integer
+        """
+        self.__check_active()
+        statement = compile_statement(query)
+        if not statement.readonly:
+            self.__tables.update(statement.tables)
+        async with self.__connect.cursor() as cur:
+            return await cur.execute(statement.sql, statement.bind(args))
+
+    async def query(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Query inside the transaction, sees its uncommitted writes
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: results: Iteratable Object
+        """
+        self.__check_active()
+        statement = compile_statement(query)
+        async with self.__connect.cursor() as cur:
+            await cur.execute(statement.sql, statement.bind(args))
+            return await cur.fetchall()
+
+    async def savepoint(self, name: str):
+        self.__check_active()
+        name = self.__savepoint_name(name)
+        await self.__run("SAVEPOINT `{}`".format(name))
+        self.__savepoints.append(name)
+
+    async def rollback_to(self, name: str):
+        self.__check_active()
+        name = self.__savepoint_name(name)
+        if name not in self.__savepoints:
+            raise ParamsError("Unknown savepoint: {}".format(name))
+        await self.__run("ROLLBACK TO SAVEPOINT `{}`".format(name))
+        del self.__savepoints[self.__savepoints.index(name) + 1:]
+
+    async def release_savepoint(self, name: str):
+        self.__check_active()
+        name = self.__savepoint_name(name)
+        if name not in self.__savepoints:
+            raise ParamsError("Unknown savepoint: {}".format(name))
+        await self.__run("RELEASE SAVEPOINT `{}`".format(name))
+        del self.__savepoints[self.__savepoints.index(name):]
+
+    async def commit(self):
+        self.__check_active()
+        await self.__connect.commit()
+        self.__active = False
+        self.__savepoints.clear()
+
+    async def rollback(self):
+        if not self.__active:
+            return
+        self.__active = False
+        self.__savepoints.clear()
+        if not self.__connect.closed:
+            await self.__connect.rollback()
+
+
+class AsyncMySQLStandaloneToolsClass(BaseClass):
+    """asyncio MySQL Single Node Database"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__connect_kwargs = None
+        self.__pool_config = None
+        self.__resilience = None
+        self.__breaker = None
+
+    def __mysql_config(self):
+        """
+        Getting the datasource.mysql.standalone configuration once per instance
+        :return: Pool options and aiomysql.connect keyword arguments: Tuple
+        """
+        if self.__connect_kwargs is None:
+            mysql_config = self.config.get("datasource").get("mysql").get("standalone")
+            if mysql_config is None:
+                raise MySQLSourceError("MySQL Source Configuration Error.")
+            __host = mysql_config.get("host")
+            __port = mysql_config.get("port")
+            __user = mysql_config.get("user")
+            __password = mysql_config.get("password")
+            __database = mysql_config.get("database")
+            __charset = mysql_config.get("charset") or "utf8mb4"
+            if not all((__host, __port, __user, __password, __database)):
+                raise MySQLSourceError("MySQL Source Configuration Error.")
+            self.__pool_config = mysql_config.get("pool") or {}
+            self.__connect_kwargs = dict(
+                host=__host,
+                port=__port,
+                user=__user,
+                password=__password,
+                db=__database,
+                charset=__charset,
+                connect_timeout=5,
+                autocommit=False,
+            )
+            # Shared with the blocking tools, both see the same endpoint.
+            self.__breaker = self.__resilience_policy.breaker("mysql://{}:{}".format(__host, __port))
+        return self.__pool_config, self.__connect_kwargs
+
+    @property
+    def __resilience_policy(self) -> ResiliencePolicy:
+        """
+        Process-wide retry and circuit breaker policy, configured by resilience
+        :return: Policy: ResiliencePolicy
+        """
+        if self.__resilience is None:
+            self.__resilience = ResiliencePolicy.instance(self.config.get("resilience"))
+        return self.__resilience
+
+    async def __connection_pool(self) -> AsyncMySQLConnectionPool:
+        pool_config, connect_kwargs = self.__mysql_config()
+        return await AsyncMySQLConnectionPool.instance(pool_config, **connect_kwargs)
+
+    async def __acquire(self):
+        pool = await self.__connection_pool()
+        return pool, await pool.acquire(bounded_timeout(pool.wait_timeout))
+
+    async def __connect_tool(self):
+        """
+        Borrow a connection from the pool of the running event loop. Transient connection
+        failures are retried with backoff, an open circuit or an exhausted deadline fails fast.
+        :return: Connection pool and connection object: Tuple
+        """
+        self.__mysql_config()
+        try:
+            return await self.__resilience_policy.call_async(
+                self.__acquire, breaker=self.__breaker, transient=_transient_error
+            )
+        except Exception as error:
+            self.error("MySQL Connection Failure")
+            self.exception(error)
+            raise
+
+    async def pool_stats(self) -> dict:
+        """
+        MySQL Connection Pool Statistics of the running event loop
+        :return: Statistics (size, in_use, idle, waits, wait_time ...): Dict
+        """
+        return (await self.__connection_pool()).stats
+
+    async def query(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        MySQL Data Queries
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: results: Iteratable Object
+        """
+        self.debug("MySQL Async Data Queries")
+        self.__mysql_config()
+        try:
+            # Reads are idempotent, the whole attempt (connection included) is retried.
+            return await self.__resilience_policy.call_async(
+                self.__query_once, query, args, breaker=self.__breaker, transient=_transient_error
+            )
+        except Exception as error:
+            self.error("MySQL Query Failure：{}".format(query))
+            self.exception(error)
+            if _unavailable(error):
+                raise
+            return None
+
+    async def __query_once(self, query: str, args: Union[tuple, list, dict, None]):
+        """
+        One attempt of query, failures are raised to the resilience policy
+        :return: results: Iteratable Object
+        """
+        pool, conn = await self.__acquire()
+        broken = False
+        try:
+            statement = compile_statement(query)
+            async with conn.cursor() as cur:
+                await cur.execute(statement.sql, statement.bind(args))
+                result = await cur.fetchall()
+            await conn.commit()
+            return result
+        except Exception as error:
+            broken = _transient_error(error)
+            if not conn.closed and not broken:
+                await conn.rollback()
+            raise
+        finally:
+            await pool.release(conn, discard=broken)
+
+    async def operation(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        The executed SQL statement does not return query data.
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: Ture or False: Boolean
+        """
+        self.debug("MySQL Async Operations")
+        # Writes are not idempotent, only borrowing the connection is retried.
+        pool, conn = await self.__connect_tool()
+        broken = False
+        try:
+            statement = compile_statement(query)
+            async with conn.cursor() as cur:
+                await cur.execute(statement.sql, statement.bind(args))
+            await conn.commit()
+            self.debug("MySQL Transaction Executed Successfully：{}", query)
+            result = True
+        except Exception as error:
+            broken = _transient_error(error)
+            if not conn.closed and not broken:
+                await conn.rollback()
+            self.error("MySQL Transaction Execution Failure：{}".format(query))
+            self.exception(error)
+            result = False
+        finally:
+            await pool.release(conn, discard=broken)
+        return result
+
+    async def insert(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Inserting SQL Data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: Ture or False: Boolean
+        """
+        return await self.operation(query, args)
+
+    async def update(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Updating SQL Data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: Ture or False: Boolean
+        """
+        return await self.operation(query, args)
+
+    async def delete(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Delete SQL Data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: Ture or False: Boolean
+        """
+        return await self.operation(query, args)
+
+    @asynccontextmanager
+    async def transaction(self, isolation_level: Union[str, None] = None, read_only: bool = False):
+        """
+        MySQL Transaction on one pooled connection, committed when the async with block
+        exits normally and rolled back when it raises.
+        :param isolation_level: READ UNCOMMITTED / READ COMMITTED / REPEATABLE READ / SERIALIZABLE: String
+        :param read_only: Start a read-only transaction: Boolean
+        :return: Transaction: AsyncMySQLTransaction
+        """
+        self.debug("MySQL Async Transaction")
+        pool, conn = await self.__connect_tool()
+        tx = None
+        clean = True
+        try:
+            tx = AsyncMySQLTransaction(conn, isolation_level=isolation_level, read_only=read_only)
+            await tx.begin()
+            yield tx
+            if tx.active:
+                await tx.commit()
+        except BaseException as error:
+            # CancelledError too, an open transaction must never go back to the pool.
+            clean = await self.__rollback(tx)
+            self.error("MySQL Transaction Rolled Back")
+            self.exception(error)
+            raise
+        finally:
+            await pool.release(conn, discard=not clean or (tx is not None and tx.active))
+
+    async def __rollback(self, tx: Union[AsyncMySQLTransaction, None]) -> bool:
+        """
+        Roll a failed transaction back without masking the error that ended it
+        :param tx: Transaction, None when it was never created: AsyncMySQLTransaction
+        :return: Whether the connection is clean enough to be reused: Boolean
+        """
+        if tx is None:
+            return True
+        try:
+            await tx.rollback()
+            return True
+        except BaseException as error:
+            self.error("MySQL Transaction Rollback Failure")
+            self.exception(error)
+            return False
+
+
+class AsyncMySQLMasterSlaveDBRouterToolsClass(BaseClass):
+    """asyncio MySQL Database Read/Write Separation, sharing node health with the blocking router"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__routers = {}
+        self.__cache = None
+        self.__resilience = None
+
+    @property
+    def __result_cache(self) -> QueryResultCache:
+        """
+        Process-wide query result cache shared with the blocking router, writes invalidate it
+        :return: Query result cache: QueryResultCache
+        """
+        if self.__cache is None:
+            self.__cache = QueryResultCache.instance(
+                self.config.get("datasource").get("mysql").get("dbrouter").get("cache")
+            )
+        return self.__cache
+
+    def __node_router(self, dbrouter: str) -> MySQLNodeRouter:
+        if dbrouter not in ("master", "slave"):
+            raise ParamsError("Method parameter error")
+        router = self.__routers.get(dbrouter)
+        if router is None:
+            router = MySQLNodeRouter.instance(
+                dbrouter, self.config.get("datasource").get("mysql").get("dbrouter")
+            )
+            self.__routers[dbrouter] = router
+        return router
+
+    @property
+    def __resilience_policy(self) -> ResiliencePolicy:
+        """
+        Process-wide retry and circuit breaker policy, configured by resilience
+        :return: Policy: ResiliencePolicy
+        """
+        if self.__resilience is None:
+            self.__resilience = ResiliencePolicy.instance(self.config.get("resilience"))
+        return self.__resilience
+
+    def __node_breaker(self, node: MySQLNode):
+        return self.__resilience_policy.breaker("mysql://{}".format(node.address))
+
+    async def __connect_tool(self, dbrouter: str, read: bool = False):
+        """
+        Borrow a connection from the routed node, ejected or unreachable nodes are skipped;
+        when every node failed the round is retried with backoff, when every circuit is open
+        it fails fast
+        :param dbrouter: Database routing distinguishes between Master and Slave: String
+        :param read: The connection serves a read, which the Master may take over from lagging replicas: Boolean
+        :return: Routed node, its pool and the connection object: Tuple
+        """
+        try:
+            return await self.__resilience_policy.call_async(
+                self.__connect_round, dbrouter, read, transient=_retryable
+            )
+        except Exception as error:
+            self.error("MySQL {} DBRouter Connection Failure".format(dbrouter))
+            self.exception(error)
+            raise
+
+    async def __connect_round(self, dbrouter: str, read: bool = False):
+        """
+        Try the nodes of a group once each, in routing order
+        :return: Routed node, its pool and the connection object: Tuple
+        """
+        router = self.__node_router(dbrouter)
+        max_lag = None
+        if dbrouter == "slave":
+            # The read-your-writes window only concerns reads, a Slave write keeps to max_lag.
+            max_lag = read_lag_bound(router.max_lag) if read else router.max_lag
+        tried, rejected = set(), set()
+        while True:
+            check_deadline()
+            try:
+                node = router.select(exclude=tried, max_lag=max_lag)
+            except MySQLSourceError:
+                if rejected and rejected == tried:
+                    raise CircuitOpenError("Circuit open：MySQL {} nodes".format(router.role))
+                raise
+            if node is None:
+                if not read:
+                    # An explicit Slave statement is never moved to the Master behind the caller's back.
+                    raise MySQLSourceError("No MySQL slave node within {} seconds of lag".format(max_lag))
+                # No replica is known to be fresh enough, the Master serves the read.
+                self.debug("MySQL Replica Lag：{} read routed to the Master", dbrouter)
+                router, max_lag, tried, rejected = self.__node_router("master"), None, set(), set()
+                continue
+            breaker = self.__node_breaker(node)
+            if not breaker.allow():
+                router.release(node)
+                tried.add(node.name)
+                rejected.add(node.name)
+                continue
+            try:
+                pool = await AsyncMySQLConnectionPool.instance(
+                    node.pool_config, **_aiomysql_kwargs(node.connect_kwargs)
+                )
+                connect = await pool.acquire(bounded_timeout(pool.wait_timeout))
+            except Exception as error:
+                # Every exit resolves a half-open trial, or the node would stay failed fast for good.
+                if _transient_error(error):
+                    breaker.failure()
+                else:
+                    breaker.release_trial()
+                router.failure(node)
+                tried.add(node.name)
+                self.error("MySQL {} DBRouter Connection Failure：{}".format(node.name, node.address))
+                self.exception(error)
+                continue
+            except BaseException:
+                breaker.release_trial()
+                router.release(node)
+                raise
+            breaker.success()
+            return node, pool, connect
+
+    async def __release_tool(
+        self,
+        dbrouter: str,
+        node: MySQLNode,
+        pool: AsyncMySQLConnectionPool,
+        connect,
+        started: Union[float, None] = None,
+        discard: bool = False,
+    ):
+        router = self.__node_router(node.role)
+        if connect.closed:
+            router.failure(node)
+        elif started is None:
+            router.release(node)
+        else:
+            router.success(node, time.perf_counter() - started)
+        await pool.release(connect, discard=discard)
+
+    @contextmanager
+    def session(self, sticky_ms: Union[int, float, None] = None):
+        """
+        Read-your-writes session for the running task, see
+        MySQLMasterSlaveDBRouterToolsClass.session
+        with db.session(): await db.update(...); await db.query(...)
+        :param sticky_ms: Window after a write, defaults to dbrouter.router.sticky_ms: Integer | Float
+        :return: Session: ConsistencySession
+        """
+        session = current_session()
+        if session is not None:
+            yield session
+            return
+        if sticky_ms is None:
+            sticky_ms = self.__node_router("slave").sticky_ms
+        session, token = enter_session(sticky_ms)
+        try:
+            yield session
+        finally:
+            exit_session(token)
+
+    async def query(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        MySQL Data Queries on a Slave
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: results: Iteratable Object
+        """
+        self.debug("MySQL Async Data Queries")
+        try:
+            # Reads are idempotent, a retry is routed again and may land on another replica.
+            return await self.__resilience_policy.call_async(self.__query_once, query, args, transient=_retryable)
+        except Exception as error:
+            self.error("MySQL Query Failure：{}".format(query))
+            self.exception(error)
+            if _unavailable(error):
+                raise
+            return None
+
+    async def __query_once(self, query: str, args: Union[tuple, list, dict, None]):
+        """
+        One attempt of query, failures are raised to the resilience policy
+        :return: results: Iteratable Object
+        """
+        node, pool, conn = await self.__connect_round("slave", True)
+        started = time.perf_counter()
+        broken = False
+        try:
+            statement = compile_statement(query)
+            async with conn.cursor() as cur:
+                await cur.execute(statement.sql, statement.bind(args))
+                result = await cur.fetchall()
+            await conn.commit()
+            return result
+        except Exception as error:
+            broken = _transient_error(error)
+            if broken:
+                self.__node_breaker(node).failure()
+            elif not conn.closed:
+                await conn.rollback()
+            raise
+        finally:
+            await self.__release_tool("slave", node, pool, conn, started, discard=broken)
+
+    async def __operation(
+        self, query: str, dbrouter: str, args: Union[tuple, list, dict, None] = None
+    ):
+        """
+        Private methods execute SQL statements that do not return query data.
+        :param query: SQL query statements: String
+        :param dbrouter: Database routing distinguishes between Master and Slave: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: True or False: Boolean
+        """
+        # Writes are not idempotent, only borrowing the connection is retried.
+        node, pool, conn = await self.__connect_tool(dbrouter)
+        started = time.perf_counter()
+        broken = False
+        try:
+            statement = compile_statement(query)
+            async with conn.cursor() as cur:
+                await cur.execute(statement.sql, statement.bind(args))
+            await conn.commit()
+            self.debug("MySQL Transaction Executed Successfully：{}", query)
+            result = True
+        except Exception as error:
+            broken = _transient_error(error)
+            if not conn.closed and not broken:
+                await conn.rollback()
+            self.error("MySQL Transaction Execution Failure：{}".format(query))
+            self.exception(error)
+            result = False
+        finally:
+            await self.__release_tool(dbrouter, node, pool, conn, started, discard=broken)
+        if result and not statement.readonly:
+            await self.__after_write(statement.tables, node.role == "master")
+        return result
+
+    async def __after_write(self, tables: Iterable, master: bool):
+        """
+        Bookkeeping after a committed write, best effort like the blocking router. The shared
+        cache tier invalidates over a blocking Redis round trip, it runs on the default executor.
+        :param tables: Written tables: Iterable
+        :param master: The write went to the Master, it opens the read-your-writes window: Boolean
+        :return: None
+        """
+        if master:
+            record_write()
+        try:
+            result_cache = self.__result_cache
+            if result_cache.shared:
+                await asyncio.get_running_loop().run_in_executor(None, result_cache.invalidate, tables)
+            else:
+                result_cache.invalidate(tables)
+        except Exception as error:
+            self.error("MySQL Query Cache Invalidation Failure：{}".format(", ".join(sorted(tables))))
+            self.exception(error)
+
+    async def master_operation(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Mysql Master executes SQL statements that do not return query data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: True or False: Boolean
+        """
+        self.debug("MySQL Async Master Operations")
+        return await self.__operation(query, "master", args)
+
+    async def slave_operation(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        SQL statement executed by Mysql Slave does not return query data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: True or False: Boolean
+        """
+        self.debug("MySQL Async Slave Operations")
+        return await self.__operation(query, "slave", args)
+
+    async def inster(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Insert SQL Data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: True or False: Boolean
+        """
+        return await self.master_operation(query, args)
+
+    async def update(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Update SQL Data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: True or False: Boolean
+        """
+        return await self.master_operation(query, args)
+
+    async def delete(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Delete SQL Data
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: True or False: Boolean
+        """
+        return await self.master_operation(query, args)
+
+    @asynccontextmanager
+    async def transaction(self, isolation_level: Union[str, None] = None, read_only: bool = False):
+        """
+        MySQL Transaction on one pooled Master connection
+        :param isolation_level: READ UNCOMMITTED / READ COMMITTED / REPEATABLE READ / SERIALIZABLE: String
+        :param read_only: Start a read-only transaction: Boolean
+        :return: Transaction: AsyncMySQLTransaction
+        """
+        self.debug("MySQL Async Transaction")
+        node, pool, conn = await self.__connect_tool("master")
+        tx = None
+        clean = True
+        try:
+            tx = AsyncMySQLTransaction(conn, isolation_level=isolation_level, read_only=read_only)
+            await tx.begin()
+            yield tx
+            if tx.active:
+                await tx.commit()
+        except BaseException as error:
+            # CancelledError too, an open transaction must never go back to the pool.
+            clean = await self.__rollback(tx)
+            self.error("MySQL Transaction Rolled Back")
+            self.exception(error)
+            raise
+        finally:
+            await self.__release_tool(
+                "master", node, pool, conn, discard=not clean or (tx is not None and tx.active)
+            )
+        await self.__after_write(tx.tables, not read_only)
+
+    async def __rollback(self, tx: Union[AsyncMySQLTransaction, None]) -> bool:
+        """
+        Roll a failed transaction back without masking the error that ended it
+        :param tx: Transaction, None when it was never created: AsyncMySQLTransaction
+        :return: Whether the connection is clean enough to be reused: Boolean
+        """
+        if tx is None:
+            return True
+        try:
+            await tx.rollback()
+            return True
+        except BaseException as error:
+            self.error("MySQL Transaction Rollback Failure")
+            self.exception(error)
+            return False
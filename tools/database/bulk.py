@@ -0,0 +1,194 @@
+# coding: utf8
+"""
+@ File: bulk.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+from itertools import islice
+from typing import Iterable, Union
+
+from tools.public import ParamsError
+
+# Room left in max_allowed_packet for the packet header and the ON DUPLICATE suffix.
+PACKET_HEADROOM = 1024
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Backtick-quote a (database.)table or column name
+    :param name: Identifier: String
+    :return: Quoted identifier: String
+    """
+    if not isinstance(name, str) or not name:
+        raise ParamsError("SQL identifier error: {!r}".format(name))
+    return ".".join("`{}`".format(part.strip("`").replace("`", "``")) for part in name.split("."))
+
+
+def insert_template(
+    table: str,
+    columns: Union[list, tuple, None],
+    on_duplicate: Union[str, list, tuple, dict, None] = None,
+    width: Union[int, None] = None,
+) -> str:
+    """
+    Single-row INSERT template that executemany rewrites into multi-row VALUES batches
+    :param table: Table name: String
+    :param columns: Column names, None inserts full rows without a column list: List | Tuple
+    :param on_duplicate: None, "ignore", "update" (all columns), columns to update or {column: expression}: Any
+    :param width: Values per row when no column list is given: Integer
+    :return: INSERT statement template: String
+    """
+    if columns:
+        column_sql = " ({})".format(", ".join(quote_identifier(column) for column in columns))
+        width = len(columns)
+    elif width:
+        column_sql = ""
+    else:
+        raise ParamsError("Bulk insert needs columns or the row width")
+    verb = "INSERT IGNORE INTO" if on_duplicate == "ignore" else "INSERT INTO"
+    sql = "{} {}{} VALUES ({})".format(
+        verb, quote_identifier(table), column_sql, ", ".join(["%s"] * width)
+    )
+    if on_duplicate in (None, "ignore"):
+        return sql
+    if on_duplicate == "update":
+        if not columns:
+            raise ParamsError("on_duplicate='update' needs the column list")
+        assignments = [
+            "{0} = VALUES({0})".format(quote_identifier(column)) for column in columns
+        ]
+    elif isinstance(on_duplicate, dict):
+        assignments = [
+            "{} = {}".format(quote_identifier(column), expression)
+            for column, expression in on_duplicate.items()
+        ]
+    elif isinstance(on_duplicate, (list, tuple)):
+        assignments = [
+            "{0} = VALUES({0})".format(quote_identifier(column)) for column in on_duplicate
+        ]
+    else:
+        raise ParamsError("Unknown on_duplicate option: {!r}".format(on_duplicate))
+    return "{} ON DUPLICATE KEY UPDATE {}".format(sql, ", ".join(assignments))
+
+
+def row_batches(rows: Iterable, batch_size: int, columns: Union[list, tuple, None] = None):
+    """
+    Split rows into lists of tuples, dict rows are ordered by columns
+    :param rows: Dict or sequence rows: Iterable
+    :param batch_size: Rows per batch: Integer
+    :param columns: Column order for dict rows: List | Tuple
+    :return: Batches of row tuples: Generator
+    """
+    if batch_size < 1:
+        raise ParamsError("batch_size must be a positive integer")
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        if isinstance(batch[0], dict):
+            batch = [tuple(row[column] for column in columns) for row in batch]
+        yield batch
+
+
+def peek_columns(rows: Iterable):
+    """
+    Peek the column list (dict rows) or row width (sequence rows) without losing the first row
+    :param rows: Rows: Iterable
+    :return: Columns, row width and the untouched rows: Tuple
+    """
+    iterator = iter(rows)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return None, 0, iter(())
+
+    def chained():
+        yield first
+        yield from iterator
+
+    columns = tuple(first.keys()) if isinstance(first, dict) else None
+    return columns, len(first), chained()
+
+
+class BulkInsertReport(dict):
+    """Bulk insert outcome: rows, batches, seconds, rows_per_sec, success"""
+
+    def __init__(self):
+        super().__init__(rows=0, batches=0, seconds=0.0, rows_per_sec=0.0, success=True)
+        self.__started = time.perf_counter()
+
+    def batch(self, rows: int):
+        self["rows"] += rows
+        self["batches"] += 1
+
+    def finish(self, success: bool = True):
+        self["success"] = success
+        self["seconds"] = time.perf_counter() - self.__started
+        if self["seconds"] > 0:
+            self["rows_per_sec"] = self["rows"] / self["seconds"]
+        return self
+
+
+def execute_bulk_insert(
+    connect,
+    table: str,
+    rows: Iterable,
+    batch_size: int = 1000,
+    on_duplicate: Union[str, list, tuple, dict, None] = None,
+    columns: Union[list, tuple, None] = None,
+    report: Union[BulkInsertReport, None] = None,
+) -> BulkInsertReport:
+    """
+    Insert rows through executemany, which packs each batch into multi-row VALUES
+    statements no larger than max_allowed_packet, committing once per batch.
+    Batches committed before a failure stay committed, the failing batch is rolled back.
+    :param connect: Connection object: MySQL Connect Object
+    :param table: Table name: String
+    :param rows: Dict or sequence rows: Iterable
+    :param batch_size: Rows per batch and commit: Integer
+    :param on_duplicate: None, "ignore", "update", columns to update or {column: expression}: Any
+    :param columns: Column names, defaults to the keys of the first dict row: List | Tuple
+    :param report: Report updated in place: BulkInsertReport
+    :return: Bulk insert report: BulkInsertReport
+    """
+    if report is None:
+        report = BulkInsertReport()
+    peeked, width, rows = peek_columns(rows)
+    if not width:
+        return report.finish()
+    columns = columns or peeked
+    sql = insert_template(table, columns, on_duplicate, width)
+    cur = connect.cursor()
+    try:
+        cur.execute("SELECT @@max_allowed_packet")
+        max_packet = int(cur.fetchone()[0])
+        cur.max_stmt_length = max(max_packet - PACKET_HEADROOM, PACKET_HEADROOM)
+        for batch in row_batches(rows, batch_size, columns):
+            cur.executemany(sql, batch)
+            connect.commit()
+            report.batch(len(batch))
+    except Exception:
+        if connect.open:
+            connect.rollback()
+        report.finish(success=False)
+        raise
+    finally:
+        cur.close()
+    return report.finish()
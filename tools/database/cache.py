@@ -0,0 +1,381 @@
+# coding: utf8
+"""
+@ File: cache.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import hmac
+import time
+import pickle
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, Union
+
+from modules.journals import JournalModulesClass
+
+from tools.public import ParamsError
+
+from .statement import CompiledStatement
+
+# Reads whose result depends on more than the table contents are never cached.
+UNCACHEABLE_MARKERS = (
+    "for update",
+    "lock in share mode",
+    "for share",
+    "now(",
+    "sysdate(",
+    "curdate(",
+    "curtime(",
+    "current_timestamp",
+    "current_date",
+    "current_time",
+    "rand(",
+    "uuid(",
+    "last_insert_id(",
+    "found_rows(",
+    "connection_id(",
+    "@",
+)
+
+
+def cacheable(statement: CompiledStatement) -> bool:
+    """
+    Whether the result of a statement can be cached
+    :param statement: Compiled statement: CompiledStatement
+    :return: True or False: Boolean
+    """
+    if not statement.readonly or not statement.fingerprint.startswith("select"):
+        return False
+    return not any(marker in statement.fingerprint for marker in UNCACHEABLE_MARKERS)
+
+
+def table_tag(table: str) -> str:
+    """
+    Invalidation tag of a table, the database prefix is dropped so db.t and t share a tag
+    :param table: (database.)table name: String
+    :return: Tag: String
+    """
+    return table.rsplit(".", 1)[-1].lower()
+
+
+def _version_seed() -> int:
+    """
+    Starting version of a shared tag key, microseconds since the epoch: a key that was evicted
+    (or never written) restarts above every version handed out before it, so entries built on
+    an old version can never match again
+    :return: Version: Integer
+    """
+    return time.time_ns() // 1000
+
+
+class QueryResultCache:
+    """
+    Read-through query result cache with an in-process LRU tier and an optional shared
+    Redis tier. Entries carry a TTL and the versions of the tables they read; a write
+    bumps the table versions, which turns every entry built on the old versions stale.
+    Local entries only see local writes, so keep local_ttl short when several processes
+    write to the same tables. Shared entries are pickled and signed with HMAC-SHA256 under
+    the configured secret, a payload failing the check is ignored rather than unpickled.
+    """
+
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        ttl: Union[int, float] = 60,
+        local_size: int = 1024,
+        local_ttl: Union[int, float] = 5,
+        shared: bool = False,
+        prefix: str = "austin:qc",
+        secret: Union[str, None] = None,
+    ):
+        if shared and not secret:
+            raise ParamsError("The shared query result cache needs a secret to sign its entries")
+        self.enabled = enabled
+        self.__ttl = ttl
+        self.__local_size = local_size
+        self.__local_ttl = local_ttl
+        self.__shared = shared
+        self.__prefix = prefix
+        self.__secret = secret.encode("utf8") if secret else None
+        self.__journal = JournalModulesClass()
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict = OrderedDict()
+        self.__versions: dict = {}
+        # Tags whose shared version could not be bumped, the shared tier is bypassed until it is.
+        self.__unconfirmed: set = set()
+        self.__confirm_after = 0.0
+        self.__redis = None
+        self.__hits = 0
+        self.__shared_hits = 0
+        self.__misses = 0
+        self.__invalidations = 0
+        self.__lost_invalidations = 0
+
+    @classmethod
+    def instance(cls, cache_config: Union[dict, None] = None):
+        """
+        Process-wide query result cache, created on first use
+        :param cache_config: datasource.mysql.dbrouter.cache configuration: Dict
+        :return: Query result cache: QueryResultCache
+        """
+        if cls.__instance is None:
+            with cls.__instance_lock:
+                if cls.__instance is None:
+                    cls.__instance = cls(**(cache_config or {}))
+        return cls.__instance
+
+    @classmethod
+    def current(cls):
+        """
+        Process-wide query result cache if it was created, without creating it
+        :return: Query result cache or None: QueryResultCache
+        """
+        return cls.__instance
+
+    @property
+    def __redis_tool(self):
+        if self.__redis is None:
+            from tools.middleware import RedisStandaloneToolsClass
+
+            self.__redis = RedisStandaloneToolsClass()
+        return self.__redis
+
+    @property
+    def shared(self) -> bool:
+        """
+        Whether the shared Redis tier is on, invalidate() then does a blocking round trip
+        :return: True or False: Boolean
+        """
+        return self.__shared
+
+    def key(self, statement: CompiledStatement, args=None) -> str:
+        """
+        Cache key of a statement and its arguments
+        :param statement: Compiled statement: CompiledStatement
+        :param args: Placeholder arguments: Tuple | Dict
+        :return: Cache key: String
+        """
+        if isinstance(args, dict):
+            args = tuple(sorted(args.items()))
+        digest = hashlib.sha1(repr((statement.sql, args)).encode("utf8")).hexdigest()
+        return "{}:{}".format(self.__prefix, digest)
+
+    def __tag_key(self, tag: str) -> str:
+        return "{}:tag:{}".format(self.__prefix, tag)
+
+    def __local_versions(self, tags: Iterable[str]) -> tuple:
+        return tuple(self.__versions.get(tag, 0) for tag in tags)
+
+    def __shared_versions(self, tags: tuple) -> Union[tuple, None]:
+        """
+        Shared versions of the tags in one round trip, missing tag keys are seeded first
+        :param tags: Tags: Tuple
+        :return: Versions, None when Redis cannot be read: Tuple
+        """
+        if not tags:
+            return ()
+        keys = [self.__tag_key(tag) for tag in tags]
+        values = self.__redis_tool.redis_mget(keys)
+        if values is None:
+            return None
+        if None in values:
+            seed = _version_seed()
+            try:
+                with self.__redis_tool.pipeline() as pipe:
+                    for key, value in zip(keys, values):
+                        if value is None:
+                            pipe.set(key, seed, nx=True)
+                    pipe.mget(keys)
+                    values = pipe.execute()[-1]
+            except Exception as error:
+                self.__journal.exception(error)
+                return None
+        return tuple(int(value) for value in values)
+
+    def __bump_shared(self, tags: Iterable[str]) -> bool:
+        """
+        Bump the shared versions of the tags
+        :param tags: Tags: Iterable
+        :return: True once Redis confirmed every bump: Boolean
+        """
+        seed = _version_seed()
+        try:
+            with self.__redis_tool.pipeline() as pipe:
+                for tag in tags:
+                    pipe.set(self.__tag_key(tag), seed, nx=True)
+                    pipe.incr(self.__tag_key(tag))
+                pipe.execute()
+            return True
+        except Exception as error:
+            self.__journal.exception(error)
+            return False
+
+    def __shared_confirmed(self) -> bool:
+        """
+        Whether every local write reached the shared versions, replaying the lost bumps at
+        most once a second; until then the shared tier is neither read nor written
+        :return: True or False: Boolean
+        """
+        if not self.__unconfirmed:
+            return True
+        now = time.monotonic()
+        with self.__lock:
+            if now < self.__confirm_after or not self.__unconfirmed:
+                return not self.__unconfirmed
+            self.__confirm_after = now + 1
+            tags = set(self.__unconfirmed)
+        if not self.__bump_shared(tags):
+            return False
+        with self.__lock:
+            self.__unconfirmed -= tags
+            return not self.__unconfirmed
+
+    def __sign(self, key: str, payload: bytes) -> str:
+        return hmac.new(self.__secret, key.encode("utf8") + b"\0" + payload, hashlib.sha256).hexdigest()
+
+    def __encode(self, key: str, shared_versions: tuple, value) -> str:
+        payload = base64.b64encode(pickle.dumps((shared_versions, value), pickle.HIGHEST_PROTOCOL))
+        return "{}:{}".format(self.__sign(key, payload), payload.decode("ascii"))
+
+    def __decode(self, key: str, data: str):
+        """
+        Versions and value of a shared entry, unpickled only when its signature matches
+        :param key: Cache key, part of the signed message so entries cannot be swapped: String
+        :param data: Stored entry: String
+        :return: Versions and value, None for a forged or malformed entry: Tuple
+        """
+        try:
+            signature, _, payload = data.partition(":")
+            payload = payload.encode("ascii")
+            signed = hmac.compare_digest(signature.encode("ascii"), self.__sign(key, payload).encode("ascii"))
+        except (TypeError, ValueError):
+            signed = False
+        if not signed:
+            self.__journal.warning("MySQL Query Cache：unsigned or forged shared entry ignored：{}", key)
+            return None
+        return pickle.loads(base64.b64decode(payload))
+
+    def get(self, key: str, tables: Iterable[str]):
+        """
+        Cached result and the table versions seen by this lookup. On a miss, pass the
+        versions to set() so a write racing with the database read leaves the entry stale.
+        :param key: Cache key: String
+        :param tables: Tables read by the statement: Iterable
+        :return: Cached result or None, table versions: Tuple
+        """
+        tags = tuple(sorted({table_tag(table) for table in tables}))
+        now = time.monotonic()
+        with self.__lock:
+            local_versions = self.__local_versions(tags)
+            entry = self.__entries.get(key)
+            if entry is not None:
+                expires, versions, value = entry
+                if expires > now and versions == local_versions:
+                    self.__entries.move_to_end(key)
+                    self.__hits += 1
+                    return value, (tags, local_versions, None)
+                del self.__entries[key]
+        shared_versions = None
+        if self.__shared and self.__shared_confirmed():
+            shared_versions = self.__shared_versions(tags)
+            data = self.__redis_tool.redis_get(key, near=False) if shared_versions is not None else None
+            entry = self.__decode(key, data) if data else None
+            if entry is not None:
+                versions, value = entry
+                if versions == shared_versions:
+                    self.__store_local(key, local_versions, value, now)
+                    with self.__lock:
+                        self.__shared_hits += 1
+                    return value, (tags, local_versions, shared_versions)
+        with self.__lock:
+            self.__misses += 1
+        return None, (tags, local_versions, shared_versions)
+
+    def __store_local(self, key: str, local_versions: tuple, value, now: float, ttl=None):
+        # Without the shared tier the local tier is the only one, it keeps entries for the full ttl.
+        expires = now + (self.__local_ttl if self.__shared else ttl or self.__ttl)
+        with self.__lock:
+            self.__entries[key] = (expires, local_versions, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__local_size:
+                self.__entries.popitem(last=False)
+
+    def set(self, key: str, versions: tuple, value, ttl: Union[int, float, None] = None):
+        """
+        Store a result in both tiers
+        :param key: Cache key: String
+        :param versions: Table versions returned by the get() that missed: Tuple
+        :param value: Query result: Any
+        :param ttl: Shared tier TTL in seconds, defaults to the configured ttl: Integer | Float
+        :return: None
+        """
+        tags, local_versions, shared_versions = versions
+        now = time.monotonic()
+        self.__store_local(key, local_versions, value, now, ttl)
+        if self.__shared and shared_versions is not None and not self.__unconfirmed:
+            self.__redis_tool.redis_set(
+                key, self.__encode(key, shared_versions, value), ex=max(int(ttl or self.__ttl), 1)
+            )
+
+    def invalidate(self, tables: Iterable[str]):
+        """
+        Invalidate every cached result that read one of the tables. When the shared versions
+        cannot be bumped the local tier is dropped and the shared tier bypassed in this
+        process until a replay succeeds; other processes only see the write once it does.
+        :param tables: Written tables: Iterable
+        :return: None
+        """
+        tags = {table_tag(table) for table in tables}
+        if not tags:
+            return
+        with self.__lock:
+            for tag in tags:
+                self.__versions[tag] = self.__versions.get(tag, 0) + 1
+            self.__invalidations += 1
+        if self.__shared and not self.__bump_shared(tags):
+            with self.__lock:
+                self.__entries.clear()
+                self.__unconfirmed.update(tags)
+                self.__lost_invalidations += 1
+            self.__journal.warning(
+                "MySQL Query Cache：shared invalidation of {} failed, shared tier bypassed until it is replayed",
+                ", ".join(sorted(tags)),
+            )
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self.__entries),
+                "hits": self.__hits,
+                "shared_hits": self.__shared_hits,
+                "misses": self.__misses,
+                "invalidations": self.__invalidations,
+                "lost_invalidations": self.__lost_invalidations,
+                "unconfirmed": len(self.__unconfirmed),
+            }
@@ -0,0 +1,242 @@
+# coding: utf8
+"""
+@ File: columnar.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import math
+from array import array
+from typing import Union
+
+from pymysql.constants import FIELD_TYPE
+
+# Rows decoded per batch before they are folded into the column arrays.
+COLUMNAR_BATCH_SIZE = 10000
+INTEGER_TYPES = frozenset(
+    (FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.INT24, FIELD_TYPE.LONGLONG, FIELD_TYPE.YEAR)
+)
+FLOAT_TYPES = frozenset((FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE, FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL))
+DATETIME_TYPES = frozenset((FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP))
+DATE_TYPES = frozenset((FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE))
+
+
+def column_kind(type_code: int) -> str:
+    """
+    Storage of a MySQL column type
+    :param type_code: pymysql FIELD_TYPE of the cursor description: Integer
+    :return: int, float, datetime, date or object: String
+    """
+    if type_code in INTEGER_TYPES:
+        return "int"
+    if type_code in FLOAT_TYPES:
+        return "float"
+    if type_code in DATETIME_TYPES:
+        return "datetime"
+    if type_code in DATE_TYPES:
+        return "date"
+    return "object"
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class ColumnBuilder:
+    """
+    One output column, appended batch by batch. An integer column is widened on the first
+    batch that does not fit: to unsigned 64-bit for BIGINT UNSIGNED values past 2**63, to
+    float with NaN for NULLs, to plain values for anything else.
+    """
+
+    __slots__ = ("name", "kind", "numpy", "chunks")
+
+    def __init__(self, name: str, kind: str, numpy=None):
+        self.name = name
+        self.kind = kind
+        self.numpy = numpy
+        self.chunks = []
+
+    def __widen(self, kind: str):
+        numpy = self.numpy
+        if kind == "object":
+            self.chunks = [chunk if isinstance(chunk, tuple) else chunk.tolist() for chunk in self.chunks]
+        elif numpy is not None:
+            dtype = numpy.uint64 if kind == "uint" else numpy.float64
+            self.chunks = [chunk.astype(dtype) for chunk in self.chunks]
+        else:
+            self.chunks = [array("Q" if kind == "uint" else "d", chunk) for chunk in self.chunks]
+        self.kind = kind
+
+    @staticmethod
+    def __integer_fallback(values: tuple) -> str:
+        """
+        Storage of an integer batch that overflowed its current type
+        :param values: Column values of the batch: Tuple
+        :return: uint, float or object: String
+        """
+        if any(value is None for value in values):
+            return "float"
+        return "uint" if all(value >= 0 for value in values) else "object"
+
+    def __append_integers(self, values: tuple):
+        numpy = self.numpy
+        while self.kind in ("int", "uint"):
+            try:
+                if numpy is not None:
+                    self.chunks.append(numpy.array(values, dtype=numpy.int64 if self.kind == "int" else numpy.uint64))
+                else:
+                    self.chunks.append(array("q" if self.kind == "int" else "Q", values))
+                return
+            except TypeError:
+                # NULLs in an integer column: the column is widened to float64 with NaN.
+                self.__widen("float")
+            except OverflowError:
+                kind = self.__integer_fallback(values)
+                self.__widen("object" if kind == "uint" and self.kind == "uint" else kind)
+        self.append(values)
+
+    def append(self, values: tuple):
+        numpy = self.numpy
+        kind = self.kind
+        if kind == "object":
+            self.chunks.append(values)
+        elif numpy is None and kind in ("datetime", "date"):
+            # Zero dates ('0000-00-00') come back from pymysql as strings, they become None.
+            self.chunks.append(tuple(None if isinstance(value, str) else value for value in values))
+        elif kind in ("int", "uint"):
+            self.__append_integers(values)
+        elif numpy is not None:
+            if kind == "float":
+                self.chunks.append(numpy.array(values, dtype=numpy.float64))
+            else:
+                unit = "datetime64[us]" if kind == "datetime" else "datetime64[D]"
+                try:
+                    self.chunks.append(numpy.array(values, dtype=unit))
+                except ValueError:
+                    # Zero dates ('0000-00-00') come back from pymysql as strings, they become NaT.
+                    self.chunks.append(
+                        numpy.array([None if isinstance(value, str) else value for value in values], dtype=unit)
+                    )
+        else:
+            self.chunks.append(array("d", [math.nan if value is None else value for value in values]))
+
+    def build(self):
+        numpy = self.numpy
+        if self.kind == "object" or numpy is None and self.kind in ("datetime", "date"):
+            column = []
+            for chunk in self.chunks:
+                column.extend(chunk)
+            return column
+        if numpy is not None:
+            if not self.chunks:
+                dtypes = {
+                    "int": numpy.int64,
+                    "uint": numpy.uint64,
+                    "float": numpy.float64,
+                    "datetime": "datetime64[us]",
+                    "date": "datetime64[D]",
+                }
+                return numpy.empty(0, dtype=dtypes[self.kind])
+            return self.chunks[0] if len(self.chunks) == 1 else numpy.concatenate(self.chunks)
+        column = array({"int": "q", "uint": "Q"}.get(self.kind, "d"))
+        for chunk in self.chunks:
+            column.extend(chunk)
+        return column
+
+
+class ColumnarResult:
+    """
+    Query result stored per column: NumPy arrays (int64, uint64 past 2**63, float64 with
+    NaN for NULL, datetime64 with NaT for zero dates) for numeric and temporal columns, lists
+    for the others. Without NumPy, numeric columns are array.array and temporal columns lists
+    with None for zero dates.
+    """
+
+    def __init__(self, columns: dict, kinds: dict, rows: int):
+        self.columns = columns
+        self.kinds = kinds
+        self.rows = rows
+
+    @property
+    def names(self) -> list:
+        return list(self.columns)
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def items(self):
+        return self.columns.items()
+
+    def __repr__(self):
+        return "ColumnarResult({} rows: {})".format(
+            self.rows, ", ".join("{} {}".format(name, kind) for name, kind in self.kinds.items())
+        )
+
+
+def fetch_columnar(
+    cursor,
+    batch_size: int = COLUMNAR_BATCH_SIZE,
+    use_numpy: Union[bool, None] = None,
+) -> ColumnarResult:
+    """
+    Read an executed cursor into columns, batch by batch: each batch is transposed in one
+    zip() and folded into typed arrays, so at most one batch of row tuples is alive at a time
+    :param cursor: Executed cursor, unbuffered (SSCursor) for flat memory: Cursor
+    :param batch_size: Rows per batch: Integer
+    :param use_numpy: NumPy arrays, None uses NumPy when installed: Boolean
+    :return: Columnar result: ColumnarResult
+    """
+    numpy = _numpy() if use_numpy is not False else None
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is required for use_numpy=True")
+    description = cursor.description or ()
+    builders = []
+    seen = {}
+    for item in description:
+        name = item[0]
+        # Duplicate labels (joins without aliases) get a numeric suffix instead of shadowing.
+        if name in seen:
+            seen[name] += 1
+            name = "{}_{}".format(name, seen[name])
+        else:
+            seen[name] = 0
+        builders.append(ColumnBuilder(name, column_kind(item[1]), numpy))
+    rows = 0
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        rows += len(batch)
+        for builder, values in zip(builders, zip(*batch)):
+            builder.append(values)
+        del batch
+    columns = {builder.name: builder.build() for builder in builders}
+    return ColumnarResult(columns, {builder.name: builder.kind for builder in builders}, rows)
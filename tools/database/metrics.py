@@ -0,0 +1,144 @@
+# coding: utf8
+"""
+@ File: metrics.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import threading
+
+from modules.metrics.metrics import MetricSnapshot
+from modules.metrics.metrics import MetricsRegistry
+
+from .cache import QueryResultCache
+from .pool import MySQLConnectionPool
+from .profiling import QueryEvent
+from .profiling import QueryProfiler
+from .router import MySQLNodeRouter
+
+
+class MySQLMetrics:
+    """
+    Feeds the metrics registry from the MySQL tool classes: query counts and latencies through
+    a profiler after-hook, pool, router and result cache statistics read at scrape time
+    """
+
+    __installed = False
+    __lock = threading.Lock()
+    __registry = MetricsRegistry.instance()
+    __children: dict = {}
+
+    @classmethod
+    def install(cls, profiler: QueryProfiler):
+        """
+        Register the hook and the collector once, only when metrics are enabled
+        :param profiler: Process-wide query profiler: QueryProfiler
+        :return: None
+        """
+        if cls.__installed or not cls.__registry.enabled:
+            return
+        with cls.__lock:
+            if cls.__installed:
+                return
+            profiler.add_hook(after=cls.__observe)
+            cls.__registry.register_collector(cls.__collect)
+            cls.__installed = True
+
+    @classmethod
+    def __observe(cls, event: QueryEvent):
+        registry = cls.__registry
+        if not registry.enabled:
+            return
+        status = "ok" if event.error is None else "error"
+        key = (event.operation, event.node, status)
+        children = cls.__children.get(key)
+        if children is None:
+            children = cls.__children[key] = (
+                registry.counter(
+                    "mysql_queries_total", "MySQL statements executed", ("operation", "node", "status")
+                ).labels(*key),
+                registry.histogram(
+                    "mysql_query_duration_seconds",
+                    "MySQL statement latency, execute and fetch",
+                    ("operation", "node"),
+                ).labels(event.operation, event.node),
+                registry.histogram(
+                    "mysql_connect_duration_seconds", "Time to borrow a MySQL connection", ("node",)
+                ).labels(event.node),
+            )
+        queries, duration, connect = children
+        queries.inc()
+        duration.observe((event.execute_ns + event.fetch_ns) / 1e9)
+        connect.observe(event.connect_ns / 1e9)
+
+    @staticmethod
+    def __collect() -> list:
+        pool_gauges = {
+            "size": [],
+            "in_use": [],
+            "idle": [],
+            "max_size": [],
+        }
+        waits, timeouts = [], []
+        for name, pool in MySQLConnectionPool.instances().items():
+            stats = pool.stats
+            for field, samples in pool_gauges.items():
+                samples.append(("", {"pool": name}, stats[field]))
+            waits.append(("", {"pool": name}, stats["waits"]))
+            timeouts.append(("", {"pool": name}, stats["timeouts"]))
+        snapshots = [
+            MetricSnapshot(
+                "mysql_pool_connections_{}".format(field),
+                "gauge",
+                "MySQL pool connections ({})".format(field.replace("_", " ")),
+                samples,
+            )
+            for field, samples in pool_gauges.items()
+        ]
+        snapshots.append(MetricSnapshot("mysql_pool_waits_total", "counter", "Borrows that waited for a connection", waits))
+        snapshots.append(MetricSnapshot("mysql_pool_timeouts_total", "counter", "Borrows that timed out", timeouts))
+
+        outstanding, ejected, lag = [], [], []
+        for role, router in MySQLNodeRouter.instances().items():
+            for node in router.stats:
+                labels = {"role": role, "node": node["name"]}
+                outstanding.append(("", labels, node["outstanding"]))
+                ejected.append(("", labels, node["ejected"]))
+                if router.lag_monitored:
+                    lag.append(("", labels, float("nan") if node["lag"] is None else node["lag"]))
+        snapshots.append(MetricSnapshot("mysql_node_outstanding", "gauge", "Requests in flight per node", outstanding))
+        snapshots.append(MetricSnapshot("mysql_node_ejected", "gauge", "Whether the node is ejected", ejected))
+        if lag:
+            snapshots.append(MetricSnapshot("mysql_replica_lag_seconds", "gauge", "Last measured replication lag", lag))
+
+        cache = QueryResultCache.current()
+        if cache is not None:
+            stats = cache.stats
+            snapshots.append(
+                MetricSnapshot(
+                    "mysql_cache_lookups_total",
+                    "counter",
+                    "Query result cache lookups by outcome",
+                    [
+                        ("", {"result": "hit"}, stats["hits"]),
+                        ("", {"result": "shared_hit"}, stats["shared_hits"]),
+                        ("", {"result": "miss"}, stats["misses"]),
+                    ],
+                )
+            )
+            snapshots.append(MetricSnapshot("mysql_cache_entries", "gauge", "Query result cache entries", [("", {}, stats["size"])]))
+        return snapshots
@@ -11,22 +11,189 @@ from __future__ import annotations
 
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-import random
+import time
+import socket
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import contextmanager
+from contextlib import nullcontext
+from typing import Callable, Iterable, Union
+
 import pymysql
+from pymysql.cursors import DictCursor
+from pymysql.cursors import SSCursor
+from pymysql.cursors import SSDictCursor
 
 from modules.inheritance import BaseClass
 from modules.journals import JournalModulesClass
 
+from tools.public import CircuitOpenError
+from tools.public import DeadlineExceededError
 from tools.public import MySQLSourceError
 from tools.public import ParamsError
+from tools.public import PoolTimeoutError
+from tools.public import ResiliencePolicy
+from tools.public import deadline
+from tools.public.resilience import bounded_timeout
+from tools.public.resilience import check_deadline
+from tools.public.resilience import remaining
+
+from .bulk import BulkInsertReport
+from .cache import QueryResultCache
+from .cache import cacheable
+from .columnar import COLUMNAR_BATCH_SIZE
+from .columnar import ColumnarResult
+from .columnar import fetch_columnar
+from .bulk import execute_bulk_insert
+from .metrics import MySQLMetrics
+from .pool import MySQLConnectionPool
+from .profiling import QueryProfiler
+from .replication import current_session
+from .replication import enter_session
+from .replication import exit_session
+from .replication import read_lag_bound
+from .replication import record_write
+from .router import MySQLNode
+from .router import MySQLNodeRouter
+from .scan import SCAN_CHUNK_SIZE
+from .scan import keyset_scan
+from .scan import parallel_keyset_scan
+from .statement import CompiledStatement
+from .statement import compile_statement
+from .tools import SelectQuery
+from .transaction import MySQLTransaction
+
+# Threads running the partitions of parallel_query, shared by every router tool.
+PARALLEL_QUERY_WORKERS = 16
+MERGE_MODES = ("ordered", "concat", "stream")
+# Extra wait past a partition timeout before giving up on the client side, MySQL aborts it first.
+PARTITION_TIMEOUT_GRACE = 1.0
+# Errors a retry can clear: too many connections, lock wait timeout, deadlock,
+# can't connect, server gone away, lost connection during query, lost connection.
+TRANSIENT_ERROR_CODES = frozenset((1040, 1205, 1213, 2003, 2006, 2013, 2055))
+
+
+def _transient_error(error: Exception) -> bool:
+    """
+    Whether a MySQL failure is worth a retry
+    :param error: Raised exception: Exception
+    :return: True or False: Boolean
+    """
+    if isinstance(error, pymysql.err.InterfaceError):
+        # Connection already closed by an earlier failure.
+        return True
+    if isinstance(error, pymysql.err.OperationalError):
+        return bool(error.args) and error.args[0] in TRANSIENT_ERROR_CODES
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def _unavailable(error: Exception) -> bool:
+    """
+    Whether a failure means the database could not serve the call (raised to the caller)
+    rather than the statement failing (reported by the return value)
+    :param error: Raised exception: Exception
+    :return: True or False: Boolean
+    """
+    return _transient_error(error) or isinstance(
+        error, (CircuitOpenError, DeadlineExceededError, PoolTimeoutError, MySQLSourceError)
+    )
+
+
+def _retryable(error: Exception) -> bool:
+    """
+    Whether a routed call is worth another round: a transient failure, or every node of the group failed
+    :param error: Raised exception: Exception
+    :return: True or False: Boolean
+    """
+    return isinstance(error, MySQLSourceError) or _transient_error(error)
+
+
+def _partition_statement(partition) -> tuple:
+    """
+    Compiled statement and arguments of one parallel_query partition
+    :param partition: Query, (query, args) pair or SelectQuery: String | Tuple | SelectQuery
+    :return: Compiled statement and arguments: Tuple
+    """
+    if isinstance(partition, SelectQuery):
+        return partition.compile()
+    if isinstance(partition, (tuple, list)):
+        query, args = partition
+    else:
+        query, args = partition, None
+    return compile_statement(query), args
+
+
+def _set_time_limit(cursor, statement: CompiledStatement) -> bool:
+    """
+    Cap a SELECT at the time left before the active deadline through the session
+    max_execution_time, so the server aborts it. The statement text stays the same and
+    the statement cache keeps one entry per template.
+    :param cursor: Cursor of the connection running the statement: Cursor
+    :param statement: Compiled statement: CompiledStatement
+    :return: Whether the limit was set and must be reset before the connection is reused: Boolean
+    """
+    left = remaining()
+    if left is None or not statement.fingerprint.startswith("select"):
+        return False
+    cursor.execute("SET SESSION max_execution_time = {:d}".format(max(int(left * 1000), 1)))
+    return True
+
+
+def _reset_time_limit(cursor) -> bool:
+    """
+    Put max_execution_time back to the server default
+    :param cursor: Cursor of the connection: Cursor
+    :return: False when the connection could not be reset and must be discarded: Boolean
+    """
+    try:
+        cursor.execute("SET SESSION max_execution_time = DEFAULT")
+        return True
+    except Exception:
+        return False
+
+
+def _interrupt(connect):
+    """
+    Abort a statement blocked on the socket from another thread: the worker's read fails
+    with a lost connection and the connection is discarded
+    :param connect: Connection object: MySQL Connect Object
+    :return: None
+    """
+    sock = getattr(connect, "_sock", None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+def _fetch_stream(cursor, chunk_size: Union[int, None] = None):
+    """
+    Read an unbuffered cursor row by row or in fixed-size chunks
+    :param cursor: Server-side cursor: SSCursor | SSDictCursor
+    :param chunk_size: Yield lists of up to chunk_size rows instead of single rows: Integer
+    :return: Rows or chunks of rows: Generator
+    """
+    if chunk_size:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    else:
+        yield from cursor.fetchall_unbuffered()
 
 
 class MySQLStandaloneToolsClass(BaseClass):
@@ -34,20 +201,26 @@ class MySQLStandaloneToolsClass(BaseClass):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.__pool = None
+        self.__profiler = None
+        self.__resilience = None
+        self.__breaker = None
 
     def __mysql_config(self) -> dict:
         try:
             config = self.config.get("datasource").get("mysql").get("standalone")
         except Exception as error:
             self.exception(error)
-            sys.exit(1)
+            raise MySQLSourceError("MySQL Source Configuration Error.") from error
         return config
 
-    def __connect_tool(self):
+    def __connection_pool(self) -> MySQLConnectionPool:
         """
-        MySQL Connections
-        :return: Connection object: MySQL Connect Object
+        MySQL Connection Pool
+        :return: Connection pool: MySQLConnectionPool
         """
+        if self.__pool is not None and not self.__pool.closed:
+            return self.__pool
         try:
             mysql_config = self.__mysql_config()
             if mysql_config is None:
@@ -62,12 +235,8 @@ class MySQLStandaloneToolsClass(BaseClass):
                 __charset = "utf8mb4"
             if not all((__host, __port, __user, __password, __database)):
                 raise MySQLSourceError("MySQL Source Configuration Error.")
-            self.debug("MySQL Standalone IP：{}".format(__host))
-            self.debug("MySQL Standalone Port：{}".format(__port))
-            self.debug("MySQL Standalone User：{}".format(__user))
-            self.debug("MySQL Standalone Database：{}".format(__database))
-            self.debug("MySQL Standalone Charset：{}".format(__charset))
-            connect = pymysql.connect(
+            self.__pool = MySQLConnectionPool.instance(
+                pool_config=mysql_config.get("pool"),
                 host=__host,
                 port=__port,
                 user=__user,
@@ -76,101 +245,459 @@ class MySQLStandaloneToolsClass(BaseClass):
                 charset=__charset,
                 connect_timeout=5,
             )
-            self.info("MySQL Connection Successful.")
-            return connect
+            self.__breaker = self.__resilience_policy.breaker("mysql://{}:{}".format(__host, __port))
+            return self.__pool
         except Exception as error:
             self.exception(error)
             self.error(error)
-            sys.exit(1)
+            raise
 
-    def query(self, query: str):
+    @property
+    def __resilience_policy(self) -> ResiliencePolicy:
+        """
+        Process-wide retry and circuit breaker policy, configured by resilience
+        :return: Policy: ResiliencePolicy
+        """
+        if self.__resilience is None:
+            self.__resilience = ResiliencePolicy.instance(self.config.get("resilience"))
+        return self.__resilience
+
+    def __acquire(self):
+        pool = self.__connection_pool()
+        return pool.acquire(bounded_timeout(pool.wait_timeout))
+
+    def __connect_tool(self):
+        """
+        MySQL Connections, borrowed from the process-wide connection pool. Transient connection
+        failures are retried with backoff, an open circuit or an exhausted deadline fails fast.
+        :return: Connection object: MySQL Connect Object
+        """
+        self.__connection_pool()
+        try:
+            connect = self.__resilience_policy.call(
+                self.__acquire, breaker=self.__breaker, transient=_transient_error
+            )
+            self.debug("MySQL Connection Successful.")
+            return connect
+        except Exception as error:
+            self.error("MySQL Connection Failure")
+            self.exception(error)
+            raise
+
+    def __release_tool(self, connect, discard: bool = False):
+        """
+        Return a connection to the process-wide connection pool
+        :param connect: Connection object: MySQL Connect Object
+        :param discard: Close the connection instead of reusing it: Boolean
+        :return: None
+        """
+        self.__connection_pool().release(connect, discard=discard)
+
+    @property
+    def pool_stats(self) -> dict:
+        """
+        MySQL Connection Pool Statistics
+        :return: Statistics (size, in_use, idle, waits, wait_time ...): Dict
+        """
+        return self.__connection_pool().stats
+
+    @property
+    def __query_profiler(self) -> QueryProfiler:
+        """
+        Process-wide query profiler, configured by datasource.mysql.profiling
+        :return: Query profiler: QueryProfiler
+        """
+        if self.__profiler is None:
+            self.__profiler = QueryProfiler.instance(
+                self.config.get("datasource").get("mysql").get("profiling")
+            )
+            MySQLMetrics.install(self.__profiler)
+        return self.__profiler
+
+    @property
+    def profile_stats(self) -> dict:
+        """
+        Query profiling statistics
+        :return: Phase histograms and the hottest statements: Dict
+        """
+        profiler = self.__query_profiler
+        return dict(profiler.stats, top=profiler.statements())
+
+    def query(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         MySQL Data Queries
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: results: Iteratable Object
         """
         self.debug("MySQL Data Queries")
-        conn = self.__connect_tool()
-        cur = conn.cursor()
+        return self.__select(query, args)[0]
+
+    def __select(
+        self,
+        query: Union[str, CompiledStatement],
+        args: Union[tuple, list, dict, None] = None,
+        cursor_class=None,
+        operation: str = "query",
+    ) -> tuple:
+        """
+        Private methods run a query on a buffered cursor
+        :param query: SQL query statements: String | CompiledStatement
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :param cursor_class: pymysql cursor class, None for tuples: Cursor
+        :param operation: Operation name reported to the profiler: String
+        :return: Rows and the cursor description, rows are None on failure: Tuple
+        """
+        self.__connection_pool()
         try:
-            cur.execute(query=query)
+            # Reads are idempotent, the whole attempt (connection included) is retried.
+            return self.__resilience_policy.call(
+                self.__select_once,
+                query,
+                args,
+                cursor_class,
+                operation,
+                breaker=self.__breaker,
+                transient=_transient_error,
+            )
+        except Exception as error:
+            self.error("MySQL Query Failure：{}".format(query))
+            self.exception(error)
+            if _unavailable(error):
+                raise
+            return None, None
+
+    def __select_once(
+        self,
+        query: Union[str, CompiledStatement],
+        args: Union[tuple, list, dict, None],
+        cursor_class,
+        operation: str,
+    ) -> tuple:
+        """
+        One attempt of __select, failures are raised to the resilience policy
+        :return: Rows and the cursor description: Tuple
+        """
+        profiler = self.__query_profiler
+        started = time.perf_counter_ns()
+        conn = self.__acquire()
+        cur = conn.cursor(cursor_class)
+        event, executing, executed = None, time.perf_counter_ns(), None
+        broken = limited = False
+        try:
+            statement = compile_statement(query)
+            limited = _set_time_limit(cur, statement)
+            event = profiler.begin(operation, statement, "standalone", args, executing - started)
+            executing = time.perf_counter_ns()
+            cur.execute(query=statement.sql, args=statement.bind(args))
+            executed = time.perf_counter_ns()
             result = cur.fetchall()
+            description = cur.description
+            profiler.end(event, executed - executing, time.perf_counter_ns() - executed, len(result))
             conn.commit()
+            return result, description
+        except Exception as error:
+            broken = _transient_error(error)
+            if conn.open and not broken:
+                conn.rollback()
+            profiler.end(event, (executed or time.perf_counter_ns()) - executing, error=error)
+            raise
+        finally:
+            if limited and not broken:
+                broken = not _reset_time_limit(cur)
+            cur.close()
+            self.__release_tool(conn, discard=broken)
+
+    def scan(
+        self,
+        table: str,
+        key: str = "id",
+        chunk: int = SCAN_CHUNK_SIZE,
+        where: Union[str, None] = None,
+        args: Union[tuple, list] = (),
+        fields: Union[tuple, list] = (),
+        dict_rows: bool = False,
+        parallel: int = 1,
+    ):
+        """
+        Chunked table scan with keyset pagination (key > last ORDER BY key LIMIT chunk),
+        pages are read lazily and every page costs the same however deep the scan is
+        :param table: Table name, optionally database-qualified: String
+        :param key: Unique, indexed ordering column: String
+        :param chunk: Rows per page: Integer
+        :param where: Extra condition with %s placeholders: String
+        :param args: Values of the where placeholders: Tuple | List
+        :param fields: Selected fields, * when empty: Tuple | List
+        :param dict_rows: Rows as dictionaries: Boolean
+        :param parallel: Read this many integer key ranges concurrently, pages then arrive out of key order: Integer
+        :return: Pages of rows: Generator
+        """
+        self.debug("MySQL Keyset Scan：{} by {}", table, key)
+        cursor_class = DictCursor if dict_rows else None
+
+        def fetch_page(statement: CompiledStatement, page_args: tuple) -> tuple:
+            return self.__select(statement, page_args, cursor_class, "scan")
+
+        if parallel > 1:
+            return parallel_keyset_scan(fetch_page, table, key, chunk, where, args, fields, parallel)
+        return keyset_scan(fetch_page, table, key, chunk, where, args, fields)
+
+    def query_iter(
+        self,
+        query: str,
+        args: Union[tuple, list, dict, None] = None,
+        chunk_size: Union[int, None] = None,
+        dict_rows: bool = False,
+    ):
+        """
+        MySQL Streaming Data Queries through an unbuffered server-side cursor,
+        memory use stays flat regardless of the size of the result set.
+        The connection is held until the generator is exhausted or closed.
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :param chunk_size: Yield lists of up to chunk_size rows instead of single rows: Integer
+        :param dict_rows: Yield rows as dictionaries: Boolean
+        :return: Rows or chunks of rows: Generator
+        """
+        self.debug("MySQL Streaming Data Queries")
+        profiler = self.__query_profiler
+        started = time.perf_counter_ns()
+        conn = self.__connect_tool()
+        cur = conn.cursor(SSDictCursor if dict_rows else SSCursor)
+        exhausted = False
+        event, executing, executed = None, time.perf_counter_ns(), None
+        try:
+            statement = compile_statement(query)
+            event = profiler.begin("query_iter", statement, "standalone", args, executing - started)
+            executing = time.perf_counter_ns()
+            cur.execute(query=statement.sql, args=statement.bind(args))
+            executed = time.perf_counter_ns()
+            yield from _fetch_stream(cur, chunk_size)
+            exhausted = True
+            profiler.end(event, executed - executing, time.perf_counter_ns() - executed, cur.rownumber)
+        except Exception as error:
+            profiler.end(event, (executed or time.perf_counter_ns()) - executing, error=error)
+            self.error("MySQL Streaming Query Failure：{}".format(query))
+            self.exception(error)
+            raise
+        finally:
+            if exhausted:
+                cur.close()
+            # An abandoned unbuffered result would have to be drained first, drop the connection instead.
+            self.__release_tool(conn, discard=not exhausted)
+
+    def query_columnar(
+        self,
+        query: str,
+        args: Union[tuple, list, dict, None] = None,
+        batch_size: int = COLUMNAR_BATCH_SIZE,
+        use_numpy: Union[bool, None] = None,
+    ) -> Union[ColumnarResult, None]:
+        """
+        MySQL Data Queries into per-column arrays for vectorized consumers: NumPy arrays for
+        numeric and temporal columns, lists for the others. Rows are read from an unbuffered
+        cursor in batches and folded into the columns, no full row list is ever built.
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :param batch_size: Rows per batch: Integer
+        :param use_numpy: NumPy arrays, None uses NumPy when installed (array.array otherwise): Boolean
+        :return: Columns by name, None on failure: ColumnarResult
+        """
+        self.debug("MySQL Columnar Data Queries")
+        profiler = self.__query_profiler
+        started = time.perf_counter_ns()
+        conn = self.__connect_tool()
+        cur = conn.cursor(SSCursor)
+        exhausted = False
+        event, executing, executed = None, time.perf_counter_ns(), None
+        try:
+            statement = compile_statement(query)
+            event = profiler.begin("query_columnar", statement, "standalone", args, executing - started)
+            executing = time.perf_counter_ns()
+            cur.execute(query=statement.sql, args=statement.bind(args))
+            executed = time.perf_counter_ns()
+            result = fetch_columnar(cur, batch_size, use_numpy)
+            exhausted = True
+            profiler.end(event, executed - executing, time.perf_counter_ns() - executed, len(result))
         except Exception as error:
             result = None
-            conn.rollback()
-            self.debug("Successful execution of query transaction：{}".format(query))
+            profiler.end(event, (executed or time.perf_counter_ns()) - executing, error=error)
+            self.error("MySQL Columnar Query Failure：{}".format(query))
             self.exception(error)
         finally:
-            cur.close()
-            conn.cursor()
+            if exhausted:
+                cur.close()
+            self.__release_tool(conn, discard=not exhausted)
         return result
 
-    def __operation(self, query: str):
+    def __operation(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Private methods execute SQL statements that do not return query data.
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: Ture or False: Boolean
         """
+        profiler = self.__query_profiler
+        started = time.perf_counter_ns()
         conn = self.__connect_tool()
         cur = conn.cursor()
+        event, executing = None, time.perf_counter_ns()
         try:
-            cur.execute(query=query)
+            statement = compile_statement(query)
+            event = profiler.begin("operation", statement, "standalone", args, executing - started)
+            executing = time.perf_counter_ns()
+            rows = cur.execute(query=statement.sql, args=statement.bind(args))
             conn.commit()
-            self.debug("MySQL Transaction Executed Successfully：{}".format(query))
+            profiler.end(event, time.perf_counter_ns() - executing, rows=rows)
+            self.debug("MySQL Transaction Executed Successfully：{}", query)
             result = True
         except Exception as error:
-            conn.rollback()
+            if conn.open:
+                conn.rollback()
+            profiler.end(event, time.perf_counter_ns() - executing, error=error)
             self.error("MySQL Transaction Execution Failure：{}".format(query))
             self.exception(error)
             result = False
         finally:
             cur.close()
-            conn.close()
+            self.__release_tool(conn)
         return result
 
-    def operation(self, query: str):
+    @contextmanager
+    def transaction(self, isolation_level: Union[str, None] = None, read_only: bool = False):
+        """
+        MySQL Transaction on one pooled connection, committed when the with block
+        exits normally and rolled back when it raises.
+        with db.transaction() as tx: tx.execute(...); tx.savepoint("a"); tx.rollback_to("a")
+        :param isolation_level: READ UNCOMMITTED / READ COMMITTED / REPEATABLE READ / SERIALIZABLE: String
+        :param read_only: Start a read-only transaction: Boolean
+        :return: Transaction: MySQLTransaction
+        """
+        self.debug("MySQL Transaction")
+        conn = self.__connect_tool()
+        tx = None
+        clean = True
+        try:
+            tx = MySQLTransaction(conn, isolation_level=isolation_level, read_only=read_only)
+            tx.begin()
+            yield tx
+            if tx.active:
+                tx.commit()
+            self.debug("MySQL Transaction Committed Successfully")
+        except BaseException as error:
+            # KeyboardInterrupt and GeneratorExit too, an open transaction must never go back to the pool.
+            clean = self.__rollback(tx)
+            self.error("MySQL Transaction Rolled Back")
+            self.exception(error)
+            raise
+        finally:
+            self.__release_tool(conn, discard=not clean or (tx is not None and tx.active))
+
+    def __rollback(self, tx: Union[MySQLTransaction, None]) -> bool:
+        """
+        Roll a failed transaction back without masking the error that ended it
+        :param tx: Transaction, None when it was never created: MySQLTransaction
+        :return: Whether the connection is clean enough to be reused: Boolean
+        """
+        if tx is None:
+            return True
+        try:
+            tx.rollback()
+            return True
+        except BaseException as error:
+            self.error("MySQL Transaction Rollback Failure")
+            self.exception(error)
+            return False
+
+    def operation(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         The executed SQL statement does not return query data.
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: Ture or False: Boolean
         """
         self.debug("MySQL Operations")
-        return self.__operation(query=query)
+        return self.__operation(query=query, args=args)
 
-    def insert(self, query: str):
+    def insert(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Inserting SQL Data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: Ture or False: Boolean
         """
         self.debug("MySQL Data Insert")
-        return self.__operation(query=query)
+        return self.__operation(query=query, args=args)
 
-    def update(self, query: str):
+    def bulk_insert(
+        self,
+        table: str,
+        rows: Iterable,
+        batch_size: int = 1000,
+        on_duplicate: Union[str, list, tuple, dict, None] = None,
+        columns: Union[list, tuple, None] = None,
+    ) -> dict:
+        """
+        Bulk Inserting SQL Data with multi-row VALUES batches, one commit per batch
+        :param table: Table name: String
+        :param rows: Dict or sequence rows: Iterable
+        :param batch_size: Rows per batch and commit: Integer
+        :param on_duplicate: None, "ignore", "update", columns to update or {column: expression}: Any
+        :param columns: Column names, defaults to the keys of the first dict row: List | Tuple
+        :return: Report (rows, batches, seconds, rows_per_sec, success): Dict
+        """
+        self.debug("MySQL Bulk Data Insert")
+        conn = self.__connect_tool()
+        report = BulkInsertReport()
+        try:
+            execute_bulk_insert(conn, table, rows, batch_size, on_duplicate, columns, report)
+            self.debug(
+                "MySQL Bulk Insert Successfully：{} rows in {} batches, {:.0f} rows/sec",
+                report["rows"],
+                report["batches"],
+                report["rows_per_sec"],
+            )
+        except Exception as error:
+            self.error(
+                "MySQL Bulk Insert Failure：{} after {} rows".format(table, report["rows"])
+            )
+            self.exception(error)
+        finally:
+            self.__release_tool(conn)
+        return report
+
+    def update(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Updating SQL Data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: Ture or False: Boolean
         """
         self.debug("MySQL Data Updates")
-        return self.__operation(query=query)
+        return self.__operation(query=query, args=args)
 
-    def delete(self, query: str):
+    def delete(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Delete SQL Data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: Ture or False: Boolean
         """
         self.debug("MySQL Data Deletion")
-        return self.__operation(query=query)
+        return self.__operation(query=query, args=args)
 
 
 class MySQLMasterSlaveDBRouterToolsClass(BaseClass):
     """MySQL Database Read/Write Separation"""
 
+    __executor = None
+    __executor_lock = threading.Lock()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.__cache = None
+        self.__profiler = None
+        self.__resilience = None
 
     @property
     def __mysql_config(self) -> dict:
@@ -178,219 +705,762 @@ class MySQLMasterSlaveDBRouterToolsClass(BaseClass):
             config = self.config.get("datasource").get("mysql").get("dbrouter")
         except Exception as error:
             self.exception(error)
-            sys.exit(1)
+            raise MySQLSourceError("MySQL DBRouter Configuration Error") from error
         return config
 
-    def __mysql_master_config(self) -> dict:
+    def __node_router(self, dbrouter: str) -> MySQLNodeRouter:
         """
-        Getting Master Configuration Information
-        :return: Master Configuration Information: Dict
+        Getting the process-wide node router of the Master or Slave group
+        :param dbrouter: Database routing distinguishes between Master and Slave: String
+        :return: Node router: MySQLNodeRouter
         """
         try:
-            mysql_config_master: list = self.__mysql_config.get("master")
-            return random.choice(mysql_config_master)
+            if dbrouter not in ("master", "slave"):
+                raise ParamsError("Method parameter error")
+            return MySQLNodeRouter.instance(dbrouter, self.__mysql_config)
         except Exception as error:
             self.exception(error)
-            sys.exit(1)
+            raise
+
+    @property
+    def __resilience_policy(self) -> ResiliencePolicy:
+        """
+        Process-wide retry and circuit breaker policy, configured by resilience
+        :return: Policy: ResiliencePolicy
+        """
+        if self.__resilience is None:
+            self.__resilience = ResiliencePolicy.instance(self.config.get("resilience"))
+        return self.__resilience
 
-    def __mysql_slave_config(self) -> dict:
+    def __node_breaker(self, node: MySQLNode):
+        return self.__resilience_policy.breaker("mysql://{}".format(node.address))
+
+    def __connect_tool(self, dbrouter: str, prefer: Union[str, None] = None, read: bool = False):
         """
-        Getting Slave Configuration Information
-        :return: Slave Configuration Information: Dict
+        MySQL Master/Slave Connection, borrowed from the pool of the routed node.
+        Nodes that cannot be reached are ejected and the next node is tried; when every node
+        failed the round is retried with backoff, when every circuit is open it fails fast.
+        :param dbrouter: Database routing distinguishes between Master and Slave: String
+        :param prefer: Node name to use while it is available: String
+        :param read: The connection serves a read, which the Master may take over from lagging replicas: Boolean
+        :return: Routed node and connection object: Tuple
         """
         try:
-            mysql_config_slave: list = self.__mysql_config.get("slave")
-            return random.choice(mysql_config_slave)
+            return self.__resilience_policy.call(
+                self.__connect_round,
+                dbrouter,
+                prefer,
+                read,
+                transient=_retryable,
+            )
         except Exception as error:
+            self.error("MySQL {} DBRouter Connection Failure".format(dbrouter))
             self.exception(error)
-            sys.exit(1)
+            raise
 
-    @property
-    def __connect_master_tool(self):
+    def __connect_round(self, dbrouter: str, prefer: Union[str, None] = None, read: bool = False):
         """
-        MySQL Master Connection
-        :return: Connection object: MySQL Connect Object
+        Try the nodes of a group once each, in routing order
+        :return: Routed node and connection object: Tuple
         """
+        router = self.__node_router(dbrouter)
+        max_lag = None
+        if dbrouter == "slave":
+            # The read-your-writes window only concerns reads, a Slave write keeps to max_lag.
+            max_lag = read_lag_bound(router.max_lag) if read else router.max_lag
+        tried, rejected = set(), set()
+        while True:
+            check_deadline()
+            try:
+                node = router.select(exclude=tried, prefer=prefer, max_lag=max_lag)
+            except MySQLSourceError:
+                if rejected and rejected == tried:
+                    raise CircuitOpenError("Circuit open：MySQL {} nodes".format(router.role))
+                raise
+            if node is None:
+                if not read:
+                    # An explicit Slave statement is never moved to the Master behind the caller's back.
+                    raise MySQLSourceError("No MySQL slave node within {} seconds of lag".format(max_lag))
+                # No replica is known to be fresh enough, the Master serves the read.
+                self.debug("MySQL Replica Lag：{} read routed to the Master", dbrouter)
+                router, max_lag, tried, rejected = self.__node_router("master"), None, set(), set()
+                continue
+            breaker = self.__node_breaker(node)
+            if not breaker.allow():
+                router.release(node)
+                tried.add(node.name)
+                rejected.add(node.name)
+                continue
+            try:
+                connect = node.pool.acquire(bounded_timeout(node.pool.wait_timeout))
+            except Exception as error:
+                # Every exit resolves a half-open trial, or the node would stay failed fast for good.
+                if _transient_error(error):
+                    breaker.failure()
+                else:
+                    # Pool exhausted, access denied ...: nothing learnt about the endpoint's health.
+                    breaker.release_trial()
+                router.failure(node)
+                tried.add(node.name)
+                self.error("MySQL {} DBRouter Connection Failure：{}".format(node.name, node.address))
+                self.exception(error)
+                continue
+            except BaseException:
+                breaker.release_trial()
+                router.release(node)
+                raise
+            breaker.success()
+            self.debug("MySQL Data Source：MySQL {} DBRouter {}", node.name, node.address)
+            return node, connect
+
+    def __release_tool(
+        self,
+        dbrouter: str,
+        node: MySQLNode,
+        connect,
+        started: Union[float, None] = None,
+        discard: bool = False,
+    ):
+        """
+        Return the connection to the node pool and report the node health to the router
+        :param dbrouter: Database routing distinguishes between Master and Slave: String
+        :param node: Routed node: MySQLNode
+        :param connect: Connection object: MySQL Connect Object
+        :param started: perf_counter value taken before execution, None leaves the latency EWMA untouched: Float
+        :param discard: Close the connection instead of reusing it: Boolean
+        :return: None
+        """
+        # Lagging replicas send Slave reads to the Master, the node knows where it came from.
+        router = self.__node_router(node.role)
+        if not connect.open:
+            router.failure(node)
+        elif started is None:
+            router.release(node)
+        else:
+            router.success(node, time.perf_counter() - started)
+        node.pool.release(connect, discard=discard)
+
+    @contextmanager
+    def session(self, sticky_ms: Union[int, float, None] = None):
+        """
+        Read-your-writes session for the running thread or task: for sticky_ms after a write on
+        the Master, reads only go to replicas whose measured lag is below the time since the
+        write (router.max_lag enables the lag probes), the Master otherwise. Nested sessions
+        share the outer one.
+        with db.session(): db.update(...); db.query(...)
+        :param sticky_ms: Window after a write, defaults to dbrouter.router.sticky_ms: Integer | Float
+        :return: Session: ConsistencySession
+        """
+        session = current_session()
+        if session is not None:
+            yield session
+            return
+        if sticky_ms is None:
+            sticky_ms = self.__node_router("slave").sticky_ms
+        session, token = enter_session(sticky_ms)
         try:
-            __master_config = self.__mysql_master_config()
-            __master_host = __master_config.get("host")
-            __master_port = __master_config.get("port")
-            __master_user = __master_config.get("user")
-            __master_password = __master_config.get("password")
-            __master_database = __master_config.get("database")
-            __master_charset = __master_config.get("charset")
-            if not __master_charset:
-                __master_charset = "utf8mb4"
-            if not all(
-                (
-                    __master_host,
-                    __master_port,
-                    __master_user,
-                    __master_password,
-                    __master_database,
-                )
-            ):
-                raise MySQLSourceError("MySQL Master Configuration Error")
-            self.debug("MySQL Data Source：MySQL Master DBRouter")
-            self.debug("MySQL Master DBRouter IP：{}".format(__master_host))
-            self.debug("MySQL Master DBRouter Port：{}".format(__master_port))
-            self.debug("MySQL Master DBRouter Username：{}".format(__master_user))
-            self.debug("MySQL Master DBRouter Database：{}".format(__master_database))
-            self.debug("MySQL Master DBRouter Charset：{}".format(__master_charset))
-            connect = pymysql.connect(
-                host=__master_host,
-                port=__master_port,
-                user=__master_user,
-                password=__master_password,
-                database=__master_database,
-                charset=__master_charset,
+            yield session
+        finally:
+            exit_session(token)
+
+    @property
+    def router_stats(self) -> dict:
+        """
+        MySQL Master/Slave routing and pool statistics
+        :return: Statistics per node: Dict
+        """
+        return {
+            "master": self.__node_router("master").stats,
+            "slave": self.__node_router("slave").stats,
+        }
+
+    @property
+    def __result_cache(self) -> QueryResultCache:
+        """
+        Process-wide query result cache, configured by datasource.mysql.dbrouter.cache
+        :return: Query result cache: QueryResultCache
+        """
+        if self.__cache is None:
+            self.__cache = QueryResultCache.instance(self.__mysql_config.get("cache"))
+        return self.__cache
+
+    @property
+    def cache_stats(self) -> dict:
+        """
+        Query result cache statistics
+        :return: Statistics (hits, shared_hits, misses, invalidations ...): Dict
+        """
+        return self.__result_cache.stats
+
+    @property
+    def __query_profiler(self) -> QueryProfiler:
+        """
+        Process-wide query profiler, configured by datasource.mysql.profiling
+        :return: Query profiler: QueryProfiler
+        """
+        if self.__profiler is None:
+            self.__profiler = QueryProfiler.instance(
+                self.config.get("datasource").get("mysql").get("profiling")
             )
-            return connect
-        except Exception as error:
-            self.exception(error)
-            sys.exit(1)
+            MySQLMetrics.install(self.__profiler)
+        return self.__profiler
 
     @property
-    def __connect_slave_tool(self):
+    def profile_stats(self) -> dict:
         """
-        MySQL Slave Connection
-        :return: Connection object: MySQL Connect Object
+        Query profiling statistics
+        :return: Phase histograms and the hottest statements: Dict
+        """
+        profiler = self.__query_profiler
+        return dict(profiler.stats, top=profiler.statements())
+
+    def query(
+        self,
+        query: str,
+        args: Union[tuple, list, dict, None] = None,
+        cache: Union[bool, None] = None,
+        ttl: Union[int, float, None] = None,
+    ):
+        """
+        MySQL Data Queries, served from the query result cache when it is enabled
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :param cache: Use the result cache, None follows the cache configuration: Boolean
+        :param ttl: Cache TTL in seconds, defaults to the configured ttl: Integer | Float
+        :return: results: Iteratable Object
+        """
+        self.debug("MySQL Data Queries")
+        statement = compile_statement(query)
+        result_cache = self.__result_cache
+        if not (result_cache.enabled if cache is None else cache) or not cacheable(statement):
+            return self.__query(statement, args)[0]
+        key = result_cache.key(statement, args)
+        result, versions = result_cache.get(key, statement.tables)
+        if result is not None:
+            self.debug("MySQL Query Cache Hit：{}", query)
+            return result
+        result = self.__query(statement, args)[0]
+        if result is not None:
+            result_cache.set(key, versions, result, ttl)
+        return result
+
+    def __query(
+        self,
+        statement: CompiledStatement,
+        args: Union[tuple, list, dict, None] = None,
+        cursor_class=None,
+        operation: str = "query",
+        prefer: Union[str, None] = None,
+        track: Union[Callable, None] = None,
+    ) -> tuple:
+        """
+        Private methods run a compiled query on a Slave
+        :param statement: Compiled statement: CompiledStatement
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :param cursor_class: pymysql cursor class, None for tuples: Cursor
+        :param operation: Operation name reported to the profiler: String
+        :param prefer: Slave node name to use while it is available: String
+        :param track: Called with the connection while the statement runs on it, None once released: Callable
+        :return: Rows and the cursor description, rows are None on failure: Tuple
         """
         try:
-            __slave_config = self.__mysql_slave_config()
-            __slave_host = __slave_config.get("host")
-            __slave_port = __slave_config.get("port")
-            __slave_user = __slave_config.get("user")
-            __slave_password = __slave_config.get("password")
-            __slave_database = __slave_config.get("database")
-            __slave_charset = __slave_config.get("charset")
-            if __slave_charset is None:
-                __slave_charset = "utf8mb4"
-            if not all(
-                (
-                    __slave_host,
-                    __slave_port,
-                    __slave_user,
-                    __slave_password,
-                    __slave_database,
-                )
-            ):
-                raise MySQLSourceError("MySQL Slave Configuration Error")
-            self.debug("MySQL Data Source：MySQL Slave DBRouter")
-            self.debug("MySQL Slave DBRouter IP：{}".format(__slave_host))
-            self.debug("MySQL Slave DBRouter Port：{}".format(__slave_port))
-            self.debug("MySQL Slave DBRouter Username：{}".format(__slave_user))
-            self.debug("MySQL Slave DBRouter Database：{}".format(__slave_database))
-            self.debug("MySQL Slave DBRouter Charset：{}".format(__slave_charset))
-            connect = pymysql.connect(
-                host=__slave_host,
-                port=__slave_port,
-                user=__slave_user,
-                password=__slave_password,
-                database=__slave_database,
-                charset=__slave_charset,
+            # Reads are idempotent, a retry is routed again and may land on another replica.
+            return self.__resilience_policy.call(
+                self.__query_once,
+                statement,
+                args,
+                cursor_class,
+                operation,
+                prefer,
+                track,
+                transient=_retryable,
             )
-            return connect
         except Exception as error:
+            self.error("MySQL Query Failure：{}".format(statement.sql))
             self.exception(error)
-            sys.exit(1)
+            if _unavailable(error):
+                raise
+            return None, None
 
-    def query(self, query: str):
+    def __query_once(
+        self,
+        statement: CompiledStatement,
+        args: Union[tuple, list, dict, None],
+        cursor_class,
+        operation: str,
+        prefer: Union[str, None],
+        track: Union[Callable, None],
+    ) -> tuple:
         """
-        MySQL Data Queries
-        :param query: SQL query statements: String
-        :return: results: Iteratable Object
+        One attempt of __query, failures are raised to the resilience policy
+        :return: Rows and the cursor description: Tuple
         """
-        self.debug("MySQL Data Queries")
-        conn = self.__connect_slave_tool
-        cur = conn.cursor()
+        profiler = self.__query_profiler
+        connecting = time.perf_counter_ns()
+        node, conn = self.__connect_round("slave", prefer, True)
+        if track is not None:
+            track(conn)
+        started = time.perf_counter()
+        cur = conn.cursor(cursor_class)
+        event, executing, executed = None, time.perf_counter_ns(), None
+        broken = limited = False
         try:
-            cur.execute(query=query)
+            limited = _set_time_limit(cur, statement)
+            event = profiler.begin(operation, statement, node.name, args, time.perf_counter_ns() - connecting)
+            executing = time.perf_counter_ns()
+            cur.execute(query=statement.sql, args=statement.bind(args))
+            executed = time.perf_counter_ns()
             result = cur.fetchall()
+            description = cur.description
+            profiler.end(event, executed - executing, time.perf_counter_ns() - executed, len(result))
             conn.commit()
+            return result, description
+        except Exception as error:
+            broken = _transient_error(error)
+            if broken:
+                self.__node_breaker(node).failure()
+            elif conn.open:
+                conn.rollback()
+            profiler.end(event, (executed or time.perf_counter_ns()) - executing, error=error)
+            raise
+        finally:
+            if track is not None:
+                track(None)
+            if limited and not broken:
+                broken = not _reset_time_limit(cur)
+            cur.close()
+            self.__release_tool("slave", node, conn, started, discard=broken)
+
+    def scan(
+        self,
+        table: str,
+        key: str = "id",
+        chunk: int = SCAN_CHUNK_SIZE,
+        where: Union[str, None] = None,
+        args: Union[tuple, list] = (),
+        fields: Union[tuple, list] = (),
+        dict_rows: bool = False,
+        parallel: int = 1,
+    ):
+        """
+        Chunked table scan on the Slaves with keyset pagination (key > last ORDER BY key LIMIT chunk),
+        pages are read lazily and every page costs the same however deep the scan is.
+        With parallel > 1 every page is routed on its own, spreading the key ranges over the replicas.
+        :param table: Table name, optionally database-qualified: String
+        :param key: Unique, indexed ordering column: String
+        :param chunk: Rows per page: Integer
+        :param where: Extra condition with %s placeholders: String
+        :param args: Values of the where placeholders: Tuple | List
+        :param fields: Selected fields, * when empty: Tuple | List
+        :param dict_rows: Rows as dictionaries: Boolean
+        :param parallel: Read this many integer key ranges concurrently, pages then arrive out of key order: Integer
+        :return: Pages of rows: Generator
+        """
+        self.debug("MySQL Keyset Scan：{} by {}", table, key)
+        cursor_class = DictCursor if dict_rows else None
+
+        def fetch_page(statement: CompiledStatement, page_args: tuple) -> tuple:
+            return self.__query(statement, page_args, cursor_class, "scan")
+
+        if parallel > 1:
+            return parallel_keyset_scan(fetch_page, table, key, chunk, where, args, fields, parallel)
+        return keyset_scan(fetch_page, table, key, chunk, where, args, fields)
+
+    @classmethod
+    def __parallel_executor(cls) -> ThreadPoolExecutor:
+        if cls.__executor is None:
+            with cls.__executor_lock:
+                if cls.__executor is None:
+                    cls.__executor = ThreadPoolExecutor(
+                        max_workers=PARALLEL_QUERY_WORKERS,
+                        thread_name_prefix="mysql-parallel-query",
+                    )
+        return cls.__executor
+
+    def parallel_query(
+        self,
+        partitions: Iterable,
+        merge: Union[str, Callable] = "ordered",
+        timeout: Union[int, float, None] = None,
+        dict_rows: bool = False,
+    ):
+        """
+        Run the partitions of one logical read (key ranges, shards) concurrently, spread
+        round-robin over every Slave node, and merge the results
+        :param partitions: Queries, (query, args) pairs or SelectQuery builders: Iterable
+        :param merge: ordered (rows per partition), concat (all rows in partition order),
+            stream (generator of (index, rows) as partitions finish) or a callable taking the ordered results: String | Callable
+        :param timeout: Seconds per partition, a deadline inside the partition: SELECTs run under max_execution_time
+            so MySQL aborts them, and a partition still running after the grace period has its connection cut: Integer | Float
+        :param dict_rows: Rows as dictionaries: Boolean
+        :return: Merged results; a failed or timed out partition is None in ordered and stream,
+            and makes concat and callable merges return None: Any
+        """
+        if not callable(merge) and merge not in MERGE_MODES:
+            raise ParamsError("Unknown merge mode: {}".format(merge))
+        statements = [_partition_statement(partition) for partition in partitions]
+        self.debug("MySQL Parallel Query：{} partitions", len(statements))
+        results = self.__run_partitions(statements, DictCursor if dict_rows else None, timeout)
+        if merge == "stream":
+            return results
+        ordered = [None] * len(statements)
+        for index, rows in results:
+            ordered[index] = rows
+        if merge == "ordered":
+            return ordered
+        if any(rows is None for rows in ordered):
+            self.error("MySQL Parallel Query Failure：{} of {} partitions failed".format(
+                sum(rows is None for rows in ordered), len(ordered)
+            ))
+            return None
+        if merge == "concat":
+            return [row for rows in ordered for row in rows]
+        return merge(ordered)
+
+    def __run_partitions(self, statements: list, cursor_class, timeout: Union[int, float, None]):
+        """
+        Submit the partitions and yield (index, rows) as they complete
+        :param statements: Compiled statements and arguments: List
+        :param cursor_class: pymysql cursor class, None for tuples: Cursor
+        :param timeout: Seconds per partition, counted from when a worker picks it up: Integer | Float
+        :return: Partition index and rows, None for a failed or timed out partition: Generator
+        """
+        nodes = [node.name for node in self.__node_router("slave").nodes]
+        if not nodes:
+            raise MySQLSourceError("No MySQL slave node configured")
+        started = {}
+        connections = {}
+
+        def track(index: int, connect):
+            if connect is None:
+                connections.pop(index, None)
+            else:
+                connections[index] = connect
+
+        def run(index: int, statement: CompiledStatement, args):
+            started[index] = time.monotonic()
+            # The deadline stops retries of a partition whose connection was cut below.
+            with deadline(timeout) if timeout else nullcontext():
+                return self.__query(
+                    statement,
+                    args,
+                    cursor_class,
+                    "parallel_query",
+                    nodes[index % len(nodes)],
+                    lambda connect: track(index, connect),
+                )[0]
+
+        executor = self.__parallel_executor()
+        # One copy of the caller's context per partition (a context runs in one thread at a time),
+        # so deadline() and session() apply inside the workers.
+        pending = {
+            executor.submit(contextvars.copy_context().run, run, index, statement, args): index
+            for index, (statement, args) in enumerate(statements)
+        }
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=0.1 if timeout else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        yield index, future.result()
+                    except Exception as error:
+                        self.exception(error)
+                        yield index, None
+                if not timeout:
+                    continue
+                now = time.monotonic()
+                for future, index in list(pending.items()):
+                    if index in started and now - started[index] > timeout + PARTITION_TIMEOUT_GRACE:
+                        # MySQL did not abort it in time, cut the connection so the worker is freed.
+                        del pending[future]
+                        connect = connections.pop(index, None)
+                        if connect is not None:
+                            _interrupt(connect)
+                        self.error("MySQL Parallel Query Timeout：partition {}".format(index))
+                        yield index, None
+        finally:
+            # A consumer leaving a stream early drops the partitions that have not started.
+            for future in pending:
+                future.cancel()
+
+    def query_iter(
+        self,
+        query: str,
+        args: Union[tuple, list, dict, None] = None,
+        chunk_size: Union[int, None] = None,
+        dict_rows: bool = False,
+    ):
+        """
+        MySQL Streaming Data Queries on a Slave through an unbuffered server-side cursor,
+        memory use stays flat regardless of the size of the result set.
+        The connection is held until the generator is exhausted or closed.
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :param chunk_size: Yield lists of up to chunk_size rows instead of single rows: Integer
+        :param dict_rows: Yield rows as dictionaries: Boolean
+        :return: Rows or chunks of rows: Generator
+        """
+        self.debug("MySQL Streaming Data Queries")
+        profiler = self.__query_profiler
+        connecting = time.perf_counter_ns()
+        node, conn = self.__connect_tool("slave", read=True)
+        cur = conn.cursor(SSDictCursor if dict_rows else SSCursor)
+        exhausted = False
+        event, executing, executed = None, time.perf_counter_ns(), None
+        try:
+            statement = compile_statement(query)
+            event = profiler.begin("query_iter", statement, node.name, args, executing - connecting)
+            executing = time.perf_counter_ns()
+            cur.execute(query=statement.sql, args=statement.bind(args))
+            executed = time.perf_counter_ns()
+            yield from _fetch_stream(cur, chunk_size)
+            exhausted = True
+            profiler.end(event, executed - executing, time.perf_counter_ns() - executed, cur.rownumber)
+        except Exception as error:
+            profiler.end(event, (executed or time.perf_counter_ns()) - executing, error=error)
+            self.error("MySQL Streaming Query Failure：{}".format(query))
+            self.exception(error)
+            raise
+        finally:
+            if exhausted:
+                cur.close()
+            # Stream duration says nothing about node latency, keep it out of the EWMA.
+            self.__release_tool("slave", node, conn, discard=not exhausted)
+
+    def query_columnar(
+        self,
+        query: str,
+        args: Union[tuple, list, dict, None] = None,
+        batch_size: int = COLUMNAR_BATCH_SIZE,
+        use_numpy: Union[bool, None] = None,
+    ) -> Union[ColumnarResult, None]:
+        """
+        MySQL Data Queries on a Slave into per-column arrays for vectorized consumers: NumPy
+        arrays for numeric and temporal columns, lists for the others. Rows are read from an
+        unbuffered cursor in batches and folded into the columns, no full row list is ever built.
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :param batch_size: Rows per batch: Integer
+        :param use_numpy: NumPy arrays, None uses NumPy when installed (array.array otherwise): Boolean
+        :return: Columns by name, None on failure: ColumnarResult
+        """
+        self.debug("MySQL Columnar Data Queries")
+        profiler = self.__query_profiler
+        connecting = time.perf_counter_ns()
+        node, conn = self.__connect_tool("slave", read=True)
+        cur = conn.cursor(SSCursor)
+        exhausted = False
+        event, executing, executed = None, time.perf_counter_ns(), None
+        try:
+            statement = compile_statement(query)
+            event = profiler.begin("query_columnar", statement, node.name, args, executing - connecting)
+            executing = time.perf_counter_ns()
+            cur.execute(query=statement.sql, args=statement.bind(args))
+            executed = time.perf_counter_ns()
+            result = fetch_columnar(cur, batch_size, use_numpy)
+            exhausted = True
+            profiler.end(event, executed - executing, time.perf_counter_ns() - executed, len(result))
         except Exception as error:
             result = None
-            conn.rollback()
+            profiler.end(event, (executed or time.perf_counter_ns()) - executing, error=error)
+            self.error("MySQL Columnar Query Failure：{}".format(query))
             self.exception(error)
         finally:
-            cur.close()
-            conn.close()
+            if exhausted:
+                cur.close()
+            # Transfer time says nothing about node latency, keep it out of the EWMA.
+            self.__release_tool("slave", node, conn, discard=not exhausted)
         return result
 
-    def inster(self, query: str):
+    def inster(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Insert SQL Data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: True or False: Boolean
         """
         self.debug("MySQL Data Insertion")
-        return self.master_operation(query=query)
+        return self.master_operation(query=query, args=args)
+
+    def bulk_insert(
+        self,
+        table: str,
+        rows: Iterable,
+        batch_size: int = 1000,
+        on_duplicate: Union[str, list, tuple, dict, None] = None,
+        columns: Union[list, tuple, None] = None,
+    ) -> dict:
+        """
+        Bulk Insert SQL Data on the Master with multi-row VALUES batches, one commit per batch
+        :param table: Table name: String
+        :param rows: Dict or sequence rows: Iterable
+        :param batch_size: Rows per batch and commit: Integer
+        :param on_duplicate: None, "ignore", "update", columns to update or {column: expression}: Any
+        :param columns: Column names, defaults to the keys of the first dict row: List | Tuple
+        :return: Report (rows, batches, seconds, rows_per_sec, success): Dict
+        """
+        self.debug("MySQL Bulk Data Insert")
+        node, conn = self.__connect_tool("master")
+        report = BulkInsertReport()
+        try:
+            execute_bulk_insert(conn, table, rows, batch_size, on_duplicate, columns, report)
+            self.debug(
+                "MySQL Bulk Insert Successfully：{} rows in {} batches, {:.0f} rows/sec",
+                report["rows"],
+                report["batches"],
+                report["rows_per_sec"],
+            )
+        except Exception as error:
+            self.error(
+                "MySQL Bulk Insert Failure：{} after {} rows".format(table, report["rows"])
+            )
+            self.exception(error)
+        finally:
+            self.__release_tool("master", node, conn)
+        if report["rows"]:
+            self.__after_write((table,), True)
+        return report
 
-    def update(self, query: str):
+    def update(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Update SQL Data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: True or False: Boolean
         """
         self.debug("MySQL Data Updates")
-        return self.master_operation(query=query)
+        return self.master_operation(query=query, args=args)
 
-    def delete(self, query: str):
+    def delete(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Delete SQL Data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: True or False: Boolean
         """
         self.debug("MySQL Data Deletion")
-        return self.master_operation(query=query)
+        return self.master_operation(query=query, args=args)
 
-    def master_operation(self, query: str):
+    @contextmanager
+    def transaction(self, isolation_level: Union[str, None] = None, read_only: bool = False):
+        """
+        MySQL Transaction on one pooled Master connection, committed when the with block
+        exits normally and rolled back when it raises.
+        with db.transaction() as tx: tx.execute(...); tx.savepoint("a"); tx.rollback_to("a")
+        :param isolation_level: READ UNCOMMITTED / READ COMMITTED / REPEATABLE READ / SERIALIZABLE: String
+        :param read_only: Start a read-only transaction: Boolean
+        :return: Transaction: MySQLTransaction
+        """
+        self.debug("MySQL Transaction")
+        node, conn = self.__connect_tool("master")
+        tx = None
+        clean = True
+        try:
+            tx = MySQLTransaction(conn, isolation_level=isolation_level, read_only=read_only)
+            tx.begin()
+            yield tx
+            if tx.active:
+                tx.commit()
+            self.debug("MySQL Transaction Committed Successfully")
+        except BaseException as error:
+            # KeyboardInterrupt and GeneratorExit too, an open transaction must never go back to the pool.
+            clean = self.__rollback(tx)
+            self.error("MySQL Transaction Rolled Back")
+            self.exception(error)
+            raise
+        finally:
+            self.__release_tool("master", node, conn, discard=not clean or (tx is not None and tx.active))
+        # Committed, nothing past this point may be taken for a failed transaction.
+        self.__after_write(tx.tables, not read_only)
+
+    def __rollback(self, tx: Union[MySQLTransaction, None]) -> bool:
+        """
+        Roll a failed transaction back without masking the error that ended it
+        :param tx: Transaction, None when it was never created: MySQLTransaction
+        :return: Whether the connection is clean enough to be reused: Boolean
+        """
+        if tx is None:
+            return True
+        try:
+            tx.rollback()
+            return True
+        except BaseException as error:
+            self.error("MySQL Transaction Rollback Failure")
+            self.exception(error)
+            return False
+
+    def master_operation(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         Mysql Master executes SQL statements that do not return query data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: True or False: Boolean
         """
         self.debug("MySQL Master Operations")
-        return self.__operaion(query, "master")
+        return self.__operaion(query, "master", args)
 
-    def slave_operation(self, query: str):
+    def slave_operation(self, query: str, args: Union[tuple, list, dict, None] = None):
         """
         SQL statement executed by Mysql Slave does not return query data
         :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: True or False: Boolean
         """
         self.debug("MySQL Slave Operations")
-        return self.__operaion(query, "slave")
+        return self.__operaion(query, "slave", args)
 
-    def __operaion(self, query: str, dbrouter: str):
+    def __operaion(
+        self, query: str, dbrouter: str, args: Union[tuple, list, dict, None] = None
+    ):
         """
         Private methods execute SQL statements that do not return query data.
         :param query: SQL query statements: String
         :param dbrouter: Database routing distinguishes between Master and Slave: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
         :return: True or False: Boolean
         """
-        try:
-            if dbrouter == "master":
-                conn = self.__connect_master_tool
-            elif dbrouter == "slave":
-                conn = self.__connect_slave_tool
-            else:
-                raise ParamsError("Method parameter error")
-        except Exception as error:
-            self.exception(error)
-            sys.exit(1)
+        profiler = self.__query_profiler
+        connecting = time.perf_counter_ns()
+        node, conn = self.__connect_tool(dbrouter)
+        started = time.perf_counter()
         cur = conn.cursor()
+        event, executing = None, time.perf_counter_ns()
         try:
-            cur.execute(query=query)
+            statement = compile_statement(query)
+            event = profiler.begin("operation", statement, node.name, args, executing - connecting)
+            executing = time.perf_counter_ns()
+            rows = cur.execute(query=statement.sql, args=statement.bind(args))
             conn.commit()
-            self.debug("MySQL Transaction Executed Successfully：{}".format(query))
+            profiler.end(event, time.perf_counter_ns() - executing, rows=rows)
+            self.debug("MySQL Transaction Executed Successfully：{}", query)
             result = True
         except Exception as error:
-            conn.rollback()
+            if conn.open:
+                conn.rollback()
+            profiler.end(event, time.perf_counter_ns() - executing, error=error)
             self.error("MySQL Transaction Execution Failure：{}".format(query))
             self.exception(error)
             result = False
         finally:
             cur.close()
-            conn.close()
+            self.__release_tool(dbrouter, node, conn, started)
+        if result and not statement.readonly:
+            self.__after_write(statement.tables, node.role == "master")
         return result
+
+    def __after_write(self, tables: Iterable, master: bool):
+        """
+        Bookkeeping after a committed write, best effort: the data is committed whatever
+        happens here, so a failure is logged and never reported as a failed write
+        :param tables: Written tables: Iterable
+        :param master: The write went to the Master, it opens the read-your-writes window: Boolean
+        :return: None
+        """
+        if master:
+            record_write()
+        try:
+            self.__result_cache.invalidate(tables)
+        except Exception as error:
+            self.error("MySQL Query Cache Invalidation Failure：{}".format(", ".join(sorted(tables))))
+            self.exception(error)
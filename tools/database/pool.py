@@ -0,0 +1,343 @@
+# coding: utf8
+"""
+@ File: pool.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Union
+
+import pymysql
+
+from tools.public import MySQLSourceError
+from tools.public import PoolTimeoutError
+
+
+class MySQLConnectionPool:
+    """MySQL Connection Pool (process-wide, one pool per data source)"""
+
+    __instances: dict = {}
+    __instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: Union[int, float] = 300,
+        max_lifetime: Union[int, float] = 3600,
+        wait_timeout: Union[int, float] = 10,
+        ping_interval: Union[int, float] = 1,
+        **connect_kwargs,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Connection pool size parameter error.")
+        self.__min_size = min_size
+        self.__max_size = max_size
+        self.__idle_timeout = idle_timeout
+        self.__max_lifetime = max_lifetime
+        self.__wait_timeout = wait_timeout
+        self.__ping_interval = ping_interval
+        self.__connect_kwargs = connect_kwargs
+        self.__condition = threading.Condition(threading.Lock())
+        # Idle connections: (connection, created time, last used time), newest on the right.
+        self.__idle: deque = deque()
+        self.__created: dict = {}
+        self.__size = 0
+        self.__waits = 0
+        self.__wait_time = 0.0
+        self.__timeouts = 0
+        self.__connects = 0
+        self.__discards = 0
+        self.__closed = False
+
+    @classmethod
+    def instance(cls, pool_config: Union[dict, None] = None, **connect_kwargs):
+        """
+        Process-wide pool for a data source, created on first use
+        :param pool_config: Pool options (min_size, max_size, idle_timeout, max_lifetime, wait_timeout, ping_interval): Dict
+        :param connect_kwargs: pymysql.connect keyword arguments: Dict
+        :return: Connection pool: MySQLConnectionPool
+        """
+        key = (
+            connect_kwargs.get("host"),
+            connect_kwargs.get("port"),
+            connect_kwargs.get("user"),
+            connect_kwargs.get("database"),
+            connect_kwargs.get("charset"),
+        )
+        pool = cls.__instances.get(key)
+        if pool is None or pool.closed:
+            created = False
+            with cls.__instances_lock:
+                pool = cls.__instances.get(key)
+                # A pool closed on its own (not through close_all) is replaced as well.
+                if pool is None or pool.closed:
+                    pool = cls(**(pool_config or {}), **connect_kwargs)
+                    cls.__instances[key] = pool
+                    created = True
+            if created:
+                # Outside the lock, a slow or unreachable host must not hold up the lookups of
+                # other data sources. Concurrent acquires simply open their own connections.
+                try:
+                    pool.warm_up()
+                except Exception:
+                    # An unreachable node must not block pool creation, acquire reports the error.
+                    pass
+        return pool
+
+    @classmethod
+    def instances(cls) -> dict:
+        """
+        Process-wide pools created so far
+        :return: Pools keyed by host:port/database: Dict
+        """
+        with cls.__instances_lock:
+            return {
+                "{}:{}/{}".format(key[0], key[1], key[3]): pool for key, pool in cls.__instances.items()
+            }
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every process-wide pool
+        :return: None
+        """
+        with cls.__instances_lock:
+            pools = list(cls.__instances.values())
+            cls.__instances.clear()
+        for pool in pools:
+            pool.close()
+
+    def __connect(self):
+        connect = pymysql.connect(**self.__connect_kwargs)
+        now = time.monotonic()
+        with self.__condition:
+            self.__created[id(connect)] = now
+            self.__connects += 1
+        return connect, now
+
+    @staticmethod
+    def __close_quietly(connect):
+        try:
+            connect.close()
+        except Exception:
+            pass
+
+    def __expired(self, created: float, last_used: float, now: float) -> bool:
+        if self.__max_lifetime and now - created >= self.__max_lifetime:
+            return True
+        if self.__idle_timeout and now - last_used >= self.__idle_timeout:
+            return True
+        return False
+
+    def __healthy(self, connect, last_used: float, now: float) -> bool:
+        if not connect.open:
+            return False
+        if now - last_used < self.__ping_interval:
+            return True
+        try:
+            connect.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def __forget(self, connect):
+        with self.__condition:
+            self.__created.pop(id(connect), None)
+            self.__size -= 1
+            self.__discards += 1
+            self.__condition.notify()
+
+    def warm_up(self):
+        """
+        Open connections until the pool holds min_size of them
+        :return: None
+        """
+        while True:
+            with self.__condition:
+                if self.__closed or self.__size >= self.__min_size:
+                    return
+                self.__size += 1
+            try:
+                connect, now = self.__connect()
+            except Exception:
+                with self.__condition:
+                    self.__size -= 1
+                raise
+            with self.__condition:
+                if not self.__closed:
+                    self.__idle.append((connect, now, now))
+                    self.__condition.notify()
+                    continue
+            self.__close_quietly(connect)
+            self.__forget(connect)
+            return
+
+    def acquire(self, timeout: Union[int, float, None] = None):
+        """
+        Borrow a connection, waiting at most timeout seconds for one to become free
+        :param timeout: Wait timeout in seconds, defaults to the pool wait_timeout: Integer | Float
+        :return: Connection object: MySQL Connect Object
+        """
+        if timeout is None:
+            timeout = self.__wait_timeout
+        deadline = None
+        started = None
+        while True:
+            candidate = None
+            with self.__condition:
+                while not self.__closed and not self.__idle and self.__size >= self.__max_size:
+                    if started is None:
+                        started = time.monotonic()
+                        deadline = started + timeout
+                        self.__waits += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.__timeouts += 1
+                        self.__wait_time += time.monotonic() - started
+                        raise PoolTimeoutError(
+                            "MySQL connection pool exhausted, waited {:.3f} seconds.".format(timeout)
+                        )
+                    self.__condition.wait(remaining)
+                if self.__closed:
+                    raise MySQLSourceError("MySQL connection pool is closed.")
+                if started is not None:
+                    self.__wait_time += time.monotonic() - started
+                    started = None
+                if self.__idle:
+                    candidate = self.__idle.pop()
+                else:
+                    self.__size += 1
+            if candidate is None:
+                try:
+                    connect, _ = self.__connect()
+                except Exception:
+                    with self.__condition:
+                        self.__size -= 1
+                        self.__condition.notify()
+                    raise
+                if self.__closed:
+                    self.__close_quietly(connect)
+                    self.__forget(connect)
+                    raise MySQLSourceError("MySQL connection pool is closed.")
+                return connect
+            connect, created, last_used = candidate
+            now = time.monotonic()
+            if not self.__expired(created, last_used, now) and self.__healthy(connect, last_used, now):
+                return connect
+            self.__close_quietly(connect)
+            self.__forget(connect)
+
+    def release(self, connect, discard: bool = False):
+        """
+        Return a borrowed connection to the pool
+        :param connect: Connection object: MySQL Connect Object
+        :param discard: Close the connection instead of reusing it: Boolean
+        :return: None
+        """
+        if connect is None:
+            return
+        now = time.monotonic()
+        with self.__condition:
+            created = self.__created.get(id(connect))
+        if created is None:
+            self.__close_quietly(connect)
+            return
+        if discard or self.__closed or not connect.open or self.__expired(created, now, now):
+            self.__close_quietly(connect)
+            self.__forget(connect)
+            return
+        with self.__condition:
+            self.__idle.append((connect, created, now))
+            stale = []
+            # Trim connections idle past idle_timeout, keeping at least min_size around.
+            while self.__idle and self.__size - len(stale) > self.__min_size:
+                oldest_connect, oldest_created, oldest_used = self.__idle[0]
+                if not self.__expired(oldest_created, oldest_used, now):
+                    break
+                self.__idle.popleft()
+                stale.append(oldest_connect)
+            self.__condition.notify()
+        for stale_connect in stale:
+            self.__close_quietly(stale_connect)
+            self.__forget(stale_connect)
+
+    @contextmanager
+    def connection(self, timeout: Union[int, float, None] = None):
+        """
+        Borrow a connection for the duration of a with block
+        :param timeout: Wait timeout in seconds: Integer | Float
+        :return: Connection object: MySQL Connect Object
+        """
+        connect = self.acquire(timeout=timeout)
+        discard = False
+        try:
+            yield connect
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            discard = True
+            raise
+        finally:
+            self.release(connect, discard=discard)
+
+    def close(self):
+        """
+        Close all idle connections, borrowed connections are closed when returned and
+        nothing is lent any more
+        :return: None
+        """
+        with self.__condition:
+            self.__closed = True
+            idle = list(self.__idle)
+            self.__idle.clear()
+            # Waiting borrowers give up instead of waiting out their timeout.
+            self.__condition.notify_all()
+        for connect, _, _ in idle:
+            self.__close_quietly(connect)
+            self.__forget(connect)
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    @property
+    def wait_timeout(self) -> Union[int, float]:
+        return self.__wait_timeout
+
+    @property
+    def stats(self) -> dict:
+        """
+        Pool statistics
+        :return: Statistics: Dict
+        """
+        with self.__condition:
+            idle = len(self.__idle)
+            return {
+                "size": self.__size,
+                "in_use": self.__size - idle,
+                "idle": idle,
+                "min_size": self.__min_size,
+                "max_size": self.__max_size,
+                "waits": self.__waits,
+                "wait_time": self.__wait_time,
+                "timeouts": self.__timeouts,
+                "connects": self.__connects,
+                "discards": self.__discards,
+            }
@@ -0,0 +1,328 @@
+# coding: utf8
+"""
+@ File: profiling.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import threading
+from typing import Callable, Union
+
+from modules.journals import JournalModulesClass
+
+from .statement import CompiledStatement
+
+# Histogram bucket upper bounds in microseconds: 1us, 2us, 4us ... about 67s.
+BUCKET_BOUNDS_US = tuple(1 << exponent for exponent in range(27))
+PHASES = ("connect", "execute", "fetch", "total")
+
+
+class LatencyHistogram:
+    """Power-of-two latency histogram, constant memory and O(1) per sample"""
+
+    __slots__ = ("buckets", "count", "sum_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed_ns: int):
+        microseconds = elapsed_ns // 1000
+        index = microseconds.bit_length() if microseconds > 0 else 0
+        self.buckets[min(index, len(BUCKET_BOUNDS_US))] += 1
+        self.count += 1
+        self.sum_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Upper bound of the bucket holding the percentile
+        :param fraction: 0 to 1: Float
+        :return: Milliseconds: Float
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                if index >= len(BUCKET_BOUNDS_US):
+                    return self.max_ns / 1e6
+                return min(BUCKET_BOUNDS_US[index] / 1000, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ns / self.count / 1e6, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p90_ms": round(self.percentile(0.90), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ns / 1e6, 3),
+        }
+
+
+class QueryEvent:
+    """One statement execution as seen by the profiling hooks, timings in nanoseconds"""
+
+    __slots__ = (
+        "operation",
+        "statement",
+        "node",
+        "args",
+        "connect_ns",
+        "execute_ns",
+        "fetch_ns",
+        "rows",
+        "error",
+    )
+
+    def __init__(self, operation: str, statement: CompiledStatement, node: str, args, connect_ns: int):
+        self.operation = operation
+        self.statement = statement
+        self.node = node
+        self.args = args
+        self.connect_ns = connect_ns
+        self.execute_ns = 0
+        self.fetch_ns = 0
+        self.rows = None
+        self.error = None
+
+    @property
+    def total_ns(self) -> int:
+        return self.connect_ns + self.execute_ns + self.fetch_ns
+
+    def __repr__(self):
+        return "QueryEvent({} {} {:.3f}ms {!r})".format(
+            self.operation, self.node, self.total_ns / 1e6, self.statement.fingerprint
+        )
+
+
+class StatementProfile:
+    __slots__ = ("fingerprint", "tables", "histogram", "rows", "errors", "slow")
+
+    def __init__(self, statement: CompiledStatement):
+        self.fingerprint = statement.fingerprint
+        self.tables = statement.tables
+        self.histogram = LatencyHistogram()
+        self.rows = 0
+        self.errors = 0
+        self.slow = 0
+
+
+class QueryProfiler:
+    """
+    Process-wide MySQL instrumentation: before/after-execute hooks, per-phase and
+    per-statement latency histograms keyed on the normalized SQL, and a slow-query log.
+    Inactive (disabled and no hooks) it costs the tool classes one attribute check.
+    """
+
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        slow_query_ms: Union[int, float, None] = 1000,
+        max_statements: int = 1000,
+    ):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.__max_statements = max_statements
+        self.__journal = JournalModulesClass()
+        self.__lock = threading.Lock()
+        self.__before_hooks = []
+        self.__after_hooks = []
+        self.__phases = {phase: LatencyHistogram() for phase in PHASES}
+        self.__statements: dict = {}
+        self.__untracked = 0
+        self.active = enabled
+
+    @classmethod
+    def instance(cls, profiling_config: Union[dict, None] = None):
+        """
+        Process-wide profiler, created on first use
+        :param profiling_config: datasource.mysql.profiling configuration: Dict
+        :return: Profiler: QueryProfiler
+        """
+        if cls.__instance is None:
+            with cls.__instance_lock:
+                if cls.__instance is None:
+                    cls.__instance = cls(**(profiling_config or {}))
+        return cls.__instance
+
+    def __refresh(self):
+        self.active = self.enabled or bool(self.__before_hooks or self.__after_hooks)
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+        self.__refresh()
+
+    def add_hook(self, before: Union[Callable, None] = None, after: Union[Callable, None] = None):
+        """
+        Register execution hooks, they are called with the QueryEvent in the executing thread
+        :param before: Called after the connection is acquired, before the statement runs: Callable
+        :param after: Called once the rows are fetched or the statement failed: Callable
+        :return: None
+        """
+        with self.__lock:
+            if before is not None:
+                self.__before_hooks.append(before)
+            if after is not None:
+                self.__after_hooks.append(after)
+            self.__refresh()
+
+    def remove_hook(self, before: Union[Callable, None] = None, after: Union[Callable, None] = None):
+        with self.__lock:
+            if before in self.__before_hooks:
+                self.__before_hooks.remove(before)
+            if after in self.__after_hooks:
+                self.__after_hooks.remove(after)
+            self.__refresh()
+
+    def begin(self, operation: str, statement: CompiledStatement, node: str, args, connect_ns: int):
+        """
+        Start an event and run the before hooks
+        :param operation: query, query_iter or operation: String
+        :param statement: Compiled statement: CompiledStatement
+        :param node: Node name, standalone for the single node tool: String
+        :param args: Placeholder arguments: Tuple | Dict
+        :param connect_ns: Time spent acquiring the connection: Integer
+        :return: Event, None when the profiler is inactive: QueryEvent
+        """
+        if not self.active:
+            return None
+        event = QueryEvent(operation, statement, node, args, connect_ns)
+        for hook in self.__before_hooks:
+            try:
+                hook(event)
+            except Exception as error:
+                self.__journal.exception(error)
+        return event
+
+    def end(
+        self,
+        event: Union[QueryEvent, None],
+        execute_ns: int,
+        fetch_ns: int = 0,
+        rows: Union[int, None] = None,
+        error: Union[Exception, None] = None,
+    ):
+        """
+        Complete an event: record the histograms, log a slow query, run the after hooks
+        :param event: Event returned by begin(): QueryEvent
+        :param execute_ns: Time spent executing the statement: Integer
+        :param fetch_ns: Time spent fetching the rows: Integer
+        :param rows: Rows fetched or affected: Integer
+        :param error: Exception raised by the statement: Exception
+        :return: None
+        """
+        if event is None:
+            return
+        event.execute_ns = execute_ns
+        event.fetch_ns = fetch_ns
+        event.rows = rows
+        event.error = error
+        if self.enabled:
+            self.__record(event)
+        for hook in self.__after_hooks:
+            try:
+                hook(event)
+            except Exception as hook_error:
+                self.__journal.exception(hook_error)
+
+    def __record(self, event: QueryEvent):
+        total_ns = event.total_ns
+        slow = self.slow_query_ms is not None and total_ns >= self.slow_query_ms * 1e6
+        with self.__lock:
+            self.__phases["connect"].add(event.connect_ns)
+            self.__phases["execute"].add(event.execute_ns)
+            self.__phases["fetch"].add(event.fetch_ns)
+            self.__phases["total"].add(total_ns)
+            fingerprint = event.statement.fingerprint
+            profile = self.__statements.get(fingerprint)
+            if profile is None:
+                if len(self.__statements) >= self.__max_statements:
+                    self.__untracked += 1
+                    profile = None
+                else:
+                    profile = self.__statements[fingerprint] = StatementProfile(event.statement)
+            if profile is not None:
+                profile.histogram.add(total_ns)
+                profile.rows += event.rows or 0
+                profile.errors += event.error is not None
+                profile.slow += slow
+        if slow:
+            self.__journal.warning(
+                "MySQL Slow Query：{:.1f} ms (connect {:.1f} / execute {:.1f} / fetch {:.1f}) node {} rows {}：{}",
+                total_ns / 1e6,
+                event.connect_ns / 1e6,
+                event.execute_ns / 1e6,
+                event.fetch_ns / 1e6,
+                event.node,
+                event.rows,
+                event.statement.fingerprint,
+            )
+
+    def statements(self, top: int = 20, order: str = "total") -> list:
+        """
+        Hottest statements
+        :param top: Number of statements: Integer
+        :param order: total (time), count, mean or p99: String
+        :return: Statement summaries: List
+        """
+        keys = {
+            "total": lambda profile: profile.histogram.sum_ns,
+            "count": lambda profile: profile.histogram.count,
+            "mean": lambda profile: profile.histogram.sum_ns / max(profile.histogram.count, 1),
+            "p99": lambda profile: profile.histogram.percentile(0.99),
+        }
+        with self.__lock:
+            profiles = sorted(self.__statements.values(), key=keys[order], reverse=True)[:top]
+            return [
+                dict(
+                    fingerprint=profile.fingerprint,
+                    tables=profile.tables,
+                    total_ms=round(profile.histogram.sum_ns / 1e6, 3),
+                    rows=profile.rows,
+                    errors=profile.errors,
+                    slow=profile.slow,
+                    **profile.histogram.summary(),
+                )
+                for profile in profiles
+            ]
+
+    @property
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                "enabled": self.enabled,
+                "slow_query_ms": self.slow_query_ms,
+                "statements": len(self.__statements),
+                "untracked": self.__untracked,
+                "phases": {phase: histogram.summary() for phase, histogram in self.__phases.items()},
+            }
+
+    def reset(self):
+        with self.__lock:
+            self.__phases = {phase: LatencyHistogram() for phase in PHASES}
+            self.__statements.clear()
+            self.__untracked = 0
@@ -0,0 +1,235 @@
+# coding: utf8
+"""
+@ File: replication.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+import atexit
+import threading
+from contextvars import ContextVar
+from typing import Union
+
+import pymysql
+from pymysql.constants import CR
+from pymysql.cursors import DictCursor
+
+# Column of SHOW REPLICA STATUS (MySQL 8.0.22+) and of SHOW SLAVE STATUS before it.
+LAG_COLUMNS = ("Seconds_Behind_Source", "Seconds_Behind_Master")
+STATUS_STATEMENTS = ("show replica status", "show slave status")
+# Heartbeat rows written in UTC by pt-heartbeat --utc (or any writer updating ts on the master).
+HEARTBEAT_STATEMENT = "select timestampdiff(microsecond, max(ts), utc_timestamp(6)) from {}"
+# A probe timing out (or its connection failing) says nothing about the lag, which becomes unknown.
+PROBE_TIMEOUT_CODES = (CR.CR_CONN_HOST_ERROR, CR.CR_SERVER_LOST)
+
+
+class ReplicationLagMonitor:
+    """
+    Measures the replication lag of every node of a router on a background thread, one
+    dedicated connection per node so the probes never wait behind application queries.
+    The lag comes from SHOW REPLICA STATUS, or from a heartbeat table when one is configured
+    (sub-second and also right for chained replicas, but needs synchronized clocks).
+    """
+
+    def __init__(self, nodes: list, interval: Union[int, float] = 1, heartbeat: Union[str, None] = None):
+        self.__nodes = nodes
+        self.__interval = interval
+        self.__heartbeat = heartbeat
+        # One hung node must not hold up the probes of the others for longer than a round.
+        self.__timeout = max(interval, 0.1)
+        self.__connections: dict = {}
+        self.__statements: dict = {}
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def probe(self, node) -> Union[float, None]:
+        """
+        Measure the lag of one node
+        :param node: Node: MySQLNode
+        :return: Lag in seconds, None when replication is broken: Float
+        """
+        connect = self.__connections.get(node.name)
+        if connect is None or not connect.open:
+            connect_kwargs = dict(node.connect_kwargs)
+            connect_kwargs["connect_timeout"] = min(
+                connect_kwargs.get("connect_timeout") or self.__timeout, self.__timeout
+            )
+            connect = pymysql.connect(
+                cursorclass=DictCursor,
+                autocommit=True,
+                read_timeout=self.__timeout,
+                write_timeout=self.__timeout,
+                **connect_kwargs,
+            )
+            self.__connections[node.name] = connect
+        with connect.cursor() as cur:
+            if self.__heartbeat:
+                cur.execute(HEARTBEAT_STATEMENT.format(self.__heartbeat))
+                row = cur.fetchone()
+                value = next(iter(row.values())) if row else None
+                return None if value is None else max(float(value) / 1e6, 0.0)
+            statement = self.__statements.get(node.name)
+            for candidate in (statement,) if statement else STATUS_STATEMENTS:
+                try:
+                    cur.execute(candidate)
+                except pymysql.err.ProgrammingError:
+                    continue
+                self.__statements[node.name] = candidate
+                break
+            else:
+                return None
+            row = cur.fetchone()
+        if not row:
+            # Not a replica (a slave group pointed at the master), nothing to lag behind.
+            return 0.0
+        for column in LAG_COLUMNS:
+            if column in row:
+                return None if row[column] is None else float(row[column])
+        return None
+
+    def probe_all(self):
+        """
+        Measure every node once, a failed probe keeps the previous reading, whose age then
+        counts against the node (see MySQLNode.staleness); a probe that timed out leaves the
+        lag unknown
+        :return: None
+        """
+        for node in self.__nodes:
+            if self.__stopped.is_set():
+                return
+            try:
+                lag = self.probe(node)
+            except Exception as error:
+                connect = self.__connections.pop(node.name, None)
+                if connect is not None:
+                    try:
+                        connect.close()
+                    except Exception:
+                        pass
+                code = error.args[0] if isinstance(error, pymysql.err.OperationalError) and error.args else None
+                if code in PROBE_TIMEOUT_CODES:
+                    node.lag = None
+                    node.lag_checked = time.monotonic()
+                continue
+            node.lag = lag
+            node.lag_checked = time.monotonic()
+
+    def __run(self):
+        while not self.__stopped.is_set():
+            self.probe_all()
+            self.__stopped.wait(self.__interval)
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__run, name="mysql-lag-monitor", daemon=True)
+        self.__thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """
+        Stop probing and close the probe connections
+        :return: None
+        """
+        if self.__stopped.is_set():
+            return
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout=self.__interval + 1)
+        for connect in self.__connections.values():
+            try:
+                connect.close()
+            except Exception:
+                pass
+        self.__connections.clear()
+        atexit.unregister(self.stop)
+
+
+class ConsistencySession:
+    """
+    Read-your-writes window: for sticky_ms after a write on the Master, reads only go to
+    replicas known to have replayed past the write, which is the Master without lag probes
+    """
+
+    __slots__ = ("sticky", "last_write")
+
+    def __init__(self, sticky_ms: Union[int, float]):
+        self.sticky = sticky_ms / 1000
+        self.last_write = None
+
+    def record_write(self):
+        self.last_write = time.monotonic()
+
+    def max_lag(self) -> Union[float, None]:
+        """
+        Largest replica lag that still includes the last write
+        :return: Seconds since the write inside the sticky window, None outside of it: Float
+        """
+        if self.last_write is None:
+            return None
+        elapsed = time.monotonic() - self.last_write
+        return elapsed if elapsed < self.sticky else None
+
+
+_session: ContextVar = ContextVar("mysql_consistency_session", default=None)
+
+
+def current_session() -> Union[ConsistencySession, None]:
+    """
+    Session of the running thread or task
+    :return: Session, None outside of one: ConsistencySession
+    """
+    return _session.get()
+
+
+def enter_session(sticky_ms: Union[int, float]):
+    """
+    Open a session in the running context
+    :param sticky_ms: Read-your-writes window after a write: Integer | Float
+    :return: Session and the token closing it: Tuple
+    """
+    session = ConsistencySession(sticky_ms)
+    return session, _session.set(session)
+
+
+def exit_session(token):
+    _session.reset(token)
+
+
+def read_lag_bound(max_lag: Union[int, float, None]) -> Union[float, None]:
+    """
+    Replica lag a Slave read may tolerate: the configured max_lag, tightened to the time
+    since the last write inside a session
+    :param max_lag: Configured router max_lag: Integer | Float
+    :return: Seconds, None for any replica: Float
+    """
+    session = _session.get()
+    if session is not None:
+        since_write = session.max_lag()
+        if since_write is not None:
+            return since_write if max_lag is None else min(max_lag, since_write)
+    return max_lag
+
+
+def record_write():
+    """
+    Mark a committed Master write in the running session, if any
+    :return: None
+    """
+    session = _session.get()
+    if session is not None:
+        session.record_write()
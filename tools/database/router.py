@@ -0,0 +1,301 @@
+# coding: utf8
+"""
+@ File: router.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import math
+import time
+import random
+import threading
+from typing import Union
+
+from tools.public import MySQLSourceError
+from tools.public import ParamsError
+
+from .pool import MySQLConnectionPool
+from .replication import ReplicationLagMonitor
+
+
+class MySQLNode:
+    """A configured MySQL node with its own connection pool and health state"""
+
+    def __init__(self, name: str, node_config: dict, pool_config: Union[dict, None] = None, role: str = "master"):
+        self.name = name
+        self.role = role
+        __host = node_config.get("host")
+        __port = node_config.get("port")
+        __user = node_config.get("user")
+        __password = node_config.get("password")
+        __database = node_config.get("database")
+        __charset = node_config.get("charset")
+        if not __charset:
+            __charset = "utf8mb4"
+        if not all((__host, __port, __user, __password, __database)):
+            raise MySQLSourceError("MySQL {} Configuration Error".format(name))
+        self.host = __host
+        self.port = __port
+        self.weight = float(node_config.get("weight", 1))
+        self.pool_config = node_config.get("pool", pool_config) or {}
+        self.connect_kwargs = dict(
+            host=__host,
+            port=__port,
+            user=__user,
+            password=__password,
+            database=__database,
+            charset=__charset,
+            connect_timeout=5,
+        )
+        self.__pool = None
+        self.outstanding = 0
+        self.ewma = 0.0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        # Replication lag in seconds at lag_checked (monotonic), None until measured or while broken.
+        self.lag = None
+        self.lag_checked = 0.0
+
+    @property
+    def pool(self) -> MySQLConnectionPool:
+        """
+        Process-wide blocking connection pool of the node, created on first use
+        :return: Connection pool: MySQLConnectionPool
+        """
+        if self.__pool is None or self.__pool.closed:
+            self.__pool = MySQLConnectionPool.instance(
+                pool_config=self.pool_config, **self.connect_kwargs
+            )
+        return self.__pool
+
+    @property
+    def pooled(self) -> bool:
+        return self.__pool is not None
+
+    @property
+    def address(self) -> str:
+        return "{}:{}".format(self.host, self.port)
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def staleness(self, now: float) -> float:
+        """
+        Upper bound of the current replication lag: the last reading plus its age,
+        as a replica that stopped applying falls behind by exactly the elapsed time
+        :param now: time.monotonic() value: Float
+        :return: Seconds, infinite when unknown: Float
+        """
+        if self.lag is None:
+            return math.inf
+        return self.lag + now - self.lag_checked
+
+
+class MySQLNodeRouter:
+    """Health-aware routing over a group of MySQL nodes (master or slave)"""
+
+    STRATEGIES = ("weighted", "least_outstanding", "ewma")
+
+    __instances: dict = {}
+    __instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        role: str,
+        nodes_config: list,
+        strategy: str = "weighted",
+        eject_threshold: int = 3,
+        eject_backoff: Union[int, float] = 1,
+        eject_backoff_max: Union[int, float] = 60,
+        ewma_decay: float = 0.3,
+        max_lag: Union[int, float, None] = None,
+        lag_interval: Union[int, float] = 1,
+        heartbeat: Union[str, None] = None,
+        sticky_ms: Union[int, float] = 1000,
+        pool_config: Union[dict, None] = None,
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ParamsError("Unknown MySQL routing strategy: {}".format(strategy))
+        if not nodes_config:
+            raise MySQLSourceError("MySQL {} Configuration Error".format(role))
+        self.role = role
+        self.__strategy = strategy
+        self.__eject_threshold = eject_threshold
+        self.__eject_backoff = eject_backoff
+        self.__eject_backoff_max = eject_backoff_max
+        self.__ewma_decay = ewma_decay
+        self.max_lag = max_lag
+        self.sticky_ms = sticky_ms
+        self.__lock = threading.Lock()
+        self.__nodes = [
+            MySQLNode("{}-{}".format(role, index), node_config, pool_config, role)
+            for index, node_config in enumerate(nodes_config)
+        ]
+        self.__lag_monitor = None
+        if max_lag is not None and role == "slave":
+            self.__lag_monitor = ReplicationLagMonitor(self.__nodes, lag_interval, heartbeat).start()
+
+    @classmethod
+    def instance(cls, role: str, dbrouter_config: dict):
+        """
+        Process-wide router for the master or slave group, created on first use
+        :param role: master or slave: String
+        :param dbrouter_config: datasource.mysql.dbrouter configuration: Dict
+        :return: Router: MySQLNodeRouter
+        """
+        router = cls.__instances.get(role)
+        if router is None:
+            with cls.__instances_lock:
+                router = cls.__instances.get(role)
+                if router is None:
+                    router_config = dbrouter_config.get("router") or {}
+                    router = cls(
+                        role,
+                        dbrouter_config.get(role),
+                        pool_config=dbrouter_config.get("pool"),
+                        **router_config,
+                    )
+                    cls.__instances[role] = router
+        return router
+
+    @classmethod
+    def instances(cls) -> dict:
+        """
+        Process-wide routers created so far
+        :return: Routers keyed by role: Dict
+        """
+        with cls.__instances_lock:
+            return dict(cls.__instances)
+
+    @property
+    def nodes(self) -> list:
+        return list(self.__nodes)
+
+    def __choose(self, candidates: list) -> MySQLNode:
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.__strategy == "least_outstanding":
+            lowest = min(node.outstanding for node in candidates)
+            return random.choice([node for node in candidates if node.outstanding == lowest])
+        if self.__strategy == "ewma":
+            # Latency EWMA weighted by queue depth, unmeasured nodes are tried first.
+            return min(
+                candidates,
+                key=lambda node: (node.ewma * (node.outstanding + 1), random.random()),
+            )
+        return random.choices(candidates, weights=[node.weight for node in candidates])[0]
+
+    @property
+    def lag_monitored(self) -> bool:
+        return self.__lag_monitor is not None
+
+    def select(
+        self,
+        exclude: Union[set, None] = None,
+        prefer: Union[str, None] = None,
+        max_lag: Union[int, float, None] = None,
+    ) -> Union[MySQLNode, None]:
+        """
+        Pick the node for the next statement, skipping ejected nodes
+        :param exclude: Node names already tried for this statement: Set
+        :param prefer: Node name to use if it is available, the strategy decides otherwise: String
+        :param max_lag: Skip nodes that may lag more seconds behind the master: Integer | Float
+        :return: Node, None when no node is within max_lag: MySQLNode
+        """
+        now = time.monotonic()
+        with self.__lock:
+            remaining = [node for node in self.__nodes if not (exclude and node.name in exclude)]
+            if max_lag is not None:
+                remaining = [node for node in remaining if node.staleness(now) <= max_lag]
+                if not remaining:
+                    return None
+            candidates = [node for node in remaining if node.available(now)]
+            if not candidates:
+                # Every node is ejected, fall back to the one due back soonest.
+                if not remaining:
+                    raise MySQLSourceError("No MySQL {} node available".format(self.role))
+                candidates = [min(remaining, key=lambda node: node.ejected_until)]
+            preferred = [node for node in candidates if node.name == prefer] if prefer else None
+            node = preferred[0] if preferred else self.__choose(candidates)
+            node.outstanding += 1
+        return node
+
+    def success(self, node: MySQLNode, elapsed: float):
+        """
+        Record a successful statement on a node
+        :param node: Node: MySQLNode
+        :param elapsed: Statement latency in seconds: Float
+        :return: None
+        """
+        with self.__lock:
+            node.outstanding -= 1
+            if node.ewma:
+                node.ewma += self.__ewma_decay * (elapsed - node.ewma)
+            else:
+                node.ewma = elapsed
+            node.failures = 0
+            node.ejections = 0
+            node.ejected_until = 0.0
+
+    def failure(self, node: MySQLNode):
+        """
+        Record a connection failure, ejecting the node with exponential backoff
+        :param node: Node: MySQLNode
+        :return: None
+        """
+        with self.__lock:
+            node.outstanding -= 1
+            node.failures += 1
+            if node.failures >= self.__eject_threshold or node.ejections:
+                backoff = min(
+                    self.__eject_backoff * (2 ** node.ejections), self.__eject_backoff_max
+                )
+                node.ejections += 1
+                node.ejected_until = time.monotonic() + backoff
+
+    def release(self, node: MySQLNode):
+        """
+        Release a node without recording a result (statement errors are not node failures)
+        :param node: Node: MySQLNode
+        :return: None
+        """
+        with self.__lock:
+            node.outstanding -= 1
+
+    @property
+    def stats(self) -> list:
+        """
+        Per-node routing and pool statistics
+        :return: Statistics: List
+        """
+        now = time.monotonic()
+        with self.__lock:
+            return [
+                {
+                    "name": node.name,
+                    "address": node.address,
+                    "weight": node.weight,
+                    "outstanding": node.outstanding,
+                    "ewma": node.ewma,
+                    "failures": node.failures,
+                    "ejected": not node.available(now),
+                    "lag": node.lag,
+                    "pool": node.pool.stats if node.pooled else None,
+                }
+                for node in self.__nodes
+            ]
@@ -0,0 +1,210 @@
+# coding: utf8
+"""
+@ File: scan.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Union
+
+from tools.public import MySQLQueryError
+from tools.public import ParamsError
+
+from .tools import SelectQuery
+
+# Rows per page of a scan, unless given.
+SCAN_CHUNK_SIZE = 10000
+# How long a parallel scan worker waits for the consumer before checking whether it was closed.
+HANDOFF_TIMEOUT = 0.5
+
+
+def keyset_page(
+    table: str,
+    key: str = "id",
+    chunk: int = SCAN_CHUNK_SIZE,
+    where: Union[str, None] = None,
+    args: Union[tuple, list] = (),
+    fields: Union[tuple, list] = (),
+    after=None,
+    until=None,
+) -> SelectQuery:
+    """
+    One keyset page: rows with key > after (and <= until) in key order, the shape only
+    depends on which bounds are set, so every page after the first reuses one template
+    :param table: Table name, optionally database-qualified: String
+    :param key: Unique, indexed ordering column: String
+    :param chunk: Rows per page: Integer
+    :param where: Extra condition with %s placeholders: String
+    :param args: Values of the where placeholders: Tuple | List
+    :param fields: Selected fields, * when empty: Tuple | List
+    :param after: Exclusive lower bound of the key, None from the start: Any
+    :param until: Inclusive upper bound of the key, None to the end: Any
+    :return: Query builder: SelectQuery
+    """
+    query = SelectQuery(fields, table)
+    if where:
+        query.where("({})".format(where), *args)
+    if after is not None:
+        query.where("{} > %s".format(key), after)
+    if until is not None:
+        query.where("{} <= %s".format(key), until)
+    return query.order_by(key).limit(chunk)
+
+
+def _key_getter(key: str, row, description) -> Callable:
+    column = key.rsplit(".", 1)[-1].strip("`")
+    if isinstance(row, dict):
+        return lambda page_row: page_row[column]
+    names = [item[0] for item in description or ()]
+    if column not in names:
+        raise ParamsError("Scan key {} is not among the selected fields".format(key))
+    index = names.index(column)
+    return lambda page_row: page_row[index]
+
+
+def keyset_scan(
+    fetch_page: Callable,
+    table: str,
+    key: str = "id",
+    chunk: int = SCAN_CHUNK_SIZE,
+    where: Union[str, None] = None,
+    args: Union[tuple, list] = (),
+    fields: Union[tuple, list] = (),
+    after=None,
+    until=None,
+):
+    """
+    Walk a table in key order one page at a time, each page seeks past the last key read,
+    so the cost per page stays flat however deep the scan goes (unlike LIMIT ... OFFSET)
+    :param fetch_page: Callable running (statement, args) and returning (rows, cursor description): Callable
+    :return: Pages of rows: Generator
+    """
+    if chunk < 1:
+        raise ParamsError("Scan chunk size must be positive")
+    key_of = None
+    while True:
+        statement, page_args = keyset_page(table, key, chunk, where, args, fields, after, until).compile()
+        rows, description = fetch_page(statement, page_args)
+        if rows is None:
+            raise MySQLQueryError("MySQL Scan Failure：{}".format(statement.sql))
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk:
+            return
+        if key_of is None:
+            key_of = _key_getter(key, rows[-1], description)
+        after = key_of(rows[-1])
+
+
+def key_ranges(
+    fetch_page: Callable,
+    table: str,
+    key: str = "id",
+    where: Union[str, None] = None,
+    args: Union[tuple, list] = (),
+    parts: int = 4,
+) -> list:
+    """
+    Split the key space of an integer key into contiguous ranges of equal width
+    :return: (exclusive lower, inclusive upper) bounds: List
+    """
+    query = SelectQuery(("min({0})".format(key), "max({0})".format(key)), table)
+    if where:
+        query.where("({})".format(where), *args)
+    statement, bounds_args = query.compile()
+    rows, _ = fetch_page(statement, bounds_args)
+    if rows is None:
+        raise MySQLQueryError("MySQL Scan Failure：{}".format(statement.sql))
+    if not rows:
+        return []
+    row = rows[0]
+    lowest, highest = row.values() if isinstance(row, dict) else row
+    if lowest is None:
+        return []
+    if not isinstance(lowest, int) or not isinstance(highest, int):
+        raise ParamsError("Parallel scans need an integer key, {} is not".format(key))
+    parts = max(min(parts, highest - lowest + 1), 1)
+    width = highest - lowest + 1
+    edges = [lowest - 1 + width * index // parts for index in range(parts + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def parallel_keyset_scan(
+    fetch_page: Callable,
+    table: str,
+    key: str = "id",
+    chunk: int = SCAN_CHUNK_SIZE,
+    where: Union[str, None] = None,
+    args: Union[tuple, list] = (),
+    fields: Union[tuple, list] = (),
+    parallel: int = 4,
+):
+    """
+    Keyset scan of disjoint key ranges on several threads (one connection each), pages are
+    yielded as they arrive: in key order within a range, interleaved across ranges.
+    At most two pages per worker are buffered, closing the generator stops the workers.
+    :param fetch_page: Callable running (statement, args) and returning (rows, cursor description): Callable
+    :param parallel: Number of ranges read concurrently: Integer
+    :return: Pages of rows: Generator
+    """
+    ranges = key_ranges(fetch_page, table, key, where, args, parallel)
+    if len(ranges) <= 1:
+        for after, until in ranges:
+            yield from keyset_scan(fetch_page, table, key, chunk, where, args, fields, after, until)
+        return
+    pages = queue.Queue(maxsize=len(ranges) * 2)
+    stopped = threading.Event()
+    done = object()
+
+    def hand_off(item) -> bool:
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=HANDOFF_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(after, until):
+        try:
+            for page in keyset_scan(fetch_page, table, key, chunk, where, args, fields, after, until):
+                if not hand_off(page):
+                    return
+            hand_off(done)
+        except Exception as error:
+            hand_off(error)
+
+    executor = ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="mysql-scan")
+    try:
+        for after, until in ranges:
+            executor.submit(worker, after, until)
+        remaining = len(ranges)
+        while remaining:
+            item = pages.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stopped.set()
+        executor.shutdown(wait=True)
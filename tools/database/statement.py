@@ -0,0 +1,256 @@
+# coding: utf8
+"""
+@ File: statement.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Union
+
+from tools.public import ParamsError
+
+READ_KEYWORDS = ("select", "show", "describe", "desc", "explain")
+IDENTIFIER = r"(?:`[^`]+`|\w+)(?:\.(?:`[^`]+`|\w+))?"
+# Words that may follow a table name but never alias it ("from a join b", "update a set ...").
+NOT_ALIAS = (
+    r"(?!(?:join|inner|outer|left|right|full|cross|straight_join|natural|on|using|where|set|group"
+    r"|order|limit|union|having|values|value|select|partition|force|use|ignore|for|lock|window)\b)"
+)
+ALIASED = r"{}(?:\s+(?:as\s+)?{}\w+)?".format(IDENTIFIER, NOT_ALIAS)
+TABLE_PATTERN = re.compile(
+    r"\b(?:from|join|into|update|table)\s+({0}(?:\s*,\s*{0})*)".format(ALIASED),
+    re.IGNORECASE,
+)
+TABLE_NAME_PATTERN = re.compile(r"^{}".format(IDENTIFIER))
+
+
+class CompiledStatement:
+    """SQL template parsed once: executable text, fingerprint, placeholders and referenced tables"""
+
+    __slots__ = ("sql", "fingerprint", "placeholders", "named", "readonly", "tables")
+
+    def __init__(self, sql: str):
+        self.sql = sql.strip().rstrip(";").rstrip()
+        fingerprint, placeholders, named = self.__scan(self.sql)
+        self.fingerprint = fingerprint
+        self.placeholders = placeholders
+        self.named = named
+        keyword = fingerprint.split(" ", 1)[0] if fingerprint else ""
+        if keyword == "with":
+            keyword = self.__cte_verb(fingerprint)
+        self.readonly = keyword in READ_KEYWORDS
+        tables = []
+        for match in TABLE_PATTERN.finditer(fingerprint):
+            # "from a x, b as y" lists every table with an optional alias.
+            for item in match.group(1).split(","):
+                name = TABLE_NAME_PATTERN.match(item.strip())
+                if name is None:
+                    continue
+                table = name.group(0).replace("`", "")
+                if table not in tables:
+                    tables.append(table)
+        self.tables = tuple(tables)
+
+    @staticmethod
+    def __cte_verb(fingerprint: str) -> str:
+        """
+        Verb of the statement after a WITH list, "with c as (select ...) delete from t" is a delete
+        :param fingerprint: Fingerprint starting with with: String
+        :return: Verb, empty when the list is malformed: String
+        """
+        depth, index, length = 0, 4, len(fingerprint)
+        while index < length:
+            char = fingerprint[index]
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    # After a column list comes "as", after a CTE body "," or the statement.
+                    rest = fingerprint[index + 1:].lstrip()
+                    if rest.startswith(","):
+                        index = length - len(rest)
+                    else:
+                        word = re.match(r"\w*", rest).group(0)
+                        if word != "as":
+                            return word
+            index += 1
+        return ""
+
+    @staticmethod
+    def __scan(sql: str):
+        """
+        Single pass over the template: literals become ?, comments and runs of whitespace
+        collapse, placeholders are counted.
+        :param sql: SQL template: String
+        :return: Fingerprint, positional placeholder count, named placeholders: Tuple
+        """
+        output = []
+        placeholders = 0
+        named = set()
+        index, length = 0, len(sql)
+        while index < length:
+            char = sql[index]
+            if char in ("'", '"'):
+                end = index + 1
+                while end < length:
+                    if sql[end] == "\\":
+                        end += 2
+                        continue
+                    if sql[end] == char:
+                        if end + 1 < length and sql[end + 1] == char:
+                            end += 2
+                            continue
+                        break
+                    end += 1
+                output.append("?")
+                index = end + 1
+            elif char == "`":
+                end = sql.find("`", index + 1)
+                end = length if end < 0 else end
+                output.append(sql[index:end + 1])
+                index = end + 1
+            elif char == "-" and sql.startswith("--", index) or char == "#":
+                end = sql.find("\n", index)
+                index = length if end < 0 else end
+            elif char == "/" and sql.startswith("/*", index):
+                end = sql.find("*/", index + 2)
+                index = length if end < 0 else end + 2
+                output.append(" ")
+            elif char == "%":
+                if sql.startswith("%%", index):
+                    output.append("%")
+                    index += 2
+                elif sql.startswith("%s", index):
+                    placeholders += 1
+                    output.append("?")
+                    index += 2
+                elif sql.startswith("%(", index):
+                    end = sql.find(")s", index)
+                    if end < 0:
+                        raise ParamsError("Unterminated named placeholder in SQL: {}".format(sql))
+                    named.add(sql[index + 2:end])
+                    output.append("?")
+                    index = end + 2
+                else:
+                    output.append(char)
+                    index += 1
+            elif char.isspace():
+                if output and output[-1] != " ":
+                    output.append(" ")
+                index += 1
+            elif char.isdigit() and (not output or not (output[-1][-1:].isalnum() or output[-1][-1:] == "_")):
+                end = index
+                while end < length and (sql[end].isdigit() or sql[end] == "."):
+                    end += 1
+                output.append("?")
+                index = end
+            else:
+                output.append(char.lower())
+                index += 1
+        fingerprint = re.sub(r" {2,}", " ", "".join(output)).strip()
+        return fingerprint, placeholders, frozenset(named)
+
+    def bind(self, args=None):
+        """
+        Check the arguments against the template placeholders
+        :param args: Positional (tuple/list) or named (dict) arguments: Tuple | List | Dict
+        :return: Arguments for cursor.execute: Tuple | Dict | None
+        """
+        if args is None:
+            if self.placeholders or self.named:
+                raise ParamsError("SQL statement expects arguments: {}".format(self.sql))
+            return None
+        if isinstance(args, dict):
+            missing = self.named.difference(args)
+            if missing or self.placeholders:
+                raise ParamsError("SQL statement arguments mismatch: {}".format(self.sql))
+            return args
+        if not isinstance(args, (list, tuple)):
+            args = (args,)
+        if len(args) != self.placeholders or self.named:
+            raise ParamsError(
+                "SQL statement expects {} arguments, got {}: {}".format(
+                    self.placeholders, len(args), self.sql
+                )
+            )
+        return tuple(args)
+
+    def __repr__(self):
+        return "CompiledStatement({!r})".format(self.fingerprint)
+
+
+class StatementCache:
+    """LRU cache of CompiledStatement keyed on the SQL template"""
+
+    def __init__(self, max_size: int = 512):
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def compile(self, sql: str) -> CompiledStatement:
+        """
+        Compiled form of a SQL template, parsed on first use only
+        :param sql: SQL template with %s or %(name)s placeholders: String
+        :return: Compiled statement: CompiledStatement
+        """
+        with self.__lock:
+            statement = self.__entries.get(sql)
+            if statement is not None:
+                self.__entries.move_to_end(sql)
+                self.__hits += 1
+                return statement
+            self.__misses += 1
+        statement = CompiledStatement(sql)
+        with self.__lock:
+            self.__entries[sql] = statement
+            if len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+        return statement
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                "size": len(self.__entries),
+                "max_size": self.__max_size,
+                "hits": self.__hits,
+                "misses": self.__misses,
+            }
+
+
+statement_cache = StatementCache()
+
+
+def compile_statement(sql: Union[str, CompiledStatement]) -> CompiledStatement:
+    """
+    Compile a SQL template through the process-wide statement cache
+    :param sql: SQL template, an already compiled statement is returned as is: String | CompiledStatement
+    :return: Compiled statement: CompiledStatement
+    """
+    if isinstance(sql, CompiledStatement):
+        return sql
+    return statement_cache.compile(sql)
@@ -11,16 +11,25 @@ from __future__ import annotations
 
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+import threading
 from typing import Union
 
+from tools.public import ParamsError
+
+from .statement import CompiledStatement
+from .statement import compile_statement
+
+# Connectives a filter fragment may start with, see filter_param_join.
+FILTER_CONNECTIVES = ("and", "or", "not")
+
 
 class SQLStatement:
     def __init__(
@@ -81,9 +90,8 @@ class SQLStatement:
                 if not isinstance(field, str):
                     raise TypeError
             else:
-                field = " ".join(field)
-        select_str = "{}.{}.{}".format(self.database_name, table_name, field)
-        results = " ".join(("select", select_str))
+                field = ", ".join(field)
+        results = "select {} from {}.{}".format(field, self.database_name, table_name)
         return results
     
     def select_clause_example(self):
@@ -97,11 +105,11 @@ class SQLStatement:
             results = "select *"
         else:
             if not isinstance(field_iterable, (list, tuple, set)):
-                results = "select {}".format(field_iterable)
-            else:
                 if not isinstance(field_iterable, str):
                     raise TypeError
-                field_str = " ".join(field_iterable)
+                results = "select {}".format(field_iterable)
+            else:
+                field_str = ", ".join(field_iterable)
                 results = " ".join(("select", field_str))
         return results
 
@@ -156,6 +164,40 @@ class SQLStatement:
                 )
         return results
 
+    @staticmethod
+    def filter_param_join(
+        filter_name: str,
+        field_name: str,
+        field_value: Union[int, str, float, tuple, list],
+        field_operation: str,
+    ) -> tuple:
+        """
+        Parameterized filter_join, the value is bound through placeholders instead of pasted into the SQL
+        :param filter_name: not / and / or: String
+        :param field_name: Field name: String
+        :param field_value: Field value, a tuple or list for in / not in: Any
+        :param field_operation: Comparison operator: String
+        :return: Filter clause and its arguments: Tuple
+        """
+        if not isinstance(field_name, str):
+            raise TypeError
+        if field_operation in ("like", "ilike"):
+            if not isinstance(field_value, str):
+                raise SyntaxError
+            return "{} {} {} %s".format(filter_name, field_name, field_operation), (
+                "%{}%".format(field_value),
+            )
+        if field_operation in ("in", "not in"):
+            if not isinstance(field_value, (list, tuple)) or not field_value:
+                raise TypeError
+            placeholders = ", ".join(["%s"] * len(field_value))
+            return "{} {} {} ({})".format(
+                filter_name, field_name, field_operation, placeholders
+            ), tuple(field_value)
+        return "{} {} {} %s".format(filter_name, field_name, field_operation), (
+            field_value,
+        )
+
     @staticmethod
     def where_clause(
         filter_iterable: Union[list[str], tuple[str], set[str], None] = None
@@ -164,13 +206,20 @@ class SQLStatement:
             return str()
         if not isinstance(filter_iterable, (list, tuple, set)):
             raise TypeError
-        else:
-            split_list = " ".join(filter_iterable).split()
-            if split_list[0] in ("not", "and", "or"):
-                filter_str = " ".join(split_list[1:])
-                results = " ".join(("where", filter_str))
-            else:
-                raise ValueError
+        filters = []
+        for fragment in filter_iterable:
+            # Only the leading connective is inspected, values inside the fragment are left alone.
+            connective = fragment.split(None, 1)[0].lower() if fragment.strip() else ""
+            if connective not in FILTER_CONNECTIVES:
+                raise ValueError("Filter must start with not, and or or: {}".format(fragment))
+            fragment = fragment.strip()
+            if not filters:
+                if connective != "not":
+                    fragment = fragment.split(None, 1)[1]
+            elif connective == "not":
+                fragment = "and {}".format(fragment)
+            filters.append(fragment)
+        results = " ".join(("where", " ".join(filters)))
         return results
 
     @staticmethod
@@ -201,6 +250,228 @@ class SQLStatement:
             else:
                 results = "having {}".format(field)
         else:
-            field_str = ", ".join(field)
+            field_str = " and ".join(field)
             results = " ".join(("having", field_str))
         return results
+
+    @staticmethod
+    def order_by_clause(
+        field: Union[str, list[str], tuple[str], None] = None
+    ) -> str:
+        if not field:
+            return str()
+        if not isinstance(field, (list, tuple)):
+            if not isinstance(field, str):
+                raise TypeError
+            else:
+                results = "order by {}".format(field)
+        else:
+            field_str = ", ".join(field)
+            results = " ".join(("order by", field_str))
+        return results
+
+    @staticmethod
+    def limit_clause(limit: bool = False, offset: bool = False) -> str:
+        """
+        Parameterized limit clause, the row count and offset are bound as arguments
+        :param limit: Whether a row count is bound: Boolean
+        :param offset: Whether an offset is bound: Boolean
+        :return: Limit clause: String
+        """
+        if not limit:
+            return str()
+        return "limit %s offset %s" if offset else "limit %s"
+
+    def select(self, *fields: str) -> SelectQuery:
+        """
+        Start a chained query on the database (or schema) of this statement
+        :param fields: Selected fields or expressions, * when empty: String
+        :return: Query builder: SelectQuery
+        """
+        return SelectQuery(fields, self.__table_name, self.database_name)
+
+    def scan(
+        self,
+        tool,
+        table: Union[str, None] = None,
+        key: str = "id",
+        chunk: int = 10000,
+        where: Union[str, None] = None,
+        args: Union[tuple, list] = (),
+        fields: Union[tuple, list] = (),
+        dict_rows: bool = False,
+        parallel: int = 1,
+    ):
+        """
+        Keyset scan of a table of this database through a MySQL tool class
+        :param tool: MySQLStandaloneToolsClass or MySQLMasterSlaveDBRouterToolsClass
+        :param table: Table name, defaults to the table of this statement: String
+        :param key: Unique, indexed ordering column: String
+        :param chunk: Rows per page: Integer
+        :param where: Extra condition with %s placeholders: String
+        :param args: Values of the where placeholders: Tuple | List
+        :param fields: Selected fields, * when empty: Tuple | List
+        :param dict_rows: Rows as dictionaries: Boolean
+        :param parallel: Integer key ranges read concurrently: Integer
+        :return: Pages of rows: Generator
+        """
+        table = table or self.__table_name
+        if not table:
+            raise ValueError("Initialization failure, parameter error.")
+        return tool.scan(
+            "{}.{}".format(self.database_name, table), key, chunk, where, args, fields, dict_rows, parallel
+        )
+
+
+class SelectQuery:
+    """
+    Chained select/from/where/group_by/having/order_by/limit builder. Values are always bound
+    as arguments, so the SQL only depends on the shape of the chain: structurally identical
+    chains share one compiled template and building them again only collects the arguments.
+    """
+
+    __templates: dict = {}
+    __templates_lock = threading.Lock()
+    max_templates = 1024
+
+    def __init__(
+        self,
+        fields: Union[list, tuple] = (),
+        table: Union[str, None] = None,
+        database: Union[str, None] = None,
+    ):
+        self.__fields = tuple(fields)
+        self.__table = table
+        self.__database = database
+        self.__filters = []
+        self.__where_args = []
+        self.__groups = ()
+        self.__havings = []
+        self.__having_args = []
+        self.__orders = []
+        self.__limit = ()
+
+    def select(self, *fields: str) -> SelectQuery:
+        self.__fields += fields
+        return self
+
+    def from_(self, table: str, database: Union[str, None] = None) -> SelectQuery:
+        """
+        Table to read from
+        :param table: Table name: String
+        :param database: Database or schema, defaults to the one of the SQLStatement: String
+        :return: Query builder: SelectQuery
+        """
+        self.__table = table
+        if database:
+            self.__database = database
+        return self
+
+    def where(self, condition: str, *args) -> SelectQuery:
+        """
+        Add a condition joined with and
+        :param condition: Condition with %s placeholders: String
+        :param args: Placeholder values: Tuple
+        :return: Query builder: SelectQuery
+        """
+        self.__filters.append("and {}".format(condition))
+        self.__where_args.extend(args)
+        return self
+
+    def or_where(self, condition: str, *args) -> SelectQuery:
+        self.__filters.append("or {}".format(condition))
+        self.__where_args.extend(args)
+        return self
+
+    def filter(self, field: str, operation: str, value, connective: str = "and") -> SelectQuery:
+        """
+        Add a comparison built by SQLStatement.filter_param_join (=, >, like, in ...)
+        :param field: Field name: String
+        :param operation: Comparison operator: String
+        :param value: Field value, a tuple or list for in / not in: Any
+        :param connective: and / or / not: String
+        :return: Query builder: SelectQuery
+        """
+        fragment, args = SQLStatement.filter_param_join(connective, field, value, operation)
+        self.__filters.append(fragment)
+        self.__where_args.extend(args)
+        return self
+
+    def where_in(self, field: str, values: Union[list, tuple]) -> SelectQuery:
+        return self.filter(field, "in", values)
+
+    def group_by(self, *fields: str) -> SelectQuery:
+        self.__groups += fields
+        return self
+
+    def having(self, condition: str, *args) -> SelectQuery:
+        self.__havings.append(condition)
+        self.__having_args.extend(args)
+        return self
+
+    def order_by(self, field: str, desc: bool = False) -> SelectQuery:
+        self.__orders.append("{} desc".format(field) if desc else field)
+        return self
+
+    def limit(self, count: int, offset: Union[int, None] = None) -> SelectQuery:
+        self.__limit = (count,) if offset is None else (count, offset)
+        return self
+
+    def __shape(self) -> tuple:
+        return (
+            self.__fields,
+            self.__table,
+            self.__database,
+            tuple(self.__filters),
+            self.__groups,
+            tuple(self.__havings),
+            tuple(self.__orders),
+            len(self.__limit),
+        )
+
+    def __render(self) -> str:
+        if not self.__table:
+            raise ParamsError("Query has no table, call from_() first")
+        source = "from {}.{}".format(self.__database, self.__table) if self.__database else "from {}".format(self.__table)
+        clauses = (
+            SQLStatement.select_clause(list(self.__fields)),
+            source,
+            SQLStatement.where_clause(self.__filters),
+            SQLStatement.group_by_clause(list(self.__groups)),
+            SQLStatement.having_clause(self.__havings),
+            SQLStatement.order_by_clause(self.__orders),
+            SQLStatement.limit_clause(bool(self.__limit), len(self.__limit) > 1),
+        )
+        return " ".join(clause for clause in clauses if clause)
+
+    def compile(self) -> tuple:
+        """
+        Compiled template and arguments, the template is built once per query shape
+        :return: Compiled statement and arguments: Tuple
+        """
+        key = self.__shape()
+        statement = self.__templates.get(key)
+        if statement is None:
+            statement = compile_statement(self.__render())
+            with self.__templates_lock:
+                if len(self.__templates) >= self.max_templates:
+                    self.__templates.pop(next(iter(self.__templates)))
+                self.__templates[key] = statement
+        args = tuple(self.__where_args) + tuple(self.__having_args) + self.__limit
+        if len(args) != statement.placeholders:
+            raise ParamsError(
+                "Query expects {} arguments, got {}: {}".format(statement.placeholders, len(args), statement.sql)
+            )
+        return statement, args
+
+    def build(self) -> tuple:
+        """
+        Parameterized SQL and its arguments, ready for the MySQL tool classes
+        :return: SQL and arguments: Tuple
+        """
+        statement, args = self.compile()
+        return statement.sql, args
+
+    @classmethod
+    def template_count(cls) -> int:
+        return len(cls.__templates)
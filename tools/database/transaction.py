@@ -0,0 +1,197 @@
+# coding: utf8
+"""
+@ File: transaction.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import re
+from typing import Iterable, Union
+
+from tools.public import ParamsError
+
+from .statement import compile_statement
+
+ISOLATION_LEVELS = (
+    "READ UNCOMMITTED",
+    "READ COMMITTED",
+    "REPEATABLE READ",
+    "SERIALIZABLE",
+)
+SAVEPOINT_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+
+
+class MySQLTransaction:
+    """Several statements on one pinned connection, committed or rolled back once"""
+
+    def __init__(
+        self,
+        connect,
+        isolation_level: Union[str, None] = None,
+        read_only: bool = False,
+    ):
+        if isolation_level is not None:
+            isolation_level = isolation_level.upper().replace("_", " ")
+            if isolation_level not in ISOLATION_LEVELS:
+                raise ParamsError("Unknown isolation level: {}".format(isolation_level))
+        self.__connect = connect
+        self.__isolation_level = isolation_level
+        self.__read_only = read_only
+        self.__active = False
+        self.__savepoints = []
+        self.__tables = set()
+
+    @property
+    def connection(self):
+        return self.__connect
+
+    @property
+    def active(self) -> bool:
+        return self.__active
+
+    @property
+    def tables(self) -> set:
+        """
+        Tables written inside the transaction
+        :return: Table names: Set
+        """
+        return set(self.__tables)
+
+    def __check_active(self):
+        if not self.__active:
+            raise ParamsError("MySQL transaction is not active")
+
+    def begin(self):
+        """
+        Start the transaction, the isolation level applies to this transaction only
+        :return: None
+        """
+        with self.__connect.cursor() as cur:
+            if self.__isolation_level:
+                cur.execute("SET TRANSACTION ISOLATION LEVEL {}".format(self.__isolation_level))
+            cur.execute("START TRANSACTION READ ONLY" if self.__read_only else "START TRANSACTION")
+        self.__active = True
+
+    def execute(self, query: str, args: Union[tuple, list, dict, None] = None) -> int:
+        """
+        Execute a statement inside the transaction
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: Affected rows: Integer
+        """
+        self.__check_active()
+        statement = compile_statement(query)
+        if not statement.readonly:
+            self.__tables.update(statement.tables)
+        with self.__connect.cursor() as cur:
+            return cur.execute(query=statement.sql, args=statement.bind(args))
+
+    def executemany(self, query: str, args: Iterable) -> int:
+        """
+        Execute a statement once per argument row inside the transaction
+        :param query: SQL query statements: String
+        :param args: Argument rows: Iterable
+        :return: Affected rows: Integer
+        """
+        self.__check_active()
+        statement = compile_statement(query)
+        if not statement.readonly:
+            self.__tables.update(statement.tables)
+        with self.__connect.cursor() as cur:
+            return cur.executemany(statement.sql, [statement.bind(row) for row in args])
+
+    def query(self, query: str, args: Union[tuple, list, dict, None] = None):
+        """
+        Query inside the transaction, sees its uncommitted writes
+        :param query: SQL query statements: String
+        :param args: Placeholder arguments (%s / %(name)s): Tuple | List | Dict
+        :return: results: Iteratable Object
+        """
+        self.__check_active()
+        statement = compile_statement(query)
+        with self.__connect.cursor() as cur:
+            cur.execute(query=statement.sql, args=statement.bind(args))
+            return cur.fetchall()
+
+    @staticmethod
+    def __savepoint_name(name: str) -> str:
+        if not isinstance(name, str) or not SAVEPOINT_PATTERN.match(name):
+            raise ParamsError("Savepoint name error: {!r}".format(name))
+        return name
+
+    def savepoint(self, name: str):
+        """
+        Set a savepoint
+        :param name: Savepoint name: String
+        :return: None
+        """
+        self.__check_active()
+        name = self.__savepoint_name(name)
+        with self.__connect.cursor() as cur:
+            cur.execute("SAVEPOINT `{}`".format(name))
+        self.__savepoints.append(name)
+
+    def rollback_to(self, name: str):
+        """
+        Undo the statements executed after a savepoint, keeping the savepoint
+        :param name: Savepoint name: String
+        :return: None
+        """
+        self.__check_active()
+        name = self.__savepoint_name(name)
+        if name not in self.__savepoints:
+            raise ParamsError("Unknown savepoint: {}".format(name))
+        with self.__connect.cursor() as cur:
+            cur.execute("ROLLBACK TO SAVEPOINT `{}`".format(name))
+        del self.__savepoints[self.__savepoints.index(name) + 1:]
+
+    def release_savepoint(self, name: str):
+        """
+        Release a savepoint and the ones set after it
+        :param name: Savepoint name: String
+        :return: None
+        """
+        self.__check_active()
+        name = self.__savepoint_name(name)
+        if name not in self.__savepoints:
+            raise ParamsError("Unknown savepoint: {}".format(name))
+        with self.__connect.cursor() as cur:
+            cur.execute("RELEASE SAVEPOINT `{}`".format(name))
+        del self.__savepoints[self.__savepoints.index(name):]
+
+    def commit(self):
+        """
+        Commit the transaction
+        :return: None
+        """
+        self.__check_active()
+        self.__connect.commit()
+        # Still active when COMMIT fails, so the caller rolls back or drops the connection.
+        self.__active = False
+        self.__savepoints.clear()
+
+    def rollback(self):
+        """
+        Roll the transaction back, a no-op once it has ended or the connection is gone
+        :return: None
+        """
+        if not self.__active:
+            return
+        self.__active = False
+        self.__savepoints.clear()
+        if self.__connect.open:
+            self.__connect.rollback()
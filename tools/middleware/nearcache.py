@@ -0,0 +1,360 @@
+# coding: utf8
+"""
+@ File: nearcache.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Union
+
+from redis.connection import Connection
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis._compat import nativestr
+from rediscluster.connection import ClusterConnection
+
+NEAR_CACHE_MODES = ("auto", "tracking", "keyspace")
+# Channel CLIENT TRACKING ... REDIRECT publishes invalidated keys on (RESP2 clients).
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+KEYSPACE_PATTERN = "__keyspace@{}__:*"
+# How long a data connection waits for the invalidation listener of its node.
+LISTENER_READY_TIMEOUT = 5
+# Wait between reconnection attempts of a listener, doubled up to the maximum.
+LISTENER_BACKOFF = 0.1
+LISTENER_BACKOFF_MAX = 5
+
+
+class InvalidationListener:
+    """
+    Dedicated connection to one Redis node receiving the invalidations of the near cache:
+    the __redis__:invalidate channel that tracked connections redirect to (Redis 6+), or
+    keyspace notifications (the server needs notify-keyspace-events, e.g. K$gx). Every
+    reconnection drops the cached entries and bumps the generation, so tracked connections
+    re-register with the new client id before their next command.
+    """
+
+    def __init__(
+        self,
+        cache: "NearCache",
+        connection_kwargs: dict,
+        mode: str = "auto",
+        ping_interval: Union[int, float] = 30,
+    ):
+        self.__cache = cache
+        self.__connection_kwargs = connection_kwargs
+        self.__mode = mode
+        self.__ping_interval = ping_interval
+        self.__ready = threading.Event()
+        self.__stopped = threading.Event()
+        self.__thread = None
+        self.__connection = None
+        self.client_id = None
+        self.tracking = False
+        self.generation = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.__ready.is_set()
+
+    def wait_ready(self, timeout: Union[int, float] = LISTENER_READY_TIMEOUT):
+        if not self.__ready.wait(timeout):
+            raise RedisConnectionError("Near cache invalidation listener is not connected")
+
+    def __tracking_supported(self, connection: Connection) -> bool:
+        if self.__mode != "auto":
+            return self.__mode == "tracking"
+        connection.send_command("INFO", "server")
+        info = nativestr(connection.read_response())
+        for line in info.splitlines():
+            if line.startswith("redis_version:"):
+                return int(line.split(":", 1)[1].split(".", 1)[0]) >= 6
+        return False
+
+    def __subscribe(self) -> Connection:
+        connection = Connection(decode_responses=True, socket_keepalive=True, **self.__connection_kwargs)
+        connection.connect()
+        connection.send_command("CLIENT", "ID")
+        client_id = connection.read_response()
+        tracking = self.__tracking_supported(connection)
+        if tracking:
+            connection.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+        else:
+            connection.send_command("PSUBSCRIBE", KEYSPACE_PATTERN.format(self.__connection_kwargs.get("db") or 0))
+        connection.read_response()
+        self.client_id = client_id
+        self.tracking = tracking
+        return connection
+
+    def __handle(self, response):
+        kind = nativestr(response[0])
+        if kind == "message" and response[1] == INVALIDATION_CHANNEL:
+            # A nil payload means the server flushed its tracking table (FLUSHALL / FLUSHDB).
+            if response[2] is None:
+                self.__cache.clear()
+            else:
+                self.__cache.invalidate(response[2])
+        elif kind == "pmessage":
+            self.__cache.invalidate((response[2].split(":", 1)[1],))
+
+    def __run(self):
+        backoff = LISTENER_BACKOFF
+        while not self.__stopped.is_set():
+            try:
+                self.__connection = self.__subscribe()
+                self.generation += 1
+                self.__cache.clear()
+                self.__ready.set()
+                backoff = LISTENER_BACKOFF
+                pinged = time.monotonic()
+                while not self.__stopped.is_set():
+                    if self.__connection.can_read(timeout=1):
+                        self.__handle(self.__connection.read_response())
+                    elif time.monotonic() - pinged >= self.__ping_interval:
+                        # Surfaces half-open connections, the pong arrives as a regular message.
+                        self.__connection.send_command("PING")
+                        pinged = time.monotonic()
+            except Exception:
+                if self.__stopped.is_set():
+                    break
+                self.__stopped.wait(backoff)
+                backoff = min(backoff * 2, LISTENER_BACKOFF_MAX)
+            finally:
+                # Invalidations may have been missed, nothing cached survives a disconnection.
+                self.__ready.clear()
+                self.__cache.clear()
+                if self.__connection is not None:
+                    self.__connection.disconnect()
+                    self.__connection = None
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__run, name="redis-near-cache", daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout=2)
+
+
+class TrackingConnectionMixin:
+    """Data connection reads of the near cache go through, registered for invalidation on connect"""
+
+    near_cache = None
+    tracking_generation = -1
+    listener = None
+
+    def on_connect(self):
+        listener = self.near_cache.listener(
+            host=self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            db=self.db,
+            socket_connect_timeout=self.socket_connect_timeout,
+        )
+        listener.wait_ready()
+        self.listener = listener
+        self.tracking_generation = listener.generation
+        super().on_connect()
+        if listener.tracking:
+            self.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", listener.client_id)
+            if nativestr(self.read_response()) != "OK":
+                raise RedisConnectionError("CLIENT TRACKING failed")
+
+    def send_packed_command(self, command, check_health=True):
+        # The listener reconnected under a new client id, register again before reading.
+        if self._sock is not None and self.listener is not None and self.tracking_generation != self.listener.generation:
+            self.disconnect()
+        return super().send_packed_command(command, check_health)
+
+
+class NearCache:
+    """
+    In-process LRU/TTL cache in front of Redis reads. Keys are read through connections
+    registered with CLIENT TRACKING (or watched through keyspace notifications), so the
+    server reports every change and hot keys are served locally without going stale.
+    The TTL bounds what a lost invalidation could cost; while a node's listener is
+    disconnected nothing is cached.
+    """
+
+    __instances: dict = {}
+    __instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        size: int = 10000,
+        ttl: Union[int, float] = 60,
+        mode: str = "auto",
+        ping_interval: Union[int, float] = 30,
+    ):
+        if mode not in NEAR_CACHE_MODES:
+            raise ValueError("Unknown near cache mode: {}".format(mode))
+        self.enabled = enabled
+        self.__size = size
+        self.__ttl = ttl
+        self.__mode = mode
+        self.__ping_interval = ping_interval
+        self.__lock = threading.Lock()
+        # key -> (value, expires at)
+        self.__entries: OrderedDict = OrderedDict()
+        self.__pending: dict = {}
+        self.__listeners: dict = {}
+        self.__hits = 0
+        self.__misses = 0
+        self.__invalidations = 0
+
+    @classmethod
+    def instance(cls, name: str, near_cache_config: Union[dict, None] = None):
+        """
+        Process-wide near cache of a Redis endpoint, created on first use
+        :param name: Endpoint name: String
+        :param near_cache_config: middleware.redis.near_cache configuration: Dict
+        :return: Near cache: NearCache
+        """
+        cache = cls.__instances.get(name)
+        if cache is None:
+            with cls.__instances_lock:
+                cache = cls.__instances.get(name)
+                if cache is None:
+                    cache = cls(**(near_cache_config or {}))
+                    cls.__instances[name] = cache
+                    if cache.enabled:
+                        atexit.register(cache.close)
+        return cache
+
+    @classmethod
+    def instances(cls) -> dict:
+        with cls.__instances_lock:
+            return dict(cls.__instances)
+
+    def listener(self, **connection_kwargs) -> InvalidationListener:
+        """
+        Invalidation listener of a node, started on first use
+        :param connection_kwargs: host, port, password, db ... of the node: Dict
+        :return: Listener: InvalidationListener
+        """
+        key = (connection_kwargs.get("host"), connection_kwargs.get("port"), connection_kwargs.get("db"))
+        listener = self.__listeners.get(key)
+        if listener is None:
+            with self.__lock:
+                listener = self.__listeners.get(key)
+                if listener is None:
+                    listener = InvalidationListener(self, connection_kwargs, self.__mode, self.__ping_interval).start()
+                    self.__listeners[key] = listener
+        return listener
+
+    def connection_class(self, cluster: bool = False) -> type:
+        """
+        Connection class of the tracked client reading through this cache
+        :param cluster: Subclass the cluster connection: Boolean
+        :return: Connection class: Type
+        """
+        base = ClusterConnection if cluster else Connection
+        return type("Tracking" + base.__name__, (TrackingConnectionMixin, base), {"near_cache": self})
+
+    def __accepting(self) -> bool:
+        return all(listener.ready for listener in self.__listeners.values())
+
+    def get(self, key: str, loader: Callable):
+        """
+        Cached value of a key, read through loader on a miss
+        :param key: Key: String
+        :param loader: Reads the key from Redis on a tracked connection: Callable
+        :return: Value: Any
+        """
+        entry = self.__entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            with self.__lock:
+                if key in self.__entries:
+                    self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+        self.__misses += 1
+        # An invalidation arriving while the read is in flight withdraws the token, the
+        # value read may predate the write and is then returned but not cached.
+        token = object()
+        with self.__lock:
+            self.__pending[key] = token
+        try:
+            value = loader(key)
+        except Exception:
+            with self.__lock:
+                if self.__pending.get(key) is token:
+                    del self.__pending[key]
+            raise
+        with self.__lock:
+            if self.__pending.get(key) is token:
+                del self.__pending[key]
+                if self.__accepting():
+                    self.__entries[key] = (value, time.monotonic() + self.__ttl)
+                    self.__entries.move_to_end(key)
+                    while len(self.__entries) > self.__size:
+                        self.__entries.popitem(last=False)
+        return value
+
+    def invalidate(self, keys: Iterable):
+        """
+        Drop keys, called by the listeners and by local writes
+        :param keys: Keys: Iterable
+        :return: None
+        """
+        with self.__lock:
+            for key in keys:
+                self.__pending.pop(key, None)
+                if self.__entries.pop(key, None) is not None:
+                    self.__invalidations += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__pending.clear()
+
+    def close(self):
+        """
+        Stop the listeners and drop every entry
+        :return: None
+        """
+        with self.__lock:
+            listeners = list(self.__listeners.values())
+            self.__listeners.clear()
+        for listener in listeners:
+            listener.stop()
+        self.clear()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Near cache statistics
+        :return: Statistics (size, hits, misses, invalidations, listeners): Dict
+        """
+        with self.__lock:
+            return {
+                "size": len(self.__entries),
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "invalidations": self.__invalidations,
+                "listeners": {
+                    "{}:{}".format(*key[:2]): "tracking" if listener.tracking else "keyspace"
+                    for key, listener in self.__listeners.items()
+                    if listener.ready
+                },
+            }
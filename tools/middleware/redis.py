@@ -1,5 +1,5 @@
 # coding: utf8
-""" 
+"""
 @File: redis.py
 @Editor: PyCharm
 @Author: Austin (From Chengdu.China) https://fairy.host
@@ -11,20 +11,305 @@ from __future__ import annotations
 
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Union
+
 from redis import ConnectionPool
 from redis import Redis
+from redis.client import Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 from rediscluster import RedisCluster
 from rediscluster.connection import ClusterConnectionPool
+from rediscluster.exceptions import ClusterDownError
+from rediscluster.exceptions import RedisClusterException
+from rediscluster.exceptions import TryAgainError
+from rediscluster.pipeline import ClusterPipeline
 
 from modules.inheritance import BaseClass
+from modules.metrics.metrics import MetricSnapshot
+from modules.metrics.metrics import MetricsRegistry
+
+from tools.public import ResiliencePolicy
+
+from .nearcache import NearCache
+
+# Pool options read from the redis configuration, with their defaults.
+POOL_OPTIONS = {
+    "max_connections": 50,
+    "socket_timeout": 5,
+    "socket_connect_timeout": 5,
+    "health_check_interval": 30,
+    # The resilience policy owns retries: redis-py retrying too would multiply attempts past
+    # the deadline and replay calls the policy keeps to one attempt, such as INCR.
+    "retry_on_timeout": False,
+}
+# Commands sent per pipeline round trip by the batch operations, unless configured.
+PIPELINE_CHUNK_SIZE = 500
+# Upper bound of the threads running per-node cluster pipelines concurrently.
+CLUSTER_PIPELINE_WORKERS = 16
+# Failures a retry can clear: lost or refused connections, timeouts, slots moving during a failover.
+TRANSIENT_ERRORS = (RedisConnectionError, RedisTimeoutError, ClusterDownError, TryAgainError, RedisClusterException)
+
+
+def _transient_error(error: Exception) -> bool:
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def chunked(items: list, chunk_size: int):
+    """
+    Split a list into consecutive chunks
+    :param items: Items: List
+    :param chunk_size: Items per chunk: Integer
+    :return: Chunks: Generator
+    """
+    for index in range(0, len(items), chunk_size):
+        yield items[index:index + chunk_size]
+
+
+class RedisCommandMetrics:
+    """Redis command counts and latencies, recorded by the metered clients when metrics are enabled"""
+
+    registry = MetricsRegistry.instance()
+    __children: dict = {}
+    __collector_registered = False
+
+    @classmethod
+    def call(cls, client: str, command, function, *args, **options):
+        """
+        Run a client call, timing it if metrics are enabled
+        :param client: standalone or cluster: String
+        :param command: Command name, PIPELINE for a pipeline round trip: String
+        :param function: Bound client method: Callable
+        :return: Result of the call: Any
+        """
+        if not cls.registry.enabled:
+            return function(*args, **options)
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            return function(*args, **options)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            cls.__observe(client, str(command).upper(), status, time.perf_counter() - started)
+
+    @classmethod
+    def __observe(cls, client: str, command: str, status: str, elapsed: float):
+        key = (client, command, status)
+        children = cls.__children.get(key)
+        if children is None:
+            children = cls.__children[key] = (
+                cls.registry.counter(
+                    "redis_commands_total", "Redis commands sent", ("client", "command", "status")
+                ).labels(*key),
+                cls.registry.histogram(
+                    "redis_command_duration_seconds", "Redis command round trip", ("client", "command")
+                ).labels(client, command),
+            )
+        commands, duration = children
+        commands.inc()
+        duration.observe(elapsed)
+
+    @classmethod
+    def register_collector(cls):
+        if not cls.__collector_registered:
+            cls.registry.register_collector(cls.__collect)
+            cls.__collector_registered = True
+
+    @staticmethod
+    def __collect() -> list:
+        created, in_use, idle = [], [], []
+        for key, client in RedisClientRegistry.clients().items():
+            pool = client.connection_pool
+            kind = "tracked" if key[-1] == "tracked" else "shared"
+            if key[0] == "standalone":
+                labels = {"endpoint": "{}:{}/{}".format(*key[1:]), "client": kind}
+                created.append(("", labels, pool._created_connections))
+                in_use.append(("", labels, len(pool._in_use_connections)))
+                idle.append(("", labels, len(pool._available_connections)))
+                continue
+            for node, connections in list(pool._in_use_connections.items()):
+                labels = {"endpoint": node, "client": kind}
+                created.append(("", labels, pool._created_connections_per_node.get(node, 0)))
+                in_use.append(("", labels, len(connections)))
+                idle.append(("", labels, len(pool._available_connections.get(node, ()))))
+        lookups, entries = [], []
+        for name, cache in NearCache.instances().items():
+            if not cache.enabled:
+                continue
+            stats = cache.stats
+            lookups.append(("", {"endpoint": name, "result": "hit"}, stats["hits"]))
+            lookups.append(("", {"endpoint": name, "result": "miss"}, stats["misses"]))
+            entries.append(("", {"endpoint": name}, stats["size"]))
+        return [
+            MetricSnapshot("redis_pool_connections_created", "gauge", "Redis connections opened by the pool", created),
+            MetricSnapshot("redis_pool_connections_in_use", "gauge", "Redis connections borrowed", in_use),
+            MetricSnapshot("redis_pool_connections_idle", "gauge", "Redis connections idle in the pool", idle),
+            MetricSnapshot("redis_near_cache_lookups_total", "counter", "Near cache lookups by outcome", lookups),
+            MetricSnapshot("redis_near_cache_entries", "gauge", "Near cache entries", entries),
+        ]
+
+
+class MeteredPipeline(Pipeline):
+    def execute(self, raise_on_error=True):
+        return RedisCommandMetrics.call("standalone", "PIPELINE", super().execute, raise_on_error)
+
+
+class MeteredRedis(Redis):
+    """Redis client timing every command and pipeline into the metrics registry"""
+
+    def execute_command(self, *args, **options):
+        return RedisCommandMetrics.call("standalone", args[0], super().execute_command, *args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return MeteredPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class MeteredClusterPipeline(ClusterPipeline):
+    def execute(self, raise_on_error=True):
+        return RedisCommandMetrics.call("cluster", "PIPELINE", super().execute, raise_on_error)
+
+
+class MeteredRedisCluster(RedisCluster):
+    """Redis cluster client timing every command and pipeline into the metrics registry"""
+
+    def execute_command(self, *args, **kwargs):
+        return RedisCommandMetrics.call("cluster", args[0], super().execute_command, *args, **kwargs)
+
+    def pipeline(self, transaction=None, shard_hint=None, read_from_replicas=False):
+        # Same checks and arguments as RedisCluster.pipeline, only the pipeline class differs.
+        if shard_hint or transaction:
+            return super().pipeline(transaction, shard_hint, read_from_replicas)
+        return MeteredClusterPipeline(
+            connection_pool=self.connection_pool,
+            startup_nodes=self.connection_pool.nodes.startup_nodes,
+            result_callbacks=self.result_callbacks,
+            response_callbacks=self.response_callbacks,
+            cluster_down_retry_attempts=self.cluster_down_retry_attempts,
+            read_from_replicas=read_from_replicas,
+        )
+
+
+class RedisClientRegistry:
+    """Process-wide Redis clients, one connection pool per configured endpoint, shared across threads"""
+
+    __clients: dict = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def __pool_options(config: dict) -> dict:
+        pool_config = config.get("pool") or {}
+        return {option: pool_config.get(option, default) for option, default in POOL_OPTIONS.items()}
+
+    @classmethod
+    def standalone(cls, config: dict, near_cache: Union[NearCache, None] = None) -> Redis:
+        """
+        Shared client of a standalone Redis endpoint, its pool is built on first use
+        :param config: middleware.redis.standalone configuration: Dict
+        :param near_cache: Build the tracked client reading through this near cache instead: NearCache
+        :return: Redis client: Redis
+        """
+        __host = config.get("host")
+        __port = config.get("port")
+        __password = config.get("password")
+        __db = config.get("db", config.get("database")) or 0
+        key = ("standalone", __host, __port, __db) + (("tracked",) if near_cache is not None else ())
+        client = cls.__clients.get(key)
+        if client is None:
+            with cls.__lock:
+                client = cls.__clients.get(key)
+                if client is None:
+                    options = cls.__pool_options(config)
+                    if near_cache is not None:
+                        options["connection_class"] = near_cache.connection_class()
+                    pool = ConnectionPool(
+                        host=__host,
+                        port=__port,
+                        password=__password,
+                        db=__db,
+                        decode_responses=True,
+                        **options,
+                    )
+                    client = MeteredRedis(connection_pool=pool)
+                    cls.__clients[key] = client
+                    RedisCommandMetrics.register_collector()
+        return client
+
+    @classmethod
+    def cluster(
+        cls, nodes_config: list, config: dict = None, near_cache: Union[NearCache, None] = None
+    ) -> RedisCluster:
+        """
+        Shared client of a Redis cluster, slots are discovered once when it is built
+        :param nodes_config: middleware.redis.cluster node list: List
+        :param config: Pool options (middleware.redis.cluster_pool): Dict
+        :param near_cache: Build the tracked client reading through this near cache instead: NearCache
+        :return: Redis cluster client: RedisCluster
+        """
+        startup_nodes = []
+        __password_map = {}
+        for standalone_confg in nodes_config:
+            standalone_confg: dict
+            __host = standalone_confg.get("host")
+            __port = standalone_confg.get("port")
+            __password = standalone_confg.get("password")
+            startup_nodes.append({"host": __host, "port": __port})
+            __password_map["{}:{}".format(__host, __port)] = __password
+        key = ("cluster",) + tuple(sorted("{host}:{port}".format(**node) for node in startup_nodes))
+        if near_cache is not None:
+            key += ("tracked",)
+        client = cls.__clients.get(key)
+        if client is None:
+            with cls.__lock:
+                client = cls.__clients.get(key)
+                if client is None:
+                    options = cls.__pool_options({"pool": config or {}})
+                    if near_cache is not None:
+                        options["connection_class"] = near_cache.connection_class(cluster=True)
+                    pool = ClusterConnectionPool(
+                        startup_nodes=startup_nodes,
+                        password_map=__password_map,
+                        decode_responses=True,
+                        **options,
+                    )
+                    client = MeteredRedisCluster(connection_pool=pool)
+                    cls.__clients[key] = client
+                    RedisCommandMetrics.register_collector()
+        return client
+
+    @classmethod
+    def clients(cls) -> dict:
+        """
+        Shared clients built so far
+        :return: Clients keyed by endpoint: Dict
+        """
+        with cls.__lock:
+            return dict(cls.__clients)
+
+    @classmethod
+    def close_all(cls):
+        """
+        Disconnect every shared client, for shutdown and after fork
+        :return: None
+        """
+        with cls.__lock:
+            clients = list(cls.__clients.values())
+            cls.__clients.clear()
+        for client in clients:
+            client.connection_pool.disconnect()
 
 
 class RedisStandaloneToolsClass(BaseClass):
@@ -32,125 +317,422 @@ class RedisStandaloneToolsClass(BaseClass):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.debug("Initialization class：{}".format(self.__class__.__name__))
+        self.debug("Initialization class：{}", self.__class__.__name__)
         try:
             self.__redis_config: dict = (
                 self.config.get("middleware").get("redis").get("standalone")
             )
+            self.__near_cache_config: dict = self.config.get("middleware").get("redis").get("near_cache")
+            self.__resilience = ResiliencePolicy.instance(self.config.get("resilience"))
         except Exception as error:
             self.exception(error)
-            sys.exit(1)
+            raise
+        endpoint = self.__redis_config or {}
+        name = "redis://{}:{}/{}".format(
+            endpoint.get("host"), endpoint.get("port"), endpoint.get("db", endpoint.get("database")) or 0
+        )
+        self.__breaker = self.__resilience.breaker(name)
+        self.__near_cache = NearCache.instance(name, self.__near_cache_config)
 
     @property
     def __redis_connect(self):
         """
-        Redis Connections
+        Redis Connections, borrowed from the process-wide pool of the endpoint
         :return: Connect Object: Redis Connect Object
         """
         try:
-            __host = self.__redis_config.get("host")
-            __port = self.__redis_config.get("port")
-            __password = self.__redis_config.get("password")
-            __db = self.__redis_config.get("db")
-            pool = ConnectionPool(
-                host=__host,
-                port=__port,
-                password=__password,
-                db=__db,
-                decode_responses=True,
-                max_connections=10,
-            )
-            conn = Redis(connection_pool=pool)
-            self.debug("Redis Server Connection Successful")
-            return conn
+            return RedisClientRegistry.standalone(self.__redis_config)
         except Exception as error:
             self.exception(error)
-            sys.exit(1)
+            raise
+
+    @property
+    def __redis_tracked_connect(self):
+        """
+        Client of the near cache, its connections are registered for invalidation
+        :return: Connect Object: Redis Connect Object
+        """
+        return RedisClientRegistry.standalone(self.__redis_config, self.__near_cache)
 
-    def redis_set(self, k, v):
+    def __call(self, operation: Callable, idempotent: bool = True, tracked: bool = False):
+        """
+        Run an operation on the client under the resilience policy: transient failures of
+        idempotent operations are retried with backoff, an open circuit fails fast
+        :param operation: Called with the client: Callable
+        :param idempotent: Whether the operation may run more than once: Boolean
+        :param tracked: Use the near cache client: Boolean
+        :return: Result of the operation: Any
+        """
+        return self.__resilience.call(
+            lambda: operation(self.__redis_tracked_connect if tracked else self.__redis_connect),
+            breaker=self.__breaker,
+            transient=_transient_error,
+            idempotent=idempotent,
+        )
+
+    @property
+    def near_cache_stats(self) -> dict:
+        """
+        Near cache statistics
+        :return: Statistics (size, hits, misses, invalidations, listeners): Dict
+        """
+        return self.__near_cache.stats
+
+    def redis_set(self, k, v, ex=None):
         """
         Redis Write Data
         :param k: Key: String
         :param v: Value: Any
+        :param ex: Expire time in seconds, None keeps the key forever: Integer
         :return: True or False: Boolean
         """
-        conn = self.__redis_connect
         try:
-            conn.set(k, v)
+            self.__call(lambda conn: conn.set(k, v, ex=ex))
             return True
         except Exception as error:
             self.exception(error)
         finally:
-            conn.connection_pool.disconnect()
+            # The server invalidates too, dropping the key here already covers this process.
+            self.__near_cache.invalidate((k,))
 
-    def redis_get(self, k):
+    def redis_get(self, k, near: Union[bool, None] = None):
         """
-        Redis Fetches Values Based on Keys
+        Redis Fetches Values Based on Keys, served from the near cache when it is enabled
         :param k: key: String
+        :param near: Use the near cache, None follows the near cache configuration: Boolean
         :return: Value: Any
         """
-        conn = self.__redis_connect
+        cache = self.__near_cache
         try:
-            v = conn.get(k)
-            self.debug("Redis Fetches Data Successfully： key：{}， value：{}".format(k, v))
+            if cache.enabled if near is None else near:
+                v = cache.get(k, lambda key: self.__call(lambda conn: conn.get(key), tracked=True))
+            else:
+                v = self.__call(lambda conn: conn.get(k))
+            self.debug("Redis Fetches Data Successfully： key：{}， value：{}", k, v)
             return v
         except Exception as error:
             self.exception(error)
+
+    def redis_incr(self, k, amount: int = 1):
+        """
+        Redis Increments the Integer Value of a Key, never retried (it is not idempotent)
+        :param k: Key: String
+        :param amount: Increment: Integer
+        :return: Value after the increment: Integer
+        """
+        try:
+            return self.__call(lambda conn: conn.incr(k, amount), idempotent=False)
+        except Exception as error:
+            self.exception(error)
+        finally:
+            self.__near_cache.invalidate((k,))
+
+    def redis_delete(self, *keys):
+        """
+        Redis Deletes Keys
+        :param keys: Keys: String
+        :return: Number of keys deleted: Integer
+        """
+        try:
+            return self.__call(lambda conn: conn.delete(*keys))
+        except Exception as error:
+            self.exception(error)
+        finally:
+            self.__near_cache.invalidate(keys)
+
+    def __chunk_size(self, chunk_size: Union[int, None]) -> int:
+        return max(int(chunk_size or self.__redis_config.get("pipeline_chunk_size") or PIPELINE_CHUNK_SIZE), 1)
+
+    @contextmanager
+    def pipeline(self, transaction: bool = False):
+        """
+        Queue commands and send them in one round trip with execute()
+        :param transaction: Wrap the queued commands in MULTI/EXEC: Boolean
+        :return: Redis pipeline: Pipeline
+        """
+        with self.__redis_connect.pipeline(transaction=transaction) as pipe:
+            yield pipe
+
+    def redis_mget(self, keys: Iterable, chunk_size: Union[int, None] = None) -> Union[list, None]:
+        """
+        Redis Fetches the Values of Several Keys, one MGET per chunk, every chunk in one round trip
+        :param keys: Keys: Iterable
+        :param chunk_size: Keys per MGET, defaults to pipeline_chunk_size: Integer
+        :return: Values in key order, None for missing keys: List
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+
+        def fetch(conn) -> list:
+            with conn.pipeline(transaction=False) as pipe:
+                for chunk in chunked(keys, self.__chunk_size(chunk_size)):
+                    pipe.mget(chunk)
+                values = []
+                for chunk_values in pipe.execute():
+                    values.extend(chunk_values)
+            return values
+
+        try:
+            values = self.__call(fetch)
+            self.debug("Redis Fetches Data Successfully： keys：{}", len(keys))
+            return values
+        except Exception as error:
+            self.exception(error)
+
+    def redis_mset(
+        self,
+        mapping: dict,
+        ex: Union[int, None] = None,
+        chunk_size: Union[int, None] = None,
+    ) -> Union[bool, None]:
+        """
+        Redis Writes Several Keys, non-transactional pipeline flushed every chunk
+        :param mapping: Keys and values: Dict
+        :param ex: Expire time in seconds, None keeps the keys forever: Integer
+        :param chunk_size: Keys per round trip, defaults to pipeline_chunk_size: Integer
+        :return: True or False: Boolean
+        """
+        items = list(mapping.items())
+        if not items:
+            return True
+
+        def store(conn):
+            with conn.pipeline(transaction=False) as pipe:
+                for chunk in chunked(items, self.__chunk_size(chunk_size)):
+                    if ex is None:
+                        pipe.mset(dict(chunk))
+                    else:
+                        # MSET takes no expiry, SET EX per key still shares the round trip.
+                        for k, v in chunk:
+                            pipe.set(k, v, ex=ex)
+                    pipe.execute()
+
+        try:
+            # Rewriting the same values is harmless, a retry resends every chunk.
+            self.__call(store)
+            return True
+        except Exception as error:
+            self.exception(error)
         finally:
-            conn.connection_pool.disconnect()
+            self.__near_cache.invalidate(mapping)
 
 
 class RedisClusterToolsClass(BaseClass):
     """Redis 集群工具类"""
 
+    __executor = None
+    __executor_lock = threading.Lock()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.debug("Initialization class：{}".format(self.__class__.__name__))
+        self.debug("Initialization class：{}", self.__class__.__name__)
         try:
             self.__redis_config: list = (
                 self.config.get("middleware").get("redis").get("cluster")
             )
+            self.__redis_pool_config: dict = (
+                self.config.get("middleware").get("redis").get("cluster_pool")
+            )
+            self.__near_cache_config: dict = self.config.get("middleware").get("redis").get("near_cache")
+            self.__resilience = ResiliencePolicy.instance(self.config.get("resilience"))
         except Exception as error:
             self.exception(error)
+            raise
+        name = "redis-cluster://{}".format(
+            ",".join(sorted("{}:{}".format(node.get("host"), node.get("port")) for node in self.__redis_config or ()))
+        )
+        self.__breaker = self.__resilience.breaker(name)
+        self.__near_cache = NearCache.instance(name, self.__near_cache_config)
 
     @property
     def __redis_cluster_connect(self):
+        """
+        Shared cluster client, built (and the slots discovered) on first use
+        :return: Redis cluster client: RedisCluster
+        """
         try:
-            redis_cluster_confg = (
-                self.config.get("middleware").get("redis").get("cluster")
-            )
-            startup_nodes = []
-            __password_map = {}
-            for standalone_confg in redis_cluster_confg:
-                standalone_confg: dict
-                __host = standalone_confg.get("host")
-                __port = standalone_confg.get("port")
-                __password = standalone_confg.get("password")
-                startup_nodes.append({"host": __host, "port": __port})
-                __password_map["{}:{}".format(__host, __port)] = __password
-            self.debug("Redis Connection Pool Data Sources：{}".format(startup_nodes))
-            pool = ClusterConnectionPool(
-                startup_nodes=startup_nodes,
-                password_map=__password_map,
-                max_connections=10,
-                decode_responses=True,
-            )
-            conn = RedisCluster(connection_pool=pool)
-            self.debug("Redis Cluster Connection Successful")
-            return conn
+            return RedisClientRegistry.cluster(self.__redis_config, self.__redis_pool_config)
         except Exception as error:
             self.error("Redis Cluster Connection Failure")
             self.exception(error)
+            raise
+
+    @property
+    def __redis_cluster_tracked_connect(self):
+        """
+        Cluster client of the near cache, every node connection is registered for invalidation
+        with a listener on the same node
+        :return: Redis cluster client: RedisCluster
+        """
+        return RedisClientRegistry.cluster(self.__redis_config, self.__redis_pool_config, self.__near_cache)
+
+    def __call(self, operation: Callable, idempotent: bool = True, tracked: bool = False):
+        """
+        Run an operation on the cluster client under the resilience policy, building the client
+        is part of the attempt so an unreachable cluster is retried and then fails fast
+        :param operation: Called with the client: Callable
+        :param idempotent: Whether the operation may run more than once: Boolean
+        :param tracked: Use the near cache client: Boolean
+        :return: Result of the operation: Any
+        """
+        return self.__resilience.call(
+            lambda: operation(self.__redis_cluster_tracked_connect if tracked else self.__redis_cluster_connect),
+            breaker=self.__breaker,
+            transient=_transient_error,
+            idempotent=idempotent,
+        )
+
+    @property
+    def near_cache_stats(self) -> dict:
+        """
+        Near cache statistics
+        :return: Statistics (size, hits, misses, invalidations, listeners): Dict
+        """
+        return self.__near_cache.stats
+
+    def redis_get(self, k, near: Union[bool, None] = None):
+        """
+        Redis Fetches Values Based on Keys, served from the near cache when it is enabled
+        :param k: key: String
+        :param near: Use the near cache, None follows the near cache configuration: Boolean
+        :return: Value: Any
+        """
+        cache = self.__near_cache
+        try:
+            if cache.enabled if near is None else near:
+                value = cache.get(k, lambda key: self.__call(lambda conn: conn.get(key), tracked=True))
+            else:
+                value = self.__call(lambda conn: conn.get(k))
+            self.debug("Redis Fetches Data Successfully：key：{}，value：{}", k, value)
+            return value
+        except Exception as error:
+            self.exception(error)
+
+    @classmethod
+    def __pipeline_executor(cls) -> ThreadPoolExecutor:
+        if cls.__executor is None:
+            with cls.__executor_lock:
+                if cls.__executor is None:
+                    cls.__executor = ThreadPoolExecutor(
+                        max_workers=CLUSTER_PIPELINE_WORKERS,
+                        thread_name_prefix="redis-cluster-pipeline",
+                    )
+        return cls.__executor
+
+    def __chunk_size(self, chunk_size: Union[int, None]) -> int:
+        return max(
+            int(chunk_size or (self.__redis_pool_config or {}).get("pipeline_chunk_size") or PIPELINE_CHUNK_SIZE),
+            1,
+        )
 
-    def redis_get(self, k):
-        conn = self.__redis_cluster_connect
+    @contextmanager
+    def pipeline(self):
+        """
+        Queue commands and send them with execute(), commands are grouped per node
+        :return: Redis cluster pipeline: ClusterPipeline
+        """
+        pipe = self.__redis_cluster_connect.pipeline()
         try:
-            value = conn.get(k)
-            self.debug(
-                "Redis Fetches Data Successfully：key：{}，value：{}".format(k, value)
+            yield pipe
+        finally:
+            pipe.reset()
+
+    def __group_by_node(self, conn, keys: list) -> dict:
+        """
+        Positions of the keys grouped by the master node serving their hash slot
+        :param conn: Redis cluster client: RedisCluster
+        :param keys: Keys: List
+        :return: Node name and key positions: Dict
+        """
+        pool = conn.connection_pool
+        groups = {}
+        for position, k in enumerate(keys):
+            node = pool.get_master_node_by_slot(pool.nodes.keyslot(k))
+            groups.setdefault(node["name"], []).append(position)
+        return groups
+
+    def __run_node_pipelines(self, conn, groups: dict, queue, chunk_size: int) -> dict:
+        """
+        Run one pipeline per node, concurrently when the batch spans several nodes
+        :param conn: Redis cluster client: RedisCluster
+        :param groups: Node name and item positions: Dict
+        :param queue: Callable queuing the command of one position on a pipeline: Callable
+        :param chunk_size: Commands per round trip: Integer
+        :return: Result of every position: Dict
+        """
+
+        def run(positions: list) -> list:
+            results = []
+            pipe = conn.pipeline()
+            try:
+                for chunk in chunked(positions, chunk_size):
+                    for position in chunk:
+                        queue(pipe, position)
+                    results.extend(zip(chunk, pipe.execute()))
+            finally:
+                pipe.reset()
+            return results
+
+        if len(groups) == 1:
+            return dict(run(next(iter(groups.values()))))
+        results = {}
+        futures = [self.__pipeline_executor().submit(run, positions) for positions in groups.values()]
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    def redis_mget(self, keys: Iterable, chunk_size: Union[int, None] = None) -> Union[list, None]:
+        """
+        Redis Fetches the Values of Several Keys, split by hash slot into per-node pipelines
+        :param keys: Keys: Iterable
+        :param chunk_size: Keys per round trip, defaults to pipeline_chunk_size: Integer
+        :return: Values in key order, None for missing keys: List
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        try:
+            results = self.__call(
+                lambda conn: self.__run_node_pipelines(
+                    conn,
+                    self.__group_by_node(conn, keys),
+                    lambda pipe, position: pipe.get(keys[position]),
+                    self.__chunk_size(chunk_size),
+                )
             )
-            return value
+            self.debug("Redis Fetches Data Successfully：keys：{}", len(keys))
+            return [results[position] for position in range(len(keys))]
+        except Exception as error:
+            self.exception(error)
+
+    def redis_mset(
+        self,
+        mapping: dict,
+        ex: Union[int, None] = None,
+        chunk_size: Union[int, None] = None,
+    ) -> Union[bool, None]:
+        """
+        Redis Writes Several Keys, split by hash slot into per-node pipelines
+        :param mapping: Keys and values: Dict
+        :param ex: Expire time in seconds, None keeps the keys forever: Integer
+        :param chunk_size: Keys per round trip, defaults to pipeline_chunk_size: Integer
+        :return: True or False: Boolean
+        """
+        items = list(mapping.items())
+        if not items:
+            return True
+        try:
+            self.__call(
+                lambda conn: self.__run_node_pipelines(
+                    conn,
+                    self.__group_by_node(conn, [k for k, _ in items]),
+                    lambda pipe, position: pipe.set(items[position][0], items[position][1], ex=ex),
+                    self.__chunk_size(chunk_size),
+                )
+            )
+            return True
         except Exception as error:
             self.exception(error)
         finally:
-            conn.connection_pool.disconnect()
+            self.__near_cache.invalidate(mapping)
@@ -11,12 +11,12 @@ from __future__ import annotations
 
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 from .public import PublicToolsBaseClass
@@ -24,6 +24,13 @@ from .datetimes import DateTimeClass
 from .exceptional import ReadFilesError
 from .exceptional import MySQLSourceError
 from .exceptional import ParamsError
+from .exceptional import PoolTimeoutError
+from .exceptional import MySQLQueryError
+from .exceptional import CircuitOpenError
+from .exceptional import DeadlineExceededError
+from .resilience import CircuitBreaker
+from .resilience import ResiliencePolicy
+from .resilience import deadline
 
 __all__ = [
     "PublicToolsBaseClass",
@@ -31,4 +38,11 @@ __all__ = [
     "ReadFilesError",
     "MySQLSourceError",
     "ParamsError",
+    "PoolTimeoutError",
+    "MySQLQueryError",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "CircuitBreaker",
+    "ResiliencePolicy",
+    "deadline",
 ]
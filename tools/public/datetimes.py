@@ -12,13 +12,13 @@ from __future__ import annotations
 
 import sys
 import warnings
-import platform
-import asyncio
 
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
@@ -11,12 +11,12 @@ from __future__ import annotations
 
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
@@ -34,3 +34,19 @@ class ReadFilesError(ProjectError):
 
 class MySQLSourceError(ProjectError):
     pass
+
+
+class PoolTimeoutError(ProjectError):
+    pass
+
+
+class MySQLQueryError(ProjectError):
+    pass
+
+
+class CircuitOpenError(ProjectError):
+    pass
+
+
+class DeadlineExceededError(ProjectError):
+    pass
@@ -12,26 +12,29 @@ from __future__ import annotations
 import os
 import sys
 import warnings
-import platform
-import asyncio
 
 sys.dont_write_bytecode = True
 warnings.filterwarnings("ignore")
-if platform.system() == "Windows":
+if sys.platform == "win32":
+    import asyncio
+
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+# Project root, resolved once at import.
+ROOT_PATH = os.path.abspath(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
 
 class PublicToolsBaseClass:
     """公共工具基类"""
 
     def __init__(self, *args, **kwargs):
-        self.__root_path = os.path.abspath(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        )
+        pass
 
     @property
     def root_path(self) -> str:
-        return self.__root_path
+        return ROOT_PATH
 
     @staticmethod
     def api_results():
@@ -0,0 +1,343 @@
+# coding: utf8
+"""
+@ File: resilience.py
+@ Editor: PyCharm
+@ Author: Austin (From Chengdu.China) https://fairy.host
+@ HomePage: https://github.com/AustinFairyland
+@ OS: Linux Ubunut 22.04.4 Kernel 6.2.0-36-generic
+@ CreatedTime: 2026/10/18
+"""
+from __future__ import annotations
+
+import sys
+import warnings
+
+sys.dont_write_bytecode = True
+warnings.filterwarnings("ignore")
+if sys.platform == "win32":
+    import asyncio
+
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+import time
+import random
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Union
+
+from .exceptional import CircuitOpenError
+from .exceptional import DeadlineExceededError
+
+BREAKER_STATES = ("closed", "open", "half_open")
+
+_deadline: ContextVar = ContextVar("resilience_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Union[int, float]):
+    """
+    Time budget for everything called inside the with block in this thread or task: retries
+    stop and backoff sleeps are cut short at the deadline, nested deadlines only tighten it
+    with deadline(0.5): db.query(...)
+    :param seconds: Budget in seconds: Integer | Float
+    :return: Absolute time.monotonic() deadline: Float
+    """
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None and outer < expires:
+        expires = outer
+    token = _deadline.set(expires)
+    try:
+        yield expires
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Union[float, None]:
+    """
+    Time left before the active deadline
+    :return: Seconds, None without a deadline: Float
+    """
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def bounded_timeout(timeout: Union[int, float, None]) -> Union[float, None]:
+    """
+    A timeout cut down to the time left before the active deadline
+    :param timeout: Timeout in seconds, None for no limit of its own: Integer | Float
+    :return: Timeout in seconds: Float
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left, 0.0)
+    return left if timeout is None else min(timeout, left)
+
+
+def check_deadline():
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("Deadline exceeded")
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker: after failure_threshold consecutive failures the endpoint is
+    failed fast for reset_timeout seconds, then a single trial call decides whether it closes
+    again or stays open for another reset_timeout
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: Union[int, float] = 10):
+        self.name = name
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__lock = threading.Lock()
+        self.__state = "closed"
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__trial = False
+        self.__opens = 0
+        self.__rejected = 0
+
+    @property
+    def state(self) -> str:
+        return self.__state
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go to the endpoint now
+        :return: True or False: Boolean
+        """
+        if self.__state == "closed":
+            return True
+        with self.__lock:
+            if self.__state == "open" and time.monotonic() - self.__opened_at >= self.__reset_timeout:
+                self.__state = "half_open"
+                self.__trial = False
+            if self.__state == "half_open" and not self.__trial:
+                self.__trial = True
+                return True
+            if self.__state == "closed":
+                return True
+            self.__rejected += 1
+            return False
+
+    def success(self):
+        if self.__state == "closed" and not self.__failures:
+            return
+        with self.__lock:
+            self.__state = "closed"
+            self.__failures = 0
+            self.__trial = False
+
+    def release_trial(self):
+        """
+        Give back a half-open trial that ended without a verdict on the endpoint (a local error,
+        an interrupted call), so the next call is let through as the trial instead
+        :return: None
+        """
+        if self.__state == "closed":
+            return
+        with self.__lock:
+            if self.__state == "half_open":
+                self.__trial = False
+
+    def failure(self):
+        with self.__lock:
+            self.__failures += 1
+            if self.__state == "half_open" or self.__failures >= self.__failure_threshold:
+                if self.__state != "open":
+                    self.__opens += 1
+                self.__state = "open"
+                self.__opened_at = time.monotonic()
+                self.__trial = False
+
+    @property
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                "name": self.name,
+                "state": self.__state,
+                "failures": self.__failures,
+                "opens": self.__opens,
+                "rejected": self.__rejected,
+            }
+
+
+class ResiliencePolicy:
+    """
+    Process-wide retry and circuit breaker settings shared by the database and middleware
+    tools: bounded exponential backoff with full jitter for transient failures of idempotent
+    calls, one circuit breaker per endpoint, and the active deadline honoured throughout
+    """
+
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: Union[int, float] = 0.05,
+        backoff_max: Union[int, float] = 2,
+        failure_threshold: int = 5,
+        reset_timeout: Union[int, float] = 10,
+    ):
+        self.attempts = max(int(attempts), 1)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__breakers: dict = {}
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def instance(cls, resilience_config: Union[dict, None] = None):
+        """
+        Process-wide policy, created on first use
+        :param resilience_config: resilience configuration (retry, breaker): Dict
+        :return: Policy: ResiliencePolicy
+        """
+        if cls.__instance is None:
+            with cls.__instance_lock:
+                if cls.__instance is None:
+                    resilience_config = resilience_config or {}
+                    cls.__instance = cls(
+                        **(resilience_config.get("retry") or {}),
+                        **(resilience_config.get("breaker") or {}),
+                    )
+        return cls.__instance
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """
+        Circuit breaker of an endpoint, created on first use
+        :param endpoint: Endpoint name, e.g. mysql://host:port: String
+        :return: Circuit breaker: CircuitBreaker
+        """
+        breaker = self.__breakers.get(endpoint)
+        if breaker is None:
+            with self.__lock:
+                breaker = self.__breakers.get(endpoint)
+                if breaker is None:
+                    breaker = CircuitBreaker(endpoint, self.__failure_threshold, self.__reset_timeout)
+                    self.__breakers[endpoint] = breaker
+        return breaker
+
+    def delay(self, attempt: int) -> float:
+        """
+        Backoff before the next attempt, full jitter so retrying clients spread out
+        :param attempt: Failed attempts so far: Integer
+        :return: Seconds: Float
+        """
+        return random.uniform(0, min(self.backoff * (2 ** (attempt - 1)), self.backoff_max))
+
+    def __failed(self, error: Exception, attempt: int, breaker, transient, idempotent: bool) -> Union[float, None]:
+        """
+        Record a failed attempt
+        :return: Pause before the next attempt, None when the error goes to the caller: Float
+        """
+        if transient is None or not transient(error):
+            # The endpoint answered, the error is the call's own.
+            if breaker is not None:
+                breaker.success()
+            return None
+        if breaker is not None:
+            breaker.failure()
+        if not idempotent or attempt >= self.attempts:
+            return None
+        pause = self.delay(attempt)
+        left = remaining()
+        if left is not None and pause >= left:
+            raise DeadlineExceededError("Deadline exceeded after {} attempts".format(attempt)) from error
+        return pause
+
+    def call(
+        self,
+        function: Callable,
+        *args,
+        breaker: Union[CircuitBreaker, None] = None,
+        transient: Union[Callable, None] = None,
+        idempotent: bool = True,
+        **kwargs,
+    ):
+        """
+        Run a call under the policy: fail fast while the breaker is open, retry transient
+        failures of idempotent calls with backoff, never past the active deadline
+        :param function: Call: Callable
+        :param breaker: Circuit breaker of the endpoint, None for none: CircuitBreaker
+        :param transient: Tells whether an exception is worth a retry, None retries nothing: Callable
+        :param idempotent: Whether the call may run more than once: Boolean
+        :return: Result of the call: Any
+        """
+        attempt = 0
+        while True:
+            check_deadline()
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError("Circuit open：{}".format(breaker.name))
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:
+                attempt += 1
+                pause = self.__failed(error, attempt, breaker, transient, idempotent)
+                if pause is None:
+                    raise
+                time.sleep(pause)
+                continue
+            except BaseException:
+                # Interrupted, the endpoint was not judged: a half-open trial is given back.
+                if breaker is not None:
+                    breaker.release_trial()
+                raise
+            if breaker is not None:
+                breaker.success()
+            return result
+
+    async def call_async(
+        self,
+        function: Callable,
+        *args,
+        breaker: Union[CircuitBreaker, None] = None,
+        transient: Union[Callable, None] = None,
+        idempotent: bool = True,
+        **kwargs,
+    ):
+        """
+        asyncio counterpart of call(), function is a coroutine function and the backoff
+        sleeps without blocking the event loop
+        :return: Result of the call: Any
+        """
+        attempt = 0
+        while True:
+            check_deadline()
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError("Circuit open：{}".format(breaker.name))
+            try:
+                result = await function(*args, **kwargs)
+            except Exception as error:
+                attempt += 1
+                pause = self.__failed(error, attempt, breaker, transient, idempotent)
+                if pause is None:
+                    raise
+                await asyncio.sleep(pause)
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_trial()
+                raise
+            if breaker is not None:
+                breaker.success()
+            return result
+
+    @property
+    def stats(self) -> list:
+        """
+        Circuit breaker states
+        :return: Statistics per endpoint: List
+        """
+        with self.__lock:
+            breakers = list(self.__breakers.values())
+        return [breaker.stats for breaker in breakers]